@@ -1,13 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 from typing import Optional, Literal
 from datetime import date
 from pydantic import BaseModel
 from ...utils.auth import verify_token
 from ...database.db import get_db
-from ...models.transaction import Transaction
 from ...models.account import Account
+from ...utils.etag import check_not_modified
+from ...services.daily_rollups import daily_amounts, daily_amounts_by_account
+from ...services.balance_checkpoints import latest_checkpoint, latest_checkpoints
+from ...services.analytics_cache import analytics_cache
+from ...services.columnar_analytics import use_columnar, get_snapshot, balances_at
+from ...services.window_balances import use_window_functions, window_balances
 
 router = APIRouter(prefix="/assets", dependencies=[Depends(verify_token)])
 
@@ -23,8 +27,21 @@ class AssetHistoryResponse(BaseModel):
     current_balance: float
     balance_history: list[BalanceHistoryItem]
 
+class AccountBalanceHistory(BaseModel):
+    account_id: str
+    account_name: Optional[str]
+    current_balance: float
+    balance_history: list[BalanceHistoryItem]
+
+class NetWorthResponse(BaseModel):
+    current_balance: float
+    balance_history: list[BalanceHistoryItem]
+    accounts: list[AccountBalanceHistory]
+
 @router.get("/history", response_model=AssetHistoryResponse)
 async def get_asset_history(
+    request: Request,
+    response: Response,
     account_id: str = Query(..., description="Target account ID"),
     start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
@@ -36,178 +53,221 @@ async def get_asset_history(
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
 
+    # Unchanged since the client's copy: answer from the account row alone
+    check_not_modified(request, response, account.data_version)
+
     # Set default date range if not provided
     if not end_date:
         end_date = date.today()
     if not start_date:
-        # Default to 12 months ago
-        if granularity == "month":
-            start_date = date(end_date.year - 1, end_date.month, 1)
-        elif granularity == "week":
-            start_date = date(end_date.year, end_date.month - 3, end_date.day) if end_date.month > 3 else date(end_date.year - 1, end_date.month + 9, end_date.day)
-        else:  # day
-            start_date = date(end_date.year, end_date.month - 1, end_date.day) if end_date.month > 1 else date(end_date.year - 1, 12, end_date.day)
-
-    # Get all transactions for the account within date range
-    transactions = db.query(Transaction).filter(
-        and_(
-            Transaction.account_id == account_id,
-            Transaction.transaction_date <= end_date,
-            Transaction.is_removed == False
-        )
-    ).order_by(Transaction.transaction_date.asc()).all()
+        start_date = _default_start_date(end_date, granularity)
+
+    cache_key = ("asset_history", account_id, account.data_version, start_date, end_date, granularity)
+    if use_columnar():
+        compute = lambda: _compute_asset_history_columnar(db, account, start_date, end_date, granularity)
+    elif use_window_functions():
+        compute = lambda: _compute_asset_history_window(db, account_id, start_date, end_date, granularity)
+    else:
+        compute = lambda: _compute_asset_history(db, account_id, start_date, end_date, granularity)
+    return analytics_cache.get_or_compute(account_id, cache_key, compute)
+
+@router.get("/net-worth", response_model=NetWorthResponse)
+async def get_net_worth(
+    request: Request,
+    response: Response,
+    account_ids: Optional[list[str]] = Query(None, description="Accounts to include (all accounts by default)"),
+    start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
+    granularity: Literal["day", "week", "month"] = Query("month", description="Time granularity"),
+    db: Session = Depends(get_db)
+):
+    query = db.query(Account)
+    if account_ids:
+        query = query.filter(Account.account_id.in_(account_ids))
+    accounts = query.order_by(Account.account_id).all()
+    missing = set(account_ids or ()) - {account.account_id for account in accounts}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Account {', '.join(sorted(missing))} not found")
 
-    # Calculate current balance (sum of all transactions up to end_date)
-    # Note: Plaid uses positive for expenses, negative for income
-    # So we negate the amount to get actual balance change
-    current_balance = sum(-float(t.amount) for t in transactions)
+    # Unchanged since the client's copy: answer from the account rows alone
+    check_not_modified(request, response, ",".join(f"{account.account_id}:{account.data_version}" for account in accounts))
 
-    # Group transactions by period and calculate balance history
-    balance_history = []
+    if not end_date:
+        end_date = date.today()
+    if not start_date:
+        start_date = _default_start_date(end_date, granularity)
+    return _compute_net_worth(db, accounts, start_date, end_date, granularity)
 
+def _default_start_date(end_date: date, granularity: str) -> date:
+    # Default to 12 months ago
     if granularity == "month":
-        balance_history = _calculate_monthly_balance(transactions, start_date, end_date)
+        return date(end_date.year - 1, end_date.month, 1)
     elif granularity == "week":
-        balance_history = _calculate_weekly_balance(transactions, start_date, end_date)
+        return date(end_date.year, end_date.month - 3, end_date.day) if end_date.month > 3 else date(end_date.year - 1, end_date.month + 9, end_date.day)
     else:  # day
-        balance_history = _calculate_daily_balance(transactions, start_date, end_date)
-
-    return AssetHistoryResponse(
-        current_balance=current_balance,
-        balance_history=balance_history
-    )
+        return date(end_date.year, end_date.month - 1, end_date.day) if end_date.month > 1 else date(end_date.year - 1, 12, end_date.day)
 
-def _calculate_monthly_balance(transactions, start_date: date, end_date: date) -> list[BalanceHistoryItem]:
-    """Calculate balance history grouped by month"""
-    from calendar import monthrange
+def _compute_asset_history(db: Session, account_id: str, start_date: date, end_date: date, granularity: str) -> AssetHistoryResponse:
+    periods = _balance_periods(start_date, end_date, granularity)
 
-    history = []
-    current_date = start_date.replace(day=1)
-
-    while current_date <= end_date:
-        # Period boundaries
-        period_start = current_date
-        last_day = monthrange(current_date.year, current_date.month)[1]
-        period_end = current_date.replace(day=last_day)
-
-        # Calculate balance at end of period
-        # Negate amounts because Plaid uses positive for expenses, negative for income
-        balance_at_period_end = sum(
-            -float(t.amount) for t in transactions
-            if t.transaction_date <= period_end
-        )
-
-        # Calculate balance at end of previous period
-        prev_month = current_date.month - 1 if current_date.month > 1 else 12
-        prev_year = current_date.year if current_date.month > 1 else current_date.year - 1
-        prev_last_day = monthrange(prev_year, prev_month)[1]
-        prev_period_end = date(prev_year, prev_month, prev_last_day)
-
-        balance_at_prev_period_end = sum(
-            -float(t.amount) for t in transactions
-            if t.transaction_date <= prev_period_end
-        )
+    # Open at the latest month-end checkpoint before the first balance the history
+    # needs (the end of the period preceding start_date), so older days are never read
+    checkpoint = latest_checkpoint(db, account_id, periods[0][3] if periods else end_date)
+    opening_balance = float(checkpoint.balance) if checkpoint else 0
 
-        # Calculate change
-        change = balance_at_period_end - balance_at_prev_period_end
-        change_pct = (change / balance_at_prev_period_end * 100) if balance_at_prev_period_end != 0 else 0
+    # Net amount per day after the checkpoint up to end_date from the daily rollups;
+    # each row stands in for that day's transactions (transaction_date, amount)
+    transactions = daily_amounts(db, account_id, end_date, after=checkpoint.checkpoint_date if checkpoint else None)
 
-        history.append(BalanceHistoryItem(
-            period=current_date.strftime("%Y-%m"),
-            period_start=period_start.isoformat(),
-            period_end=period_end.isoformat(),
-            balance=round(balance_at_period_end, 2),
-            change=round(change, 2),
-            change_pct=round(change_pct, 2)
-        ))
+    # Calculate current balance (sum of all transactions up to end_date)
+    # Note: Plaid uses positive for expenses, negative for income
+    # So we negate the amount to get actual balance change
+    current_balance = sum((-float(t.amount) for t in transactions), opening_balance)
 
-        # Move to next month
-        if current_date.month == 12:
-            current_date = current_date.replace(year=current_date.year + 1, month=1)
-        else:
-            current_date = current_date.replace(month=current_date.month + 1)
+    return AssetHistoryResponse(
+        current_balance=current_balance,
+        balance_history=_calculate_balance_history(transactions, periods, opening_balance)
+    )
 
-    return history
+def _compute_asset_history_columnar(db: Session, account: Account, start_date: date, end_date: date, granularity: str) -> AssetHistoryResponse:
+    # Every period end and the end before it, looked up in one pass over the snapshot.
+    # Transactions after end_date never count, even inside the last period.
+    periods = _balance_periods(start_date, end_date, granularity)
+    balances = balances_at(get_snapshot(db, account), [end_date] + [min(day, end_date) for day in _period_boundaries(periods)])
+    return AssetHistoryResponse(current_balance=balances[0], balance_history=_history_items(periods, balances[1:]))
+
+def _compute_asset_history_window(db: Session, account_id: str, start_date: date, end_date: date, granularity: str) -> AssetHistoryResponse:
+    periods = _balance_periods(start_date, end_date, granularity)
+    if not periods:
+        return _compute_asset_history(db, account_id, start_date, end_date, granularity)
+    # The last period holds end_date and only rollups up to it are summed,
+    # so its closing balance is the current balance
+    balances = window_balances(db, account_id, periods, end_date, granularity)
+    return AssetHistoryResponse(current_balance=balances[-1], balance_history=_history_items(periods, balances))
+
+def _compute_net_worth(db: Session, accounts: list[Account], start_date: date, end_date: date, granularity: str) -> NetWorthResponse:
+    """Every account's history on one period grid, and their total.
+
+    Each account's balances are cached under its own data_version, so a sync
+    recomputes only the accounts it touched; those are computed together.
+    """
+    periods = _balance_periods(start_date, end_date, granularity)
+    balances = {}
+    stale = []
+    for account in accounts:
+        key = ("account_balances", account.account_id, account.data_version, start_date, end_date, granularity)
+        balances[account.account_id] = analytics_cache.get(key)
+        if balances[account.account_id] is None:
+            stale.append((account, key))
+    if stale:
+        computed = _account_balances(db, [account for account, _ in stale], periods, end_date)
+        for account, key in stale:
+            balances[account.account_id] = computed[account.account_id]
+            analytics_cache.set(account.account_id, key, computed[account.account_id])
+
+    # Current balance, then each _period_boundaries balance, summed across accounts
+    totals = [sum(column) for column in zip(*balances.values())] or [0.0] * (1 + 2 * len(periods))
+    return NetWorthResponse(
+        current_balance=totals[0],
+        balance_history=_history_items(periods, totals[1:]),
+        accounts=[
+            AccountBalanceHistory(
+                account_id=account.account_id,
+                account_name=account.account_name,
+                current_balance=balances[account.account_id][0],
+                balance_history=_history_items(periods, balances[account.account_id][1:]),
+            )
+            for account in accounts
+        ],
+    )
 
-def _calculate_weekly_balance(transactions, start_date: date, end_date: date) -> list[BalanceHistoryItem]:
-    """Calculate balance history grouped by week"""
+def _account_balances(db: Session, accounts: list[Account], periods, end_date: date) -> dict[str, list[float]]:
+    """account_id -> [balance at end_date, then at each of the periods' _period_boundaries]"""
+    if use_columnar():
+        dates = [end_date] + [min(day, end_date) for day in _period_boundaries(periods)]
+        return {account.account_id: balances_at(get_snapshot(db, account), dates) for account in accounts}
+
+    # One query for every account's opening checkpoint and one for all their daily amounts
+    account_ids = [account.account_id for account in accounts]
+    checkpoints = latest_checkpoints(db, account_ids, periods[0][3] if periods else end_date)
+    amounts = daily_amounts_by_account(
+        db, {account_id: checkpoints[account_id].checkpoint_date if account_id in checkpoints else None for account_id in account_ids}, end_date
+    )
+    balances = {}
+    for account_id in account_ids:
+        opening_balance = float(checkpoints[account_id].balance) if account_id in checkpoints else 0
+        transactions = amounts[account_id]
+        current_balance = sum((-float(t.amount) for t in transactions), opening_balance)
+        balances[account_id] = [current_balance] + _running_balances(transactions, _period_boundaries(periods), opening_balance)
+    return balances
+
+def _calculate_balance_history(transactions, periods, opening_balance: float = 0) -> list[BalanceHistoryItem]:
+    """Balance history of oldest-first ``transactions`` in one sweep: O(transactions + periods)"""
+    return _history_items(periods, _running_balances(transactions, _period_boundaries(periods), opening_balance))
+
+def _balance_periods(start_date: date, end_date: date, granularity: str) -> list[tuple[str, date, date, date]]:
+    """(period, period_start, period_end, prev_period_end) for each month, week (from Monday) or day"""
+    from calendar import monthrange
     from datetime import timedelta
 
+    periods = []
+    if granularity == "month":
+        current_date = start_date.replace(day=1)
+        while current_date <= end_date:
+            period_end = current_date.replace(day=monthrange(current_date.year, current_date.month)[1])
+            periods.append((current_date.strftime("%Y-%m"), current_date, period_end, current_date - timedelta(days=1)))
+            current_date = period_end + timedelta(days=1)
+    elif granularity == "week":
+        current_date = start_date - timedelta(days=start_date.weekday())  # Start from Monday
+        while current_date <= end_date:
+            periods.append((current_date.strftime('%Y-W%W'), current_date, current_date + timedelta(days=6), current_date - timedelta(days=1)))
+            current_date += timedelta(days=7)
+    else:  # day
+        current_date = start_date
+        while current_date <= end_date:
+            periods.append((current_date.isoformat(), current_date, current_date, current_date - timedelta(days=1)))
+            current_date += timedelta(days=1)
+    return periods
+
+def _period_boundaries(periods) -> list[date]:
+    """End of the previous period then end of the period, for each period: ascending dates"""
+    return [day for _, _, period_end, prev_period_end in periods for day in (prev_period_end, period_end)]
+
+def _running_balances(transactions, dates: list[date], opening_balance: float = 0) -> list[float]:
+    """Balance at the end of each ascending date, advancing one pointer through the transactions.
+
+    ``opening_balance`` is the balance before the first transaction. From zero,
+    the running total adds the same negated amounts in the same order as the
+    per-period sum() it replaced, so balances match it exactly. (From Python 3.12
+    sum() compensates float rounding, and the two can differ in the last bit.)
+    """
+    balances = []
+    balance = opening_balance
+    index = 0
+    for day in dates:
+        while index < len(transactions) and transactions[index].transaction_date <= day:
+            # Negate amounts because Plaid uses positive for expenses, negative for income
+            balance += -float(transactions[index].amount)
+            index += 1
+        balances.append(balance)
+    return balances
+
+def _history_items(periods, balances: list[float]) -> list[BalanceHistoryItem]:
+    """Items from _balance_periods and the balances at its _period_boundaries"""
     history = []
-    current_date = start_date - timedelta(days=start_date.weekday())  # Start from Monday
-
-    while current_date <= end_date:
-        period_start = current_date
-        period_end = current_date + timedelta(days=6)  # Sunday
-
-        # Calculate balance at end of period
-        # Negate amounts because Plaid uses positive for expenses, negative for income
-        balance_at_period_end = sum(
-            -float(t.amount) for t in transactions
-            if t.transaction_date <= period_end
-        )
-
-        # Calculate balance at end of previous period
-        prev_period_end = period_start - timedelta(days=1)
-        balance_at_prev_period_end = sum(
-            -float(t.amount) for t in transactions
-            if t.transaction_date <= prev_period_end
-        )
+    for index, (period, period_start, period_end, _) in enumerate(periods):
+        balance_at_prev_period_end, balance_at_period_end = balances[2 * index], balances[2 * index + 1]
 
         # Calculate change
         change = balance_at_period_end - balance_at_prev_period_end
         change_pct = (change / balance_at_prev_period_end * 100) if balance_at_prev_period_end != 0 else 0
 
         history.append(BalanceHistoryItem(
-            period=f"{period_start.strftime('%Y-W%W')}",
+            period=period,
             period_start=period_start.isoformat(),
             period_end=period_end.isoformat(),
             balance=round(balance_at_period_end, 2),
             change=round(change, 2),
             change_pct=round(change_pct, 2)
         ))
-
-        # Move to next week
-        current_date += timedelta(days=7)
-
-    return history
-
-def _calculate_daily_balance(transactions, start_date: date, end_date: date) -> list[BalanceHistoryItem]:
-    """Calculate balance history grouped by day"""
-    from datetime import timedelta
-
-    history = []
-    current_date = start_date
-
-    while current_date <= end_date:
-        # Calculate balance at end of day
-        # Negate amounts because Plaid uses positive for expenses, negative for income
-        balance_at_day_end = sum(
-            -float(t.amount) for t in transactions
-            if t.transaction_date <= current_date
-        )
-
-        # Calculate balance at end of previous day
-        prev_date = current_date - timedelta(days=1)
-        balance_at_prev_day_end = sum(
-            -float(t.amount) for t in transactions
-            if t.transaction_date <= prev_date
-        )
-
-        # Calculate change
-        change = balance_at_day_end - balance_at_prev_day_end
-        change_pct = (change / balance_at_prev_day_end * 100) if balance_at_prev_day_end != 0 else 0
-
-        history.append(BalanceHistoryItem(
-            period=current_date.isoformat(),
-            period_start=current_date.isoformat(),
-            period_end=current_date.isoformat(),
-            balance=round(balance_at_day_end, 2),
-            change=round(change, 2),
-            change_pct=round(change_pct, 2)
-        ))
-
-        # Move to next day
-        current_date += timedelta(days=1)
-
     return history
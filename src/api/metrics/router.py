@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Depends
+from ...utils.auth import verify_token
+from ...services.metrics import latency_snapshot
+from ...services.result_cache import cache_snapshot
+
+router = APIRouter(prefix="/metrics", dependencies=[Depends(verify_token)])
+
+@router.get("")
+async def get_metrics():
+    return {"latency": latency_snapshot(), "caches": cache_snapshot()}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from plaid.model.link_token_create_request import LinkTokenCreateRequest
 from plaid.model.products import Products
@@ -9,6 +9,12 @@ from sqlalchemy.orm import Session
 from ...database.db import get_db
 from ...models.account import Account
 from .client import get_plaid_client
+from ...services.plaid_gateway import call_plaid
+from ...services.plaid import invalidate_item_status
+from ...services.webhook_sync import webhook_coalescer
+from ...services.plaid_webhooks import verify_webhook
+from ...services.item_registry import register_item, list_items, get_item
+from ...schemas.plaid_item import PlaidItem as PlaidItemSchema
 from ...utils.auth import verify_token
 from ...config.settings import settings
 from ...config.settings import env_file
@@ -20,22 +26,32 @@ if not os.path.exists(env_file):
 router = APIRouter(prefix="/plaid")
 security = HTTPBearer()
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional
 class PublicTokenExchangeRequest(BaseModel):
     public_token: str
 
-def store_accounts(access_token: str, db: Session) -> None:
-    client = get_plaid_client()
+class PlaidWebhook(BaseModel):
+    webhook_type: str
+    webhook_code: str
+    item_id: Optional[str] = None
+    error: Optional[dict] = None
+
+SYNC_WEBHOOK_CODES = {"SYNC_UPDATES_AVAILABLE", "DEFAULT_UPDATE"}
+
+def store_accounts(access_token: str, db: Session, item_id: Optional[str] = None) -> None:
     accounts_request = AccountsGetRequest(access_token=access_token)
     try:
         print(f"Fetching accounts with access_token: {access_token[:10]}...")
-        accounts_response = client.accounts_get(accounts_request)
+        accounts_response = call_plaid("accounts_get", accounts_request)
         print(f"Found {len(accounts_response['accounts'])} accounts")
+        item_id = item_id or accounts_response["item"]["item_id"]
 
         for account in accounts_response["accounts"]:
             print(f"Processing account: {account['account_id']}")
             db_account = Account(
                 account_id=account["account_id"],
+                item_id=item_id,
                 account_name=account["name"],
                 account_official_name=account.get("official_name", ""),
                 account_type=str(account["type"])
@@ -58,6 +74,7 @@ async def create_link_token(payload: dict = Depends(verify_token)):
         products=[Products("transactions")],
         country_codes=[CountryCode("CA")],
         language="en",
+        **({"webhook": settings.PLAID_WEBHOOK_URL} if settings.PLAID_WEBHOOK_URL else {})
     )
     try:
         response = client.link_token_create(request)
@@ -75,24 +92,25 @@ async def exchange_public_token(request: PublicTokenExchangeRequest, payload: di
         item_id = response["item_id"]
         print(access_token, item_id)
 
-        # Save to environment file
-        with open(env_file, "a") as f:
-            f.write(f"\nPLAID_ACCESS_TOKEN={access_token}\nPLAID_ITEM_ID={item_id}")
+        # Register the item so it is synced alongside any existing connections
+        register_item(db, item_id, access_token)
+        db.commit()
 
         # Store account information to the db
-        store_accounts(access_token, db)
+        store_accounts(access_token, db, item_id)
 
         return {"status": "success", "access_token": access_token, "item_id": item_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/link/token/update")
-async def create_update_link_token(payload: dict = Depends(verify_token)):
+async def create_update_link_token(item_id: Optional[str] = None, payload: dict = Depends(verify_token), db: Session = Depends(get_db)):
 
-    access_token = settings.PLAID_ACCESS_TOKEN
-    if not access_token:
+    items = [get_item(db, item_id)] if item_id else list_items(db)[:1]
+    if not items or not items[0]:
         raise HTTPException(status_code=400, detail="No access token available. Please connect bank account first.")
-    
+    access_token = items[0].access_token
+
     client = get_plaid_client()
     request = LinkTokenCreateRequest(
         access_token=access_token,
@@ -105,4 +123,32 @@ async def create_update_link_token(payload: dict = Depends(verify_token)):
         response = client.link_token_create(request)
         return {"link_token": response["link_token"]}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/items", response_model=List[PlaidItemSchema])
+async def get_items(payload: dict = Depends(verify_token), db: Session = Depends(get_db)):
+    return list_items(db)
+
+@router.post("/webhook")
+async def receive_webhook(request: Request, plaid_verification: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    # Called by Plaid, not by the app: instead of a bearer token, Plaid signs the raw body
+    body = await request.body()
+    verify_webhook(body, plaid_verification)
+    try:
+        webhook = PlaidWebhook.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+    item = get_item(db, webhook.item_id) if webhook.item_id else None
+    if not item:
+        return {"status": "ignored"}
+
+    if webhook.webhook_type == "ITEM" and webhook.webhook_code == "ERROR":
+        invalidate_item_status(item.access_token)
+        return {"status": "item_error_recorded"}
+
+    if webhook.webhook_type != "TRANSACTIONS" or webhook.webhook_code not in SYNC_WEBHOOK_CODES:
+        return {"status": "ignored"}
+
+    scheduled = webhook_coalescer.notify(webhook.item_id)
+    return {"status": "scheduled" if scheduled else "coalesced"}
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import func, extract, case
-from sqlalchemy import and_, or_
-from plaid.model.transactions_sync_request import TransactionsSyncRequest
+from sqlalchemy.sql import extract, case
+from sqlalchemy import and_, or_, tuple_
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import date
@@ -14,15 +14,21 @@ from ...schemas.transaction import (
     Transaction as TransactionSchema,
     TransactionListResponse,
     TransactionSummaryResponse,
-    PeriodSummary,
-    CategorySummary
+    TransactionPivotResponse
 )
-from ...models.sync_cursor import SyncCursor
-from ...api.plaid.client import get_plaid_client
 from ...utils.auth import verify_token
-from ...config.settings import settings
-from ...services.plaid import check_item_status
-import time
+from ...utils.pagination import KEYSET_COLUMNS, decode_cursor, next_cursor_for
+from ...utils.fast_json import dumps
+from ...utils.etag import check_not_modified
+from ...services.transaction_sync import sync_item_once, sync_all_items
+from ...services.item_registry import get_item
+from ...services.transaction_queries import filtered_transactions
+from ...services.transaction_export import EXPORT_FORMATS, parquet_available, export_transactions as stream_transactions
+from ...services.transaction_summary import summarize_transactions, pivot_transactions
+from ...services.analytics_cache import analytics_cache
+from ...services.columnar_analytics import use_columnar, get_snapshot, summarize_snapshot, pivot_snapshot
+from ...services.transaction_counts import COUNT_STRATEGIES, count_transactions
+from ...services.sync_jobs import submit_sync_job, get_sync_job
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,171 +36,186 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/transactions")
 security = HTTPBearer()
 
+class ItemSyncResult(BaseModel):
+    item_id: str
+    sync_status: str
+    synced_count: int = 0
+    modified_count: int = 0
+    removed_count: int = 0
+    error: Optional[str] = None
+
 class SyncResponse(BaseModel):
     synced_count: int
     latest_transaction_date: Optional[str] = None
     sync_status: str
-
-def handle_sync_error(e, access_token: str):
-    if hasattr(e, 'error_code'):
-        if e.error_code == 'TRANSACTIONS_SYNC_LIMIT':
-            logger.warning(f"Rate limit exceedded for /transactions/sync: {access_token[:10]}...")
-            raise HTTPException(status_code=429, detail="Rate limit exceeded. Please try again later.")
-        elif e.error_code == 'TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION':
-            logger.warning(f"Pagination mutation during sync: Restarting loop for {access_token[:10]}...")
-            raise HTTPException(status_code=500, detail="Sync interrupted. Restarting update.")
-    raise HTTPException(status_code=500, detail=str(e))
-
+    modified_count: int = 0
+    removed_count: int = 0
+    rows_per_second: float = 0.0
+    plaid_seconds: float = 0.0
+    ingest_seconds: float = 0.0
+    items: List[ItemSyncResult] = []
+
+class SyncJobResponse(BaseModel):
+    job_id: str
+    status: str
+    created_at: str
+    item_id: Optional[str] = None
+    pages: int
+    rows: int
+    elapsed_seconds: float
+    result: Optional[SyncResponse] = None
+    error: Optional[str] = None
+
+@router.post("/sync", response_model=SyncJobResponse, status_code=202)
+async def start_sync_job(item_id: Optional[str] = None, payload: dict = Depends(verify_token)):
+    # Without item_id every registered bank connection is synced in parallel
+    job = submit_sync_job(item_id=item_id)
+    return job.to_dict()
+
+@router.get("/sync/jobs/{job_id}", response_model=SyncJobResponse)
+async def get_sync_job_status(job_id: str, payload: dict = Depends(verify_token)):
+    job = get_sync_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Sync job {job_id} not found")
+    return job.to_dict()
+
+# Kept for existing clients. A plain def runs in the threadpool so the blocking
+# Plaid/DB calls never stall the event loop.
 @router.get("/sync", response_model=SyncResponse)
-async def sync_transactions(payload: dict = Depends(verify_token), db: Session = Depends(get_db)):
-    client = get_plaid_client()
-    access_token = settings.PLAID_ACCESS_TOKEN
-
-    # Check item status before syncing
-    check_item_status(access_token)
-
-    cursor_record = db.query(SyncCursor).first()
-    cursor = cursor_record.cursor if cursor_record else ""
-
-    request = TransactionsSyncRequest(
-        access_token=access_token,
-        cursor=cursor,
-        count=500 # maximum txs to get once
-    )
-
-    synced_count = 0
-    latest_date = None
-    retry_count = 0
-    max_retries = 3 # just in the case that too many request are called. fix whatever you want.
+def sync_transactions(item_id: Optional[str] = None, payload: dict = Depends(verify_token), db: Session = Depends(get_db)):
+    if item_id is None:
+        return sync_all_items()
 
-    try:
-        while True:
-            response = client.transactions_sync(request)
-            for added in response["added"]:
-                if not db.query(Account).filter(Account.account_id == added["account_id"]).first():
-                    raise HTTPException(status_code=400, detail=f"Account {added['account_id']} not found")
+    item = get_item(db, item_id)
+    if not item:
+        raise HTTPException(status_code=404, detail=f"Item {item_id} not found")
+    return sync_item_once(db, item.item_id, item.access_token)
 
-                db_transaction = Transaction(
-                    transaction_id=added["transaction_id"],
-                    account_id=added["account_id"],
-                    amount=added["amount"],
-                    transaction_date=added["date"],
-                    merchant_name=added.get("merchant_name"),
-                    name=added.get("name"),
-                    pending=added["pending"],
-                    personal_finance_category_primary=added["personal_finance_category"]["primary"] if added.get("personal_finance_category") else None,
-                    personal_finance_category_detailed=added["personal_finance_category"]["detailed"] if added.get("personal_finance_category") else None,
-                    is_removed=False
-                )
-                db.merge(db_transaction)
-                synced_count += 1
+LISTABLE_FIELDS = tuple(TransactionSchema.model_fields)
 
-                # Track latest transaction date
-                if latest_date is None or added["date"] > latest_date:
-                    latest_date = added["date"]
-
-            for modified in response["modified"]:
-                db_transaction = db.query(Transaction).filter(Transaction.transaction_id == modified["transaction_id"]).first()
-                if db_transaction:
-                    db_transaction.account_id = modified["account_id"]
-                    db_transaction.amount = modified["amount"]
-                    db_transaction.pending = modified["pending"]
-                    db_transaction.updated_at = func.current_timestamp()
-                    db.merge(db_transaction)
-
-            for removed in response["removed"]:
-                db_transaction = db.query(Transaction).filter(Transaction.transaction_id == removed["transaction_id"]).first()
-                if db_transaction:
-                    db_transaction.is_removed = True
-                    db.merge(db_transaction)
-
-            cursor = response["next_cursor"]
-            if not response["has_more"]:
-                logger.info("Transactions are completely fetched into database.")
-                break
-
-            time.sleep(1)
-            request.cursor = cursor
-            retry_count += 1
-            if retry_count > max_retries:
-                raise HTTPException(status_code=500, detail="Too many pages in sync response")
-
-        if cursor_record:
-            cursor_record.cursor = cursor
-            cursor_record.updated_at = func.current_timestamp()
-        else:
-            db.add(SyncCursor(account_id=response["accounts"][0]["account_id"] if response.get("accounts") else "default_account", cursor=cursor))
-        db.commit()
-
-        logger.info(f"Sync completed: {synced_count} transactions processed")
-        return {
-            "synced_count": synced_count,
-            "latest_transaction_date": latest_date.isoformat() if latest_date else None,
-            "sync_status": "success"
-        }
-    
-    except Exception as e:
-        handle_sync_error(e, access_token)
-        db.rollback()
-        raise
+def parse_fields(fields: str) -> list[str]:
+    """Split a fields= parameter into known transaction field names, or raise 400"""
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in LISTABLE_FIELDS]
+    if unknown or not names:
+        raise HTTPException(status_code=400, detail=f"Invalid fields: {', '.join(unknown) or fields}")
+    return names
 
 @router.get("", response_model=TransactionListResponse)
 async def get_transactions(
+    request: Request,
+    response: Response,
     account_id: str,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     sort_by: str = "transaction_date",
     sort_order: str = "desc",
     include_removed: bool = False,
     include_pending: bool = True,
+    count_strategy: str = "exact",  # "exact", "estimated", "none"
+    fields: Optional[str] = None,  # comma-separated subset of transaction fields
     payload: dict = Depends(verify_token),
     db: Session = Depends(get_db)
 ):
-    
+    sort_order = "asc" if sort_order.lower() == "asc" else "desc"
+    selected_fields = parse_fields(fields) if fields else None
+    if count_strategy not in COUNT_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Invalid count_strategy value: {count_strategy}")
+    if cursor and sort_by not in KEYSET_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"cursor pagination supports sort_by in {sorted(KEYSET_COLUMNS)}")
+
     # Verify account exists
     account = db.query(Account).filter(Account.account_id == account_id).first()
     if not account:
         raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
 
-    # Build base query
-    query = db.query(Transaction).filter(Transaction.account_id == account_id)
-
-    # Apply filters
-    if not include_removed:
-        query = query.filter(Transaction.is_removed == False)
+    # Unchanged since the client's copy: answer from the account row alone
+    check_not_modified(request, response, account.data_version)
 
-    if not include_pending:
-        query = query.filter(Transaction.pending == False)
-
-    if start_date:
-        query = query.filter(Transaction.transaction_date >= start_date)
-
-    if end_date:
-        query = query.filter(Transaction.transaction_date <= end_date)
+    # Build filtered query
+    query = filtered_transactions(db, account_id, start_date, end_date, include_removed, include_pending)
 
     # Get total count
-    total = query.count()
+    filter_key = (start_date, end_date, include_removed, include_pending)
+    total, total_estimated = count_transactions(db, query, count_strategy, account_id, account.data_version, filter_key)
 
-    # Apply sorting
-    if sort_order.lower() == "asc":
-        query = query.order_by(getattr(Transaction, sort_by).asc())
+    # Apply sorting; transaction_id breaks ties so pages never overlap
+    sort_column = getattr(Transaction, sort_by)
+    if sort_order == "asc":
+        query = query.order_by(sort_column.asc(), Transaction.transaction_id.asc())
     else:
-        query = query.order_by(getattr(Transaction, sort_by).desc())
-
-    # Apply pagination
-    transactions = query.limit(limit).offset(offset).all()
+        query = query.order_by(sort_column.desc(), Transaction.transaction_id.desc())
+
+    # Apply pagination: a cursor seeks straight past the previous page, offset still works
+    if cursor:
+        after_value, after_id = decode_cursor(cursor, sort_by, sort_order)
+        position = tuple_(sort_column, Transaction.transaction_id)
+        boundary = tuple_(after_value, after_id)
+        query = query.filter(position > boundary if sort_order == "asc" else position < boundary)
+        offset = 0
+
+    if selected_fields:
+        # Sparse fieldset: Core rows of just the needed columns, encoded without
+        # building ORM entities or validating each row through TransactionSchema
+        needed = dict.fromkeys(selected_fields + [sort_by, "transaction_id"])
+        query = query.with_entities(*(getattr(Transaction, name) for name in needed))
+        rows = query.limit(limit + 1).offset(offset).all()
+        return Response(content=dumps({
+            "transactions": [{name: getattr(row, name) for name in selected_fields} for row in rows[:limit]],
+            "total": total,
+            "total_estimated": total_estimated,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": next_cursor_for(rows, limit, sort_by, sort_order)
+        }), media_type="application/json", headers=response.headers)
+
+    # One extra row tells us whether there is a next page
+    rows = query.limit(limit + 1).offset(offset).all()
 
     return {
-        "transactions": transactions,
+        "transactions": rows[:limit],
         "total": total,
+        "total_estimated": total_estimated,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": next_cursor_for(rows, limit, sort_by, sort_order)
     }
 
+@router.get("/export")
+async def export_transactions(
+    account_id: str,
+    format: str = "ndjson",  # "ndjson", "csv", "parquet"
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_removed: bool = False,
+    include_pending: bool = True,
+    payload: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid format value: {format}")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow to be installed")
+
+    # Verify account exists
+    account = db.query(Account).filter(Account.account_id == account_id).first()
+    if not account:
+        raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
+
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        stream_transactions(format, account_id, start_date, end_date, include_removed, include_pending),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="transactions-{account_id}.{extension}"'}
+    )
+
 @router.get("/summary", response_model=TransactionSummaryResponse)
 async def get_transactions_summary(
+    request: Request,
+    response: Response,
     account_id: str,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
@@ -211,97 +232,55 @@ async def get_transactions_summary(
     if not account:
         raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
 
-    # Build base query
-    query = db.query(Transaction).filter(Transaction.account_id == account_id)
-
-    # Apply filters
-    if not include_removed:
-        query = query.filter(Transaction.is_removed == False)
-
-    if not include_pending:
-        query = query.filter(Transaction.pending == False)
-
-    if start_date:
-        query = query.filter(Transaction.transaction_date >= start_date)
-
-    if end_date:
-        query = query.filter(Transaction.transaction_date <= end_date)
-
-    # Get all transactions for processing
-    transactions = query.all()
+    # Unchanged since the client's copy: answer from the account row alone
+    check_not_modified(request, response, account.data_version)
 
-    # Calculate period summaries
-    # Note: Plaid stores expenses as positive, income as negative
-    period_summaries = []
-    if group_by == "all":
-        total_expense = sum(t.amount for t in transactions if t.amount > 0)
-        total_income = sum(abs(t.amount) for t in transactions if t.amount < 0)
-        period_summaries.append(PeriodSummary(
-            period="all",
-            income=float(total_income),
-            expense=float(total_expense),
-            net=float(total_income - total_expense),
-            transaction_count=len(transactions)
-        ))
+    cache_key = (
+        "summary", account_id, account.data_version,
+        start_date, end_date, group_by, category_type, include_removed, include_pending
+    )
+    if use_columnar(include_removed):
+        compute = lambda: summarize_snapshot(
+            get_snapshot(db, account), start_date, end_date, group_by, category_type, include_pending
+        )
     else:
-        # Group transactions by period
-        period_groups = {}
-        for t in transactions:
-            if group_by == "week":
-                # ISO week format: YYYY-Www
-                period_key = f"{t.transaction_date.year}-W{t.transaction_date.isocalendar()[1]:02d}"
-            elif group_by == "month":
-                period_key = t.transaction_date.strftime("%Y-%m")
-            elif group_by == "year":
-                period_key = str(t.transaction_date.year)
-            else:
-                raise HTTPException(status_code=400, detail=f"Invalid group_by value: {group_by}")
-
-            if period_key not in period_groups:
-                period_groups[period_key] = []
-            period_groups[period_key].append(t)
-
-        # Calculate summaries for each period
-        for period, txs in sorted(period_groups.items()):
-            expense = sum(t.amount for t in txs if t.amount > 0)
-            income = sum(abs(t.amount) for t in txs if t.amount < 0)
-            period_summaries.append(PeriodSummary(
-                period=period,
-                income=float(income),
-                expense=float(expense),
-                net=float(income - expense),
-                transaction_count=len(txs)
-            ))
-
-    # Calculate category summaries
-    category_groups = {}
-    category_field = "personal_finance_category_primary" if category_type == "primary" else "personal_finance_category_detailed"
-
-    for t in transactions:
-        category = getattr(t, category_field) or "Uncategorized"
-        if category not in category_groups:
-            category_groups[category] = []
-        category_groups[category].append(t)
-
-    category_summaries = []
-    for category, txs in sorted(category_groups.items()):
-        total_amount = sum(t.amount for t in txs)
-        category_summaries.append(CategorySummary(
-            category=category,
-            amount=float(total_amount),
-            transaction_count=len(txs),
-            category_type=category_type
-        ))
+        compute = lambda: summarize_transactions(
+            db, account_id, start_date, end_date, group_by, category_type, include_removed, include_pending
+        )
+    return analytics_cache.get_or_compute(account_id, cache_key, compute)
+
+@router.get("/pivot", response_model=TransactionPivotResponse)
+async def get_transactions_pivot(
+    request: Request,
+    response: Response,
+    account_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: str = "month",  # "week", "month", "year", "all"
+    category_type: str = "primary",  # "primary" or "detailed"
+    include_removed: bool = False,
+    include_pending: bool = True,
+    payload: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
+):
+    # Verify account exists
+    account = db.query(Account).filter(Account.account_id == account_id).first()
+    if not account:
+        raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
 
-    # Calculate overall totals
-    total_expense = sum(t.amount for t in transactions if t.amount > 0)
-    total_income = sum(abs(t.amount) for t in transactions if t.amount < 0)
+    # Unchanged since the client's copy: answer from the account row alone
+    check_not_modified(request, response, account.data_version)
 
-    return {
-        "period_summaries": period_summaries,
-        "category_summaries": category_summaries,
-        "total_income": float(total_income),
-        "total_expense": float(total_expense),
-        "net_total": float(total_income - total_expense),
-        "total_transactions": len(transactions)
-    }
+    cache_key = (
+        "pivot", account_id, account.data_version,
+        start_date, end_date, group_by, category_type, include_removed, include_pending
+    )
+    if use_columnar(include_removed):
+        compute = lambda: pivot_snapshot(
+            get_snapshot(db, account), start_date, end_date, group_by, category_type, include_pending
+        )
+    else:
+        compute = lambda: pivot_transactions(
+            db, account_id, start_date, end_date, group_by, category_type, include_removed, include_pending
+        )
+    return analytics_cache.get_or_compute(account_id, cache_key, compute)
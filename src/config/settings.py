@@ -30,6 +30,26 @@ class Settings(BaseSettings):
     PLAID_ACCESS_TOKEN: str = ""
     PLAID_ITEM_ID: str = ""
     DATABASE_URL: str = ""
+    SYNC_WORKER_COUNT: int = 2
+    SYNC_ALL_MAX_WORKERS: int = 4
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+    ANALYTICS_CACHE_MAX_ENTRIES: int = 256
+    ANALYTICS_ENGINE: str = "sql"  # "sql" or "numpy"
+    ASSET_HISTORY_ENGINE: str = "python"  # "python" or "window" (Postgres window functions), with the sql engine
+    SNAPSHOT_MAX_ACCOUNTS: int = 32
+    SNAPSHOT_REFRESH_OVERLAP_SECONDS: int = 300
+    EXPORT_BATCH_SIZE: int = 2000
+    PLAID_POOL_MAXSIZE: int = 10
+    PLAID_TCP_KEEPALIVE: bool = True
+    PLAID_CONNECT_TIMEOUT: float = 5.0
+    PLAID_READ_TIMEOUT: float = 60.0
+    PLAID_RATE_LIMIT_ENABLED: bool = True
+    PLAID_MAX_RETRIES: int = 5
+    ITEM_STATUS_TTL_SECONDS: int = 300
+    PLAID_WEBHOOK_URL: str = ""
+    WEBHOOK_DEBOUNCE_SECONDS: float = 5.0
+    PLAID_BACKOFF_BASE_SECONDS: float = 0.5
+    PLAID_BACKOFF_MAX_SECONDS: float = 30.0
 
     class Config:
         env_file = env_file
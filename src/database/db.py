@@ -1,7 +1,9 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from ..config.settings import settings
+import zlib
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -12,4 +14,19 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+@contextmanager
+def advisory_lock(name: str):
+    """Hold a session-level Postgres advisory lock on a dedicated connection.
+
+    Sessions hand their connection back to the pool on commit, so the lock
+    lives on its own connection to survive the per-page commits of a sync.
+    """
+    key = zlib.crc32(name.encode("utf-8"))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
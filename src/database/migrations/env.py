@@ -28,6 +28,9 @@ from src.models.account import Account
 from src.models.transaction import Transaction
 from src.models.sync_cursor import SyncCursor
 from src.models.custom_category import CustomCategory
+from src.models.plaid_item import PlaidItem
+from src.models.daily_rollup import DailyAccountCategoryRollup
+from src.models.balance_checkpoint import BalanceCheckpoint
 from src.database.db import Base
 target_metadata = Base.metadata
 # from myapp import mymodel
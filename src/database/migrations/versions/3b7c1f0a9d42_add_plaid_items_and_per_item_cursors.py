@@ -0,0 +1,101 @@
+"""add plaid_items registry and key sync_cursors by item
+
+Revision ID: 3b7c1f0a9d42
+Revises: e9d801f12f2a
+Create Date: 2026-10-18 10:12:31.482211
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from src.config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c1f0a9d42'
+down_revision: Union[str, Sequence[str], None] = 'e9d801f12f2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = 'canada_budget_tracker_production'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('plaid_items',
+        sa.Column('item_id', sa.String(length=255), nullable=False),
+        sa.Column('access_token', sa.String(length=255), nullable=False),
+        sa.Column('institution_id', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('item_id'),
+        schema=SCHEMA
+    )
+
+    op.add_column('accounts', sa.Column('item_id', sa.String(length=255), nullable=True), schema=SCHEMA)
+    op.create_foreign_key(
+        'fk_accounts_item_id',
+        'accounts',
+        'plaid_items',
+        ['item_id'],
+        ['item_id'],
+        ondelete='SET NULL',
+        source_schema=SCHEMA,
+        referent_schema=SCHEMA
+    )
+
+    # Move the single item that used to live in the env file into the registry
+    if settings.PLAID_ITEM_ID and settings.PLAID_ACCESS_TOKEN:
+        op.execute(
+            sa.text(f"INSERT INTO {SCHEMA}.plaid_items (item_id, access_token) VALUES (:item_id, :access_token)")
+            .bindparams(item_id=settings.PLAID_ITEM_ID, access_token=settings.PLAID_ACCESS_TOKEN)
+        )
+        op.execute(
+            sa.text(f"UPDATE {SCHEMA}.accounts SET item_id = :item_id")
+            .bindparams(item_id=settings.PLAID_ITEM_ID)
+        )
+
+    # Re-key sync_cursors from the first account id to the item id
+    op.add_column('sync_cursors', sa.Column('item_id', sa.String(length=255), nullable=True), schema=SCHEMA)
+    op.execute(f"UPDATE {SCHEMA}.sync_cursors c SET item_id = a.item_id FROM {SCHEMA}.accounts a WHERE a.account_id = c.account_id")
+    op.execute(f"DELETE FROM {SCHEMA}.sync_cursors WHERE item_id IS NULL")
+    op.drop_constraint('sync_cursors_pkey', 'sync_cursors', type_='primary', schema=SCHEMA)
+    op.drop_column('sync_cursors', 'account_id', schema=SCHEMA)
+    op.alter_column('sync_cursors', 'item_id', nullable=False, schema=SCHEMA)
+    op.create_primary_key('sync_cursors_pkey', 'sync_cursors', ['item_id'], schema=SCHEMA)
+    op.create_foreign_key(
+        'fk_sync_cursors_item_id',
+        'sync_cursors',
+        'plaid_items',
+        ['item_id'],
+        ['item_id'],
+        ondelete='CASCADE',
+        source_schema=SCHEMA,
+        referent_schema=SCHEMA
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Cursors cannot be mapped back to a single account, so they are dropped
+    op.drop_constraint('fk_sync_cursors_item_id', 'sync_cursors', type_='foreignkey', schema=SCHEMA)
+    op.execute(f"DELETE FROM {SCHEMA}.sync_cursors")
+    op.drop_constraint('sync_cursors_pkey', 'sync_cursors', type_='primary', schema=SCHEMA)
+    op.drop_column('sync_cursors', 'item_id', schema=SCHEMA)
+    op.add_column('sync_cursors', sa.Column('account_id', sa.String(length=255), nullable=False), schema=SCHEMA)
+    op.create_primary_key('sync_cursors_pkey', 'sync_cursors', ['account_id'], schema=SCHEMA)
+    op.create_foreign_key(
+        'sync_cursors_account_id_fkey',
+        'sync_cursors',
+        'accounts',
+        ['account_id'],
+        ['account_id'],
+        ondelete='CASCADE',
+        source_schema=SCHEMA,
+        referent_schema=SCHEMA
+    )
+
+    op.drop_constraint('fk_accounts_item_id', 'accounts', type_='foreignkey', schema=SCHEMA)
+    op.drop_column('accounts', 'item_id', schema=SCHEMA)
+    op.drop_table('plaid_items', schema=SCHEMA)
@@ -0,0 +1,51 @@
+"""add partial composite transaction index, drop date and boolean indexes
+
+Revision ID: 5d2e8a4c1b07
+Revises: 3b7c1f0a9d42
+Create Date: 2026-10-18 14:05:12.907315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8a4c1b07'
+down_revision: Union[str, Sequence[str], None] = '3b7c1f0a9d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = 'canada_budget_tracker_production'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Every read endpoint filters account_id AND NOT is_removed [AND date range]
+    # and orders by transaction_date, transaction_id; amount/pending ride along
+    # so balance and summary sums can be answered from the index
+    op.create_index(
+        'idx_transactions_account_date_live',
+        'transactions',
+        ['account_id', 'transaction_date', 'transaction_id'],
+        unique=False,
+        schema=SCHEMA,
+        postgresql_where=sa.text('NOT is_removed'),
+        postgresql_include=['amount', 'pending']
+    )
+
+    # idx_transactions_account_id stays for include_removed listings and the accounts FK cascade.
+    # No query filters on the date alone, so the date index only competes with the composite one.
+    # Booleans are almost all one value: never chosen by the planner, but paid for on every sync write
+    op.drop_index('idx_transactions_date', 'transactions', schema=SCHEMA)
+    op.drop_index('idx_transactions_pending', 'transactions', schema=SCHEMA)
+    op.drop_index('idx_transactions_is_removed', 'transactions', schema=SCHEMA)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_transactions_is_removed', 'transactions', ['is_removed'], unique=False, schema=SCHEMA)
+    op.create_index('idx_transactions_pending', 'transactions', ['pending'], unique=False, schema=SCHEMA)
+    op.create_index('idx_transactions_date', 'transactions', ['transaction_date'], unique=False, schema=SCHEMA)
+    op.drop_index('idx_transactions_account_date_live', 'transactions', schema=SCHEMA)
@@ -0,0 +1,34 @@
+"""add accounts.data_version for conditional GETs
+
+Revision ID: 8f41c3d27e55
+Revises: 5d2e8a4c1b07
+Create Date: 2026-10-18 15:32:47.210894
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f41c3d27e55'
+down_revision: Union[str, Sequence[str], None] = '5d2e8a4c1b07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = 'canada_budget_tracker_production'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'accounts',
+        sa.Column('data_version', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+        schema=SCHEMA
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('accounts', 'data_version', schema=SCHEMA)
@@ -0,0 +1,61 @@
+"""add balance_checkpoints
+
+Revision ID: a7d2f9e4c3b1
+Revises: c6a09b3f5e18
+Create Date: 2026-10-18 21:42:17.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2f9e4c3b1'
+down_revision: Union[str, Sequence[str], None] = 'c6a09b3f5e18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = 'canada_budget_tracker_production'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('balance_checkpoints',
+        sa.Column('account_id', sa.String(length=255), nullable=False),
+        sa.Column('checkpoint_date', sa.Date(), nullable=False),
+        sa.Column('balance', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(['account_id'], [f'{SCHEMA}.accounts.account_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('account_id', 'checkpoint_date'),
+        schema=SCHEMA
+    )
+
+    # Backfill every month end from each account's first transaction through the
+    # last completed month, from the daily rollups; sync keeps it current from here on
+    op.execute(f"""
+        INSERT INTO {SCHEMA}.balance_checkpoints (account_id, checkpoint_date, balance)
+        WITH monthly AS (
+            SELECT account_id,
+                   (date_trunc('month', rollup_date) + interval '1 month - 1 day')::date AS checkpoint_date,
+                   sum(income - expense) AS net
+            FROM {SCHEMA}.daily_account_category_rollups
+            GROUP BY 1, 2
+        ), month_ends AS (
+            SELECT account_id, (month + interval '1 month - 1 day')::date AS checkpoint_date
+            FROM (
+                SELECT account_id, date_trunc('month', min(checkpoint_date)) AS first_month
+                FROM monthly GROUP BY account_id
+            ) bounds,
+            generate_series(first_month, date_trunc('month', current_date) - interval '1 month', interval '1 month') AS month
+        )
+        SELECT account_id,
+               checkpoint_date,
+               sum(coalesce(net, 0)) OVER (PARTITION BY account_id ORDER BY checkpoint_date)
+        FROM month_ends LEFT JOIN monthly USING (account_id, checkpoint_date)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('balance_checkpoints', schema=SCHEMA)
@@ -0,0 +1,59 @@
+"""add daily_account_category_rollups
+
+Revision ID: c6a09b3f5e18
+Revises: 8f41c3d27e55
+Create Date: 2026-10-18 17:20:03.551730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6a09b3f5e18'
+down_revision: Union[str, Sequence[str], None] = '8f41c3d27e55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = 'canada_budget_tracker_production'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_account_category_rollups',
+        sa.Column('account_id', sa.String(length=255), nullable=False),
+        sa.Column('rollup_date', sa.Date(), nullable=False),
+        sa.Column('category_primary', sa.String(length=100), nullable=False),
+        sa.Column('category_detailed', sa.String(length=100), nullable=False),
+        sa.Column('pending', sa.Boolean(), nullable=False),
+        sa.Column('income', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('expense', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['account_id'], [f'{SCHEMA}.accounts.account_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('account_id', 'rollup_date', 'category_primary', 'category_detailed', 'pending'),
+        schema=SCHEMA
+    )
+
+    # Backfill from the existing ledger; sync keeps it current from here on
+    op.execute(f"""
+        INSERT INTO {SCHEMA}.daily_account_category_rollups
+            (account_id, rollup_date, category_primary, category_detailed, pending, income, expense, transaction_count)
+        SELECT account_id,
+               transaction_date,
+               coalesce(personal_finance_category_primary, ''),
+               coalesce(personal_finance_category_detailed, ''),
+               coalesce(pending, false),
+               coalesce(-sum(amount) FILTER (WHERE amount < 0), 0),
+               coalesce(sum(amount) FILTER (WHERE amount > 0), 0),
+               count(*)
+        FROM {SCHEMA}.transactions
+        WHERE is_removed = false AND account_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_account_category_rollups', schema=SCHEMA)
@@ -0,0 +1,30 @@
+"""add sync_cursors.pagination_start_cursor
+
+Revision ID: d3f58a1c7e94
+Revises: a7d2f9e4c3b1
+Create Date: 2026-10-18 23:05:12.618304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f58a1c7e94'
+down_revision: Union[str, Sequence[str], None] = 'a7d2f9e4c3b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCHEMA = 'canada_budget_tracker_production'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sync_cursors', sa.Column('pagination_start_cursor', sa.String(length=255), nullable=True), schema=SCHEMA)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('sync_cursors', 'pagination_start_cursor', schema=SCHEMA)
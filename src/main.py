@@ -1,8 +1,19 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .api import auth, plaid, transactions, assets
+from .api import auth, plaid, transactions, assets, metrics
+from .services.plaid_client import close_plaid_client
+from .services.sync_jobs import shutdown_sync_workers
+from .services.webhook_sync import webhook_coalescer
 
-app = FastAPI(title="CIBC Budget Tracker")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    webhook_coalescer.cancel_all()
+    shutdown_sync_workers()
+    close_plaid_client()
+
+app = FastAPI(title="CIBC Budget Tracker", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -14,4 +25,5 @@ app.add_middleware(
 app.include_router(auth.router)
 app.include_router(plaid.router)
 app.include_router(transactions.router)
-app.include_router(assets.router)
\ No newline at end of file
+app.include_router(assets.router)
+app.include_router(metrics.router)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, ForeignKey, BigInteger
 from sqlalchemy.sql import func
 from ..database.db import Base
 from ..config.settings import settings
@@ -8,8 +8,11 @@ class Account(Base):
     __table_args__ = {"schema": settings.DATABASE_SCHEMA}
 
     account_id = Column(String(255), primary_key=True)
+    item_id = Column(String(255), ForeignKey(f"{settings.DATABASE_SCHEMA}.plaid_items.item_id", ondelete="SET NULL"), nullable=True)
     account_name = Column(String(100))
     account_official_name = Column(String(100))
     account_type = Column(String(50))
     created_at = Column(DateTime, server_default=func.current_timestamp())
-    last_synced_at = Column(DateTime)
\ No newline at end of file
+    last_synced_at = Column(DateTime)
+    # Bumped in the same transaction as every write to the account's transactions
+    data_version = Column(BigInteger, nullable=False, server_default="0")
\ No newline at end of file
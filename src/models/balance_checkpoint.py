@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Numeric, Date, ForeignKey
+from ..database.db import Base
+from ..config.settings import settings
+
+class BalanceCheckpoint(Base):
+    """Account balance at the end of a month, maintained by sync.
+
+    The balance is the negated sum of live transaction amounts (pending
+    included) dated on or before checkpoint_date, as asset history defines it.
+    """
+    __tablename__ = "balance_checkpoints"
+    __table_args__ = {"schema": settings.DATABASE_SCHEMA}
+
+    account_id = Column(String(255), ForeignKey(f"{settings.DATABASE_SCHEMA}.accounts.account_id", ondelete="CASCADE"), primary_key=True)
+    checkpoint_date = Column(Date, primary_key=True)  # Last day of the month
+    balance = Column(Numeric(18, 2), nullable=False)
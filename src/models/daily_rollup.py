@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Numeric, Date, Boolean, Integer, ForeignKey
+from ..database.db import Base
+from ..config.settings import settings
+
+class DailyAccountCategoryRollup(Base):
+    """Per-day totals of live (not removed) transactions, maintained by sync.
+
+    Missing categories are stored as '' so they can be part of the primary key.
+    """
+    __tablename__ = "daily_account_category_rollups"
+    __table_args__ = {"schema": settings.DATABASE_SCHEMA}
+
+    account_id = Column(String(255), ForeignKey(f"{settings.DATABASE_SCHEMA}.accounts.account_id", ondelete="CASCADE"), primary_key=True)
+    rollup_date = Column(Date, primary_key=True)
+    category_primary = Column(String(100), primary_key=True)
+    category_detailed = Column(String(100), primary_key=True)
+    pending = Column(Boolean, primary_key=True)
+    income = Column(Numeric(18, 2), nullable=False, default=0)  # sum of -amount over amount < 0
+    expense = Column(Numeric(18, 2), nullable=False, default=0)  # sum of amount over amount > 0
+    transaction_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+from ..database.db import Base
+from ..config.settings import settings
+
+class PlaidItem(Base):
+    __tablename__ = "plaid_items"
+    __table_args__ = {"schema": settings.DATABASE_SCHEMA}
+
+    item_id = Column(String(255), primary_key=True)
+    access_token = Column(String(255), nullable=False)
+    institution_id = Column(String(50))
+    created_at = Column(DateTime, server_default=func.current_timestamp())
+    updated_at = Column(DateTime, server_default=func.current_timestamp())
@@ -7,6 +7,8 @@ class SyncCursor(Base):
     __tablename__ = "sync_cursors"
     __table_args__ = {"schema": settings.DATABASE_SCHEMA}
 
-    account_id = Column(String(255), ForeignKey(f"{settings.DATABASE_SCHEMA}.accounts.account_id", ondelete="CASCADE"), primary_key=True)
+    item_id = Column(String(255), ForeignKey(f"{settings.DATABASE_SCHEMA}.plaid_items.item_id", ondelete="CASCADE"), primary_key=True)
     cursor = Column(String(255), nullable=False)
-    updated_at = Column(DateTime, server_default=func.current_timestamp())
\ No newline at end of file
+    # Cursor the unfinished pagination loop began with; NULL once a loop reaches has_more = false
+    pagination_start_cursor = Column(String(255), nullable=True)
+    updated_at = Column(DateTime, server_default=func.current_timestamp())
@@ -4,6 +4,7 @@ from typing import Optional
 
 class AccountBase(BaseModel):
     account_id: str
+    item_id: Optional[str] = None
     account_name: Optional[str]
     account_official_name: Optional[str]
     account_type: Optional[str]
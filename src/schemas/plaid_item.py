@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class PlaidItemBase(BaseModel):
+    item_id: str
+    institution_id: Optional[str] = None
+
+class PlaidItem(PlaidItemBase):
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,14 +1,16 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class SyncCursorBase(BaseModel):
-    account_id: str
+    item_id: str
     cursor: str
 
 class SyncCursorCreate(SyncCursorBase):
     pass
 
 class SyncCursor(SyncCursorBase):
+    pagination_start_cursor: Optional[str] = None
     updated_at: datetime
 
     class Config:
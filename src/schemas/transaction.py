@@ -28,9 +28,11 @@ class Transaction(TransactionBase):
 
 class TransactionListResponse(BaseModel):
     transactions: List[Transaction]
-    total: int
+    total: Optional[int] = None  # None when count_strategy="none"
+    total_estimated: bool = False
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 class PeriodSummary(BaseModel):
     period: str  # e.g., "2025-01", "2025-W01", "2025", "all"
@@ -51,4 +53,17 @@ class TransactionSummaryResponse(BaseModel):
     total_income: float
     total_expense: float
     net_total: float
-    total_transactions: int
\ No newline at end of file
+    total_transactions: int
+
+
+class TransactionPivotResponse(BaseModel):
+    group_by: str
+    category_type: str
+    periods: List[str]
+    categories: List[str]
+    amounts: List[List[float]]  # amounts[i][j]: period i, category j; expenses positive
+    counts: List[List[int]]
+    period_totals: List[float]
+    category_totals: List[float]
+    grand_total: float
+    total_transactions: int
@@ -0,0 +1,12 @@
+from ..config.settings import settings
+from .data_events import on_accounts_changed
+from .result_cache import AccountScopedCache
+
+# Summary and asset-history responses. Keys include the account's data_version,
+# so an entry computed while a sync was committing can never be served after it;
+# the listener below just frees those entries as soon as the commit lands.
+analytics_cache = AccountScopedCache(settings.ANALYTICS_CACHE_MAX_ENTRIES, name="analytics")
+
+@on_accounts_changed
+def _invalidate_analytics(account_ids: set[str]) -> None:
+    analytics_cache.invalidate_accounts(account_ids)
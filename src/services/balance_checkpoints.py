@@ -0,0 +1,198 @@
+"""Maintenance of balance_checkpoints.
+
+Sync keeps the table exact: the net amount each page moves per account and
+month is added to every checkpoint from that month on (so backdated
+modifications and removals repair the checkpoints they affect), and
+checkpoints are extended to the end of the last completed month.
+
+Rebuild from the daily rollups with:
+    python -m src.services.balance_checkpoints [ACCOUNT_ID ...]
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, Optional
+import sys
+import logging
+from sqlalchemy import update, delete, bindparam, any_, func, tuple_, Date, Numeric, String
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy.orm import Session
+from ..models.account import Account
+from ..models.balance_checkpoint import BalanceCheckpoint as Checkpoint
+from ..models.daily_rollup import DailyAccountCategoryRollup as Rollup
+from ..models.transaction import Transaction
+from .data_events import bump_data_versions, notify_accounts_changed
+
+logger = logging.getLogger(__name__)
+
+def _month_end(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+def last_completed_month_end(today: Optional[date] = None) -> date:
+    return (today or date.today()).replace(day=1) - timedelta(days=1)
+
+def net_by_month(db: Session, transaction_ids: Iterable[str]) -> dict[tuple[str, date], Decimal]:
+    """Balance effect (negated amounts) of these live transactions per (account_id, month start)"""
+    transaction_ids = list(set(transaction_ids))
+    if not transaction_ids:
+        return {}
+    month = func.date_trunc("month", Transaction.transaction_date).cast(Date)
+    rows = (
+        db.query(Transaction.account_id, month, -func.sum(Transaction.amount))
+        .filter(Transaction.transaction_id == any_(bindparam("checkpoint_ids", transaction_ids, type_=ARRAY(String))))
+        .filter(Transaction.is_removed == False, Transaction.account_id.isnot(None))
+        .group_by(Transaction.account_id, month)
+        .all()
+    )
+    return {(account_id, month_start): net for account_id, month_start, net in rows}
+
+def repair_checkpoints(db: Session, transaction_ids: Iterable[str], previous: dict[tuple[str, date], Decimal]) -> None:
+    """Shift checkpoints by what rewriting these transactions changed.
+
+    ``previous`` is net_by_month() of the same ids taken before the write.
+    Every checkpoint from a changed month on moves by the summed changes up to
+    it. Changes in months without checkpoints yet (the current month, on a
+    routine sync) cost nothing beyond the lookup.
+    """
+    current = net_by_month(db, transaction_ids)
+    through = last_completed_month_end()
+    changes = {}
+    for key in current.keys() | previous.keys():
+        delta = current.get(key, 0) - previous.get(key, 0)
+        if delta and key[1] <= through:
+            changes[key] = delta
+    if not changes:
+        return
+
+    # Arrays unnested server-side keep the statement's shape (and its compiled
+    # form) the same for any number of changed months
+    deltas = func.unnest(
+        bindparam("delta_accounts", [account_id for account_id, _ in changes], type_=ARRAY(String)),
+        bindparam("delta_months", [_month_end(month_start) for _, month_start in changes], type_=ARRAY(Date)),
+        bindparam("delta_amounts", list(changes.values()), type_=ARRAY(Numeric(18, 2))),
+    ).table_valued("account_id", "month_end", "delta").render_derived(name="deltas")
+    shifts = (
+        db.query(Checkpoint.account_id, Checkpoint.checkpoint_date, func.sum(deltas.c.delta).label("delta"))
+        .join(deltas, (deltas.c.account_id == Checkpoint.account_id) & (deltas.c.month_end <= Checkpoint.checkpoint_date))
+        .group_by(Checkpoint.account_id, Checkpoint.checkpoint_date)
+        .subquery()
+    )
+    db.execute(
+        update(Checkpoint)
+        .where(Checkpoint.account_id == shifts.c.account_id, Checkpoint.checkpoint_date == shifts.c.checkpoint_date)
+        .values(balance=Checkpoint.balance + shifts.c.delta)
+        .execution_options(synchronize_session=False)
+    )
+
+def _month_end_rows(db: Session, account_id: str, after: Optional[date], through: date, balance: Decimal) -> list[dict]:
+    """Checkpoint rows for the month ends after ``after`` (itself a month end, or None to start
+    at the first month with transactions) through ``through``, opening at ``balance``"""
+    query = db.query(Rollup).filter(Rollup.account_id == account_id, Rollup.rollup_date <= through)
+    if after is not None:
+        query = query.filter(Rollup.rollup_date > after)
+    month = func.date_trunc("month", Rollup.rollup_date).cast(Date)
+    monthly = dict(query.with_entities(month, func.sum(Rollup.income - Rollup.expense)).group_by(month).all())
+    if after is not None:
+        month_start = after + timedelta(days=1)
+    elif monthly:
+        month_start = min(monthly)
+    else:
+        return []
+
+    rows = []
+    while month_start <= through:
+        balance += monthly.get(month_start, 0)
+        month_end = _month_end(month_start)
+        rows.append({"account_id": account_id, "checkpoint_date": month_end, "balance": balance})
+        month_start = month_end + timedelta(days=1)
+    return rows
+
+def extend_checkpoints(db: Session, account_ids: Iterable[str], through: Optional[date] = None) -> None:
+    """Write missing month-end checkpoints up to ``through`` (the last completed month by default).
+
+    Months are covered from each account's first transaction, including
+    transactions that arrive backdated before its first checkpoint. Usually
+    nothing is missing and this costs a grouped lookup plus one empty index
+    range scan per account.
+    """
+    account_ids = list(set(account_ids))
+    if not account_ids:
+        return
+    through = through or last_completed_month_end()
+    bounds = {
+        account_id: (first_date, last_date)
+        for account_id, first_date, last_date in (
+            db.query(Checkpoint.account_id, func.min(Checkpoint.checkpoint_date), func.max(Checkpoint.checkpoint_date))
+            .filter(Checkpoint.account_id == any_(bindparam("account_ids", account_ids, type_=ARRAY(String))))
+            .group_by(Checkpoint.account_id)
+            .all()
+        )
+    }
+
+    rows = []
+    for account_id in account_ids:
+        if account_id not in bounds:
+            rows += _month_end_rows(db, account_id, None, through, Decimal(0))
+            continue
+        first_date, last_date = bounds[account_id]
+        # Months before the first checkpoint that have since gained transactions
+        rows += _month_end_rows(db, account_id, None, first_date.replace(day=1) - timedelta(days=1), Decimal(0))
+        if last_date < through:
+            balance = db.query(Checkpoint.balance).filter(
+                Checkpoint.account_id == account_id, Checkpoint.checkpoint_date == last_date
+            ).scalar()
+            rows += _month_end_rows(db, account_id, last_date, through, balance)
+    if rows:
+        db.execute(insert(Checkpoint).on_conflict_do_nothing(), rows)
+
+def latest_checkpoint(db: Session, account_id: str, on_or_before: date) -> Optional[Checkpoint]:
+    return (
+        db.query(Checkpoint)
+        .filter(Checkpoint.account_id == account_id, Checkpoint.checkpoint_date <= on_or_before)
+        .order_by(Checkpoint.checkpoint_date.desc())
+        .first()
+    )
+
+def latest_checkpoints(db: Session, account_ids: Iterable[str], on_or_before: date) -> dict[str, Checkpoint]:
+    """latest_checkpoint() of several accounts in one query, keyed by account_id (accounts without one are absent)"""
+    account_ids = list(set(account_ids))
+    if not account_ids:
+        return {}
+    latest = (
+        db.query(Checkpoint.account_id, func.max(Checkpoint.checkpoint_date))
+        .filter(Checkpoint.account_id == any_(bindparam("account_ids", account_ids, type_=ARRAY(String))))
+        .filter(Checkpoint.checkpoint_date <= on_or_before)
+        .group_by(Checkpoint.account_id)
+    )
+    checkpoints = db.query(Checkpoint).filter(tuple_(Checkpoint.account_id, Checkpoint.checkpoint_date).in_(latest))
+    return {checkpoint.account_id: checkpoint for checkpoint in checkpoints}
+
+def rebuild_checkpoints(db: Session, account_ids: Optional[Iterable[str]] = None) -> list[str]:
+    """Recompute checkpoints from the daily rollups for the given accounts (all when None).
+
+    Bumps the accounts' data_version so cached asset history and net worth move
+    on, and returns their ids; the caller commits, then calls
+    notify_accounts_changed().
+    """
+    cleared = delete(Checkpoint)
+    if account_ids is None:
+        account_ids = [account_id for (account_id,) in db.query(Account.account_id)]
+    else:
+        account_ids = list(account_ids)
+        cleared = cleared.where(Checkpoint.account_id.in_(account_ids))
+    db.execute(cleared)
+    extend_checkpoints(db, account_ids)
+    bump_data_versions(db, account_ids)
+    return account_ids
+
+if __name__ == "__main__":
+    from ..database.db import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        rebuilt = rebuild_checkpoints(db, sys.argv[1:] or None)
+        db.commit()
+        notify_accounts_changed(rebuilt)
+        logger.info(f"Rebuilt balance checkpoints for {', '.join(sys.argv[1:]) or 'all accounts'}")
+    finally:
+        db.close()
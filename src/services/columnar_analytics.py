@@ -0,0 +1,347 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+import logging
+import threading
+from sqlalchemy import BigInteger, Integer, cast, func, literal, select
+from sqlalchemy.orm import Session
+from ..config.settings import settings
+from ..models.account import Account
+from ..models.transaction import Transaction
+from .result_cache import AccountScopedCache
+from .transaction_summary import PERIOD_KEYS, period_summary, validate_group_by
+
+try:
+    import numpy as np
+except ImportError:  # The columnar engine is optional; analytics fall back to SQL
+    np = None
+
+logger = logging.getLogger(__name__)
+
+UNCATEGORIZED = "Uncategorized"
+
+# One snapshot per account, least recently used dropped first. Entries are not
+# invalidated on sync: a snapshot behind accounts.data_version is brought up to
+# date in place by reading only the rows changed since it was taken.
+snapshot_cache = AccountScopedCache(settings.SNAPSHOT_MAX_ACCOUNTS, name="columnar_snapshots")
+_refresh_lock = threading.Lock()
+
+SNAPSHOT_COLUMNS = (
+    Transaction.transaction_id,
+    # Day ordinal (date.toordinal()) and integer cents are computed by Postgres
+    (cast(Transaction.transaction_date - literal(date(1, 1, 1)), Integer) + 1).label("day"),
+    cast(Transaction.amount * 100, BigInteger).label("cents"),
+    Transaction.pending,
+    func.coalesce(func.nullif(Transaction.personal_finance_category_primary, ""), UNCATEGORIZED).label("primary"),
+    func.coalesce(func.nullif(Transaction.personal_finance_category_detailed, ""), UNCATEGORIZED).label("detailed"),
+    Transaction.is_removed,
+)
+
+def use_columnar(include_removed: bool = False) -> bool:
+    """Whether the numpy engine serves this request (removed rows are never in a snapshot)"""
+    if settings.ANALYTICS_ENGINE != "numpy" or include_removed:
+        return False
+    if np is None:
+        logger.warning("ANALYTICS_ENGINE is 'numpy' but numpy is not installed; using SQL")
+        return False
+    return True
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    """Columns of one account's transactions as numpy arrays.
+
+    Snapshots are never mutated; a refresh builds a new one, so a request keeps
+    a consistent view while another refreshes the account.
+    """
+    account_id: str
+    data_version: int
+    watermark: datetime  # Database clock when the rows were read; later changes are refreshed incrementally
+    transaction_ids: list[str]
+    positions: dict[str, int]
+    day: "np.ndarray"  # int32 date ordinals
+    cents: "np.ndarray"  # int64 Plaid amounts in cents (expenses positive)
+    pending: "np.ndarray"  # bool
+    live: "np.ndarray"  # bool; False where a row was removed after the snapshot was taken
+    primary: "np.ndarray"  # int32 codes into labels
+    detailed: "np.ndarray"  # int32 codes into labels
+    labels: list[str]
+
+    @property
+    def live_count(self) -> int:
+        return int(np.count_nonzero(self.live))
+
+def _encode(names, labels: list[str], codes: dict[str, int]) -> "np.ndarray":
+    """Category codes for ``names``, extending labels/codes with names not seen before"""
+    for name in set(names).difference(codes):
+        codes[name] = len(labels)
+        labels.append(name)
+    return np.fromiter(map(codes.__getitem__, names), dtype=np.int32, count=len(names))
+
+def _load_rows(db: Session, account_id: str, changed_since: Optional[datetime] = None) -> tuple[datetime, list]:
+    """Rows of the account, with the database clock they are current as of"""
+    # Same clock (and time zone) updated_at is written with; read first so it never runs ahead of the rows
+    loaded_at = db.execute(select(func.localtimestamp())).scalar()
+    stmt = select(*SNAPSHOT_COLUMNS).where(Transaction.account_id == account_id)
+    if changed_since is None:
+        stmt = stmt.where(Transaction.is_removed == False)
+    else:
+        stmt = stmt.where(Transaction.updated_at >= changed_since)
+    # Core rows straight off the connection; the ORM adds nothing for plain columns
+    return loaded_at, db.connection().execute(stmt).all()
+
+def _build_snapshot(db: Session, account_id: str, data_version: int) -> AccountSnapshot:
+    loaded_at, rows = _load_rows(db, account_id)
+    transaction_ids, day, cents, pending, primary, detailed, _ = zip(*rows) if rows else ((),) * len(SNAPSHOT_COLUMNS)
+    labels, codes = [], {}
+    return AccountSnapshot(
+        account_id=account_id,
+        data_version=data_version,
+        watermark=loaded_at,
+        transaction_ids=list(transaction_ids),
+        positions={transaction_id: index for index, transaction_id in enumerate(transaction_ids)},
+        day=np.array(day, dtype=np.int32),
+        cents=np.array(cents, dtype=np.int64),
+        pending=np.array(pending, dtype=bool),
+        live=np.ones(len(rows), dtype=bool),
+        primary=_encode(primary, labels, codes),
+        detailed=_encode(detailed, labels, codes),
+        labels=labels,
+    )
+
+def _apply_changes(snapshot: AccountSnapshot, loaded_at: datetime, rows, data_version: int) -> AccountSnapshot:
+    """New snapshot with changed rows overwritten in place and new rows appended"""
+    labels = list(snapshot.labels)
+    codes = {label: code for code, label in enumerate(labels)}
+    transaction_ids = list(snapshot.transaction_ids)
+    positions = dict(snapshot.positions)
+
+    # Keep the last version of each id, and skip removals of rows never loaded
+    changes = {}
+    for row in rows:
+        if row.transaction_id in positions or not row.is_removed:
+            changes[row.transaction_id] = row
+    for transaction_id in changes:
+        if transaction_id not in positions:
+            positions[transaction_id] = len(transaction_ids)
+            transaction_ids.append(transaction_id)
+
+    size = len(transaction_ids)
+    grown = size - len(snapshot.transaction_ids)
+    def extended(column, dtype):
+        return np.concatenate([column, np.zeros(grown, dtype=dtype)]) if grown else column.copy()
+
+    day, cents = extended(snapshot.day, np.int32), extended(snapshot.cents, np.int64)
+    pending, live = extended(snapshot.pending, bool), extended(snapshot.live, bool)
+    primary, detailed = extended(snapshot.primary, np.int32), extended(snapshot.detailed, np.int32)
+
+    if changes:
+        changed = list(changes.values())
+        index = np.fromiter((positions[row.transaction_id] for row in changed), dtype=np.int64, count=len(changed))
+        day[index] = [row.day for row in changed]
+        cents[index] = [row.cents for row in changed]
+        pending[index] = [bool(row.pending) for row in changed]
+        live[index] = [not row.is_removed for row in changed]
+        primary[index] = _encode([row.primary for row in changed], labels, codes)
+        detailed[index] = _encode([row.detailed for row in changed], labels, codes)
+
+    return AccountSnapshot(
+        account_id=snapshot.account_id,
+        data_version=data_version,
+        watermark=loaded_at,
+        transaction_ids=transaction_ids,
+        positions=positions,
+        day=day,
+        cents=cents,
+        pending=pending,
+        live=live,
+        primary=primary,
+        detailed=detailed,
+        labels=labels,
+    )
+
+def _live_row_count(db: Session, account_id: str) -> int:
+    return (
+        db.query(func.count())
+        .select_from(Transaction)
+        .filter(Transaction.account_id == account_id, Transaction.is_removed == False)
+        .scalar()
+    )
+
+def _refresh(db: Session, snapshot: AccountSnapshot, data_version: int) -> Optional[AccountSnapshot]:
+    """Incrementally refreshed snapshot, or None when it must be rebuilt"""
+    if snapshot.live_count * 2 < len(snapshot.transaction_ids):
+        # Mostly removed rows: reload rather than keep carrying them
+        return None
+
+    # updated_at is the writing transaction's start time, so a slow commit can land
+    # rows stamped slightly before the watermark; rescanning a window re-applies
+    # some rows, which is harmless
+    changed_since = snapshot.watermark - timedelta(seconds=settings.SNAPSHOT_REFRESH_OVERLAP_SECONDS)
+    loaded_at, rows = _load_rows(db, snapshot.account_id, changed_since)
+    refreshed = _apply_changes(snapshot, loaded_at, rows, data_version)
+
+    # Rows that left the account (or slipped past the window) show up as a count mismatch
+    if refreshed.live_count != _live_row_count(db, snapshot.account_id):
+        logger.info(f"Columnar snapshot of {snapshot.account_id} drifted from the ledger; rebuilding")
+        return None
+    return refreshed
+
+def get_snapshot(db: Session, account: Account) -> AccountSnapshot:
+    """The account's snapshot at (at least) its current data_version"""
+    snapshot = snapshot_cache.get(account.account_id)
+    if snapshot is not None and snapshot.data_version == account.data_version:
+        return snapshot
+
+    with _refresh_lock:
+        snapshot = snapshot_cache.get(account.account_id)
+        if snapshot is not None and snapshot.data_version == account.data_version:
+            return snapshot
+        refreshed = _refresh(db, snapshot, account.data_version) if snapshot is not None else None
+        if refreshed is None:
+            refreshed = _build_snapshot(db, account.account_id, account.data_version)
+        snapshot_cache.set(account.account_id, account.account_id, refreshed)
+        return refreshed
+
+def _selection(snapshot: AccountSnapshot, start_date: Optional[date], end_date: Optional[date], include_pending: bool = True):
+    """Row mask equivalent to filtered_transactions' filters"""
+    mask = snapshot.live.copy()
+    if not include_pending:
+        mask &= ~snapshot.pending
+    if start_date:
+        mask &= snapshot.day >= start_date.toordinal()
+    if end_date:
+        mask &= snapshot.day <= end_date.toordinal()
+    return mask
+
+def _period_index(days, group_by: str) -> tuple[list[str], "np.ndarray"]:
+    """Sorted period keys and each row's index into them.
+
+    Keys are formatted once per distinct day, not per row.
+    """
+    if group_by == "all":
+        return ["all"], np.zeros(len(days), dtype=np.int64)
+    unique_days, day_index = np.unique(days, return_inverse=True)
+    keys = []
+    for ordinal in unique_days.tolist():
+        day = date.fromordinal(ordinal)
+        if group_by == "week":
+            keys.append(PERIOD_KEYS["week"](day.year, day.isocalendar()[1]))
+        elif group_by == "month":
+            keys.append(PERIOD_KEYS["month"](day.year, day.month))
+        else:
+            keys.append(PERIOD_KEYS["year"](day.year))
+    periods, key_index = np.unique(np.array(keys, dtype=str), return_inverse=True)
+    return periods.tolist(), key_index[day_index]
+
+def _category_index(snapshot: AccountSnapshot, codes) -> tuple[list[str], "np.ndarray"]:
+    """Labels present in ``codes`` sorted by name, and each row's index into them"""
+    present = np.unique(codes)
+    names = sorted((snapshot.labels[code], code) for code in present.tolist())
+    lookup = np.zeros(len(snapshot.labels), dtype=np.int64)
+    for index, (_, code) in enumerate(names):
+        lookup[code] = index
+    return [name for name, _ in names], lookup[codes]
+
+def _sums(index, weights, size: int) -> list[int]:
+    # float64 sums of whole cents stay exact far beyond any realistic balance
+    return [int(total) for total in np.rint(np.bincount(index, weights=weights, minlength=size)).tolist()]
+
+def _dollars(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+def summarize_snapshot(
+    snapshot: AccountSnapshot,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: str = "month",
+    category_type: str = "primary",
+    include_pending: bool = True,
+) -> dict:
+    """summarize_transactions computed with bincount over the snapshot"""
+    validate_group_by(group_by)
+    mask = _selection(snapshot, start_date, end_date, include_pending)
+    cents = snapshot.cents[mask]
+    expense_cents = np.where(cents > 0, cents, 0)
+    income_cents = np.where(cents < 0, -cents, 0)
+
+    periods, period_index = _period_index(snapshot.day[mask], group_by)
+    expense = _sums(period_index, expense_cents, len(periods))
+    income = _sums(period_index, income_cents, len(periods))
+    counts = np.bincount(period_index, minlength=len(periods)).tolist()
+
+    categories, category_index = _category_index(
+        snapshot, (snapshot.primary if category_type == "primary" else snapshot.detailed)[mask]
+    )
+    category_amounts = _sums(category_index, cents, len(categories))
+    category_counts = np.bincount(category_index, minlength=len(categories)).tolist()
+
+    total_income, total_expense = _dollars(int(income_cents.sum())), _dollars(int(expense_cents.sum()))
+    return {
+        "period_summaries": [
+            period_summary(period, _dollars(income[i]), _dollars(expense[i]), counts[i])
+            for i, period in enumerate(periods)
+        ],
+        "category_summaries": [
+            {
+                "category": category,
+                "amount": float(_dollars(category_amounts[i])),
+                "transaction_count": category_counts[i],
+                "category_type": category_type,
+            }
+            for i, category in enumerate(categories)
+        ],
+        "total_income": float(total_income),
+        "total_expense": float(total_expense),
+        "net_total": float(total_income - total_expense),
+        "total_transactions": len(cents),
+    }
+
+def pivot_snapshot(
+    snapshot: AccountSnapshot,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: str = "month",
+    category_type: str = "primary",
+    include_pending: bool = True,
+) -> dict:
+    """pivot_transactions computed with one bincount over period x category cells"""
+    validate_group_by(group_by)
+    mask = _selection(snapshot, start_date, end_date, include_pending)
+    cents = snapshot.cents[mask]
+    categories, category_index = _category_index(
+        snapshot, (snapshot.primary if category_type == "primary" else snapshot.detailed)[mask]
+    )
+    periods, period_index = _period_index(snapshot.day[mask], group_by)
+    if not categories:
+        periods = []
+
+    cell_index = period_index * len(categories) + category_index
+    cells = len(periods) * len(categories)
+    amounts = _sums(cell_index, cents, cells)
+    counts = np.bincount(cell_index, minlength=cells).tolist()
+    width = len(categories)
+
+    return {
+        "group_by": group_by,
+        "category_type": category_type,
+        "periods": periods,
+        "categories": categories,
+        "amounts": [[float(_dollars(value)) for value in amounts[row * width:(row + 1) * width]] for row in range(len(periods))],
+        "counts": [counts[row * width:(row + 1) * width] for row in range(len(periods))],
+        "period_totals": [float(_dollars(value)) for value in _sums(period_index, cents, len(periods))],
+        "category_totals": [float(_dollars(value)) for value in _sums(category_index, cents, len(categories))],
+        "grand_total": float(_dollars(int(cents.sum()))),
+        "total_transactions": len(cents),
+    }
+
+def balances_at(snapshot: AccountSnapshot, dates: list[date]) -> list[float]:
+    """Account balance (negated Plaid amounts) at the end of each date, pending included.
+
+    One cumulative sum over the daily totals, then a binary search per date.
+    """
+    mask = snapshot.live
+    days, day_index = np.unique(snapshot.day[mask], return_inverse=True)
+    running = np.concatenate([[0], np.cumsum(np.bincount(day_index, weights=-snapshot.cents[mask], minlength=len(days)))])
+    ordinals = np.fromiter((day.toordinal() for day in dates), dtype=np.int64, count=len(dates))
+    return [int(cents) / 100 for cents in np.rint(running[np.searchsorted(days, ordinals, side="right")]).tolist()]
@@ -0,0 +1,196 @@
+"""Maintenance of daily_account_category_rollups.
+
+Sync keeps the table exact incrementally: before a page is written, the
+current contribution of every transaction the page mentions is subtracted
+from its bucket, and after the write the new contribution is added back.
+
+Rebuild from the ledger with:
+    python -m src.services.daily_rollups [ACCOUNT_ID ...]
+"""
+from datetime import date, timedelta
+from typing import Iterable, Optional
+import sys
+import logging
+from sqlalchemy import select, delete, bindparam, any_, func, literal, true, tuple_, Date, String
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy.orm import Query, Session
+from ..models.account import Account
+from ..models.daily_rollup import DailyAccountCategoryRollup as Rollup
+from ..models.transaction import Transaction
+from .data_events import bump_data_versions, notify_accounts_changed
+
+logger = logging.getLogger(__name__)
+
+BUCKET_COLUMNS = ("account_id", "rollup_date", "category_primary", "category_detailed", "pending")
+
+def _bucket_totals(sign: int):
+    """SELECT of per-bucket totals over live transactions, multiplied by ``sign``"""
+    amount = Transaction.amount
+    bucket = (
+        Transaction.account_id,
+        Transaction.transaction_date,
+        func.coalesce(Transaction.personal_finance_category_primary, ""),
+        func.coalesce(Transaction.personal_finance_category_detailed, ""),
+        func.coalesce(Transaction.pending, False),
+    )
+    return (
+        select(
+            *bucket,
+            literal(sign) * func.coalesce(-func.sum(amount).filter(amount < 0), 0),
+            literal(sign) * func.coalesce(func.sum(amount).filter(amount > 0), 0),
+            literal(sign) * func.count(),
+        )
+        .where(Transaction.is_removed == False, Transaction.account_id.isnot(None))
+        .group_by(*bucket)
+    )
+
+def _merge_into_rollups(db: Session, totals) -> list[tuple]:
+    stmt = insert(Rollup).from_select(
+        [*BUCKET_COLUMNS, "income", "expense", "transaction_count"],
+        totals
+    )
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(BUCKET_COLUMNS),
+        set_={
+            "income": Rollup.income + excluded.income,
+            "expense": Rollup.expense + excluded.expense,
+            "transaction_count": Rollup.transaction_count + excluded.transaction_count,
+        }
+    )
+    # Keys of the buckets this changed
+    return [tuple(row) for row in db.execute(stmt.returning(*(getattr(Rollup, name) for name in BUCKET_COLUMNS)))]
+
+def _for_ids(totals, transaction_ids: list[str]):
+    return totals.where(Transaction.transaction_id == any_(bindparam("rollup_ids", transaction_ids, type_=ARRAY(String))))
+
+def subtract_transactions(db: Session, transaction_ids: Iterable[str]) -> list[tuple]:
+    """Take the current contribution of these transactions out of their buckets (before rewriting them).
+
+    Returns the keys of the buckets that shrank; account_id comes first, so
+    this also names accounts a modified transaction is about to move away from.
+    """
+    transaction_ids = list(set(transaction_ids))
+    if not transaction_ids:
+        return []
+    return _merge_into_rollups(db, _for_ids(_bucket_totals(-1), transaction_ids))
+
+def add_transactions(db: Session, transaction_ids: Iterable[str], shrunk_buckets: list[tuple]) -> None:
+    """Add these transactions' contribution back after rewriting them.
+
+    Only buckets returned by subtract_transactions can have been emptied, so
+    just those are checked for deletion.
+    """
+    transaction_ids = list(set(transaction_ids))
+    if transaction_ids:
+        _merge_into_rollups(db, _for_ids(_bucket_totals(1), transaction_ids))
+    if shrunk_buckets:
+        db.execute(
+            delete(Rollup)
+            .where(Rollup.transaction_count == 0)
+            .where(tuple_(*(getattr(Rollup, name) for name in BUCKET_COLUMNS)).in_(shrunk_buckets))
+        )
+
+def rebuild_rollups(db: Session, account_ids: Optional[Iterable[str]] = None) -> list[str]:
+    """Recompute buckets from the ledger for the given accounts (all when None).
+
+    Bumps the accounts' data_version so cached analytics and ETags move on, and
+    returns their ids; the caller commits, then calls notify_accounts_changed().
+    """
+    cleared = delete(Rollup)
+    totals = _bucket_totals(1)
+    if account_ids is None:
+        account_ids = [account_id for (account_id,) in db.query(Account.account_id)]
+    else:
+        account_ids = list(account_ids)
+        cleared = cleared.where(Rollup.account_id.in_(account_ids))
+        totals = totals.where(Transaction.account_id.in_(account_ids))
+    db.execute(cleared)
+    _merge_into_rollups(db, totals)
+    bump_data_versions(db, account_ids)
+    return account_ids
+
+def filtered_rollups(
+    db: Session,
+    account_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_pending: bool = True,
+) -> Query:
+    """Rollup buckets of one account under the filters of filtered_transactions (removed rows are never included)"""
+    query = db.query(Rollup).filter(Rollup.account_id == account_id)
+
+    if not include_pending:
+        query = query.filter(Rollup.pending == False)
+
+    if start_date:
+        query = query.filter(Rollup.rollup_date >= start_date)
+
+    if end_date:
+        query = query.filter(Rollup.rollup_date <= end_date)
+
+    return query
+
+def daily_amounts(db: Session, account_id: str, end_date: Optional[date] = None, after: Optional[date] = None) -> list:
+    """Net Plaid amount per day (expenses positive) after ``after`` up to ``end_date``, oldest first.
+
+    Rows expose ``transaction_date`` and ``amount`` like Transaction does, so
+    balance code can consume them in place of individual transactions.
+    """
+    start_date = after + timedelta(days=1) if after else None
+    return (
+        filtered_rollups(db, account_id, start_date, end_date)
+        .with_entities(
+            Rollup.rollup_date.label("transaction_date"),
+            func.sum(Rollup.expense - Rollup.income).label("amount"),
+        )
+        .group_by(Rollup.rollup_date)
+        .order_by(Rollup.rollup_date.asc())
+        .all()
+    )
+
+def daily_amounts_by_account(db: Session, after: dict[str, Optional[date]], end_date: Optional[date] = None) -> dict[str, list]:
+    """daily_amounts() of several accounts in one statement: account_id -> rows after its own ``after`` date"""
+    if not after:
+        return {}
+    # date.min stands in for "no lower bound" so every account joins the same way
+    bounds = func.unnest(
+        bindparam("bound_accounts", list(after), type_=ARRAY(String)),
+        bindparam("bound_dates", [day or date.min for day in after.values()], type_=ARRAY(Date)),
+    ).table_valued("account_id", "after").render_derived(name="bounds")
+    # LATERAL, so each account is its own primary key range scan grouped in date
+    # order, as daily_amounts() does, rather than a join over all their rollups
+    daily = (
+        select(
+            Rollup.rollup_date.label("transaction_date"),
+            func.sum(Rollup.expense - Rollup.income).label("amount"),
+        )
+        .where(Rollup.account_id == bounds.c.account_id, Rollup.rollup_date > bounds.c.after)
+        .group_by(Rollup.rollup_date)
+    )
+    if end_date:
+        daily = daily.where(Rollup.rollup_date <= end_date)
+    daily = daily.lateral("daily")
+
+    amounts = {account_id: [] for account_id in after}
+    rows = db.execute(
+        select(bounds.c.account_id, daily.c.transaction_date, daily.c.amount)
+        .select_from(bounds.join(daily, true()))
+        .order_by(bounds.c.account_id, daily.c.transaction_date)
+    )
+    for row in rows:
+        amounts[row.account_id].append(row)
+    return amounts
+
+if __name__ == "__main__":
+    from ..database.db import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        rebuilt = rebuild_rollups(db, sys.argv[1:] or None)
+        db.commit()
+        notify_accounts_changed(rebuilt)
+        logger.info(f"Rebuilt daily rollups for {', '.join(sys.argv[1:]) or 'all accounts'}")
+    finally:
+        db.close()
@@ -0,0 +1,46 @@
+from typing import Callable, Iterable
+from sqlalchemy import update, bindparam, any_, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from ..models.account import Account
+import logging
+
+logger = logging.getLogger(__name__)
+
+_listeners: list[Callable[[set[str]], None]] = []
+
+def on_accounts_changed(listener: Callable[[set[str]], None]) -> Callable[[set[str]], None]:
+    """Register a callback run after committed writes touch these account ids.
+
+    Usable as a decorator. Caches derived from transactions register here so a
+    sync commit invalidates them.
+    """
+    _listeners.append(listener)
+    return listener
+
+def notify_accounts_changed(account_ids: Iterable[str]) -> None:
+    account_ids = set(account_ids)
+    if not account_ids:
+        return
+    for listener in _listeners:
+        try:
+            listener(account_ids)
+        except Exception:
+            logger.exception(f"Account change listener {listener.__name__} failed")
+
+def bump_data_versions(db: Session, account_ids: Iterable[str]) -> None:
+    """Advance accounts.data_version inside the caller's transaction.
+
+    Call before committing a write to these accounts' transactions; ETags are
+    derived from the version, so readers see the change once it commits.
+    """
+    account_ids = list(set(account_ids))
+    if not account_ids:
+        return
+    stmt = (
+        update(Account)
+        .where(Account.account_id == any_(bindparam("account_ids", account_ids, type_=ARRAY(String))))
+        .values(data_version=Account.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(stmt)
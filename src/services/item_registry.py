@@ -0,0 +1,34 @@
+from typing import Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from ..database.db import SessionLocal
+from ..models.plaid_item import PlaidItem
+
+def register_item(db: Session, item_id: str, access_token: str, institution_id: Optional[str] = None) -> None:
+    """Store (or rotate) the access token for an item; the caller commits"""
+    stmt = insert(PlaidItem).values(item_id=item_id, access_token=access_token, institution_id=institution_id)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PlaidItem.item_id],
+        set_={
+            "access_token": stmt.excluded.access_token,
+            "institution_id": func.coalesce(stmt.excluded.institution_id, PlaidItem.institution_id),
+            "updated_at": func.current_timestamp(),
+        }
+    )
+    db.execute(stmt)
+
+def list_items(db: Session) -> list[PlaidItem]:
+    return db.query(PlaidItem).order_by(PlaidItem.created_at.asc()).all()
+
+def get_item(db: Session, item_id: str) -> Optional[PlaidItem]:
+    return db.query(PlaidItem).filter(PlaidItem.item_id == item_id).first()
+
+def get_access_token(item_id: str) -> Optional[str]:
+    """Look up an item's access token from a background thread (own session)"""
+    db = SessionLocal()
+    try:
+        item = get_item(db, item_id)
+        return item.access_token if item else None
+    finally:
+        db.close()
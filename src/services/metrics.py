@@ -0,0 +1,47 @@
+from bisect import bisect_left
+import threading
+
+# Upper bounds in seconds; anything slower lands in the overflow bucket
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class LatencyHistogram:
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.counts[bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"le_{bound}" for bound in self.buckets] + ["le_inf"]
+            return {
+                "count": self.count,
+                "sum_seconds": round(self.total, 6),
+                "avg_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+                "max_seconds": round(self.max, 6),
+                "buckets": dict(zip(labels, self.counts)),
+            }
+
+_histograms: dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+def observe_latency(name: str, seconds: float) -> None:
+    with _histograms_lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = LatencyHistogram()
+    histogram.observe(seconds)
+
+def latency_snapshot() -> dict:
+    with _histograms_lock:
+        histograms = dict(_histograms)
+    return {name: histogram.snapshot() for name, histogram in sorted(histograms.items())}
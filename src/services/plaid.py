@@ -1,10 +1,17 @@
 from plaid.model.item_get_request import ItemGetRequest
 from fastapi import HTTPException
-from ..api.plaid.client import get_plaid_client
+from .plaid_gateway import call_plaid
+from ..config.settings import settings
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+# access_token -> monotonic expiry of the last healthy /item/get result
+_healthy_items: dict[str, float] = {}
+_healthy_items_lock = threading.Lock()
+
 class PlaidError(HTTPException):
     def __init__(self, status_code: int, error_code: str, message: str):
         detail = {
@@ -13,13 +20,21 @@ class PlaidError(HTTPException):
         }
         super().__init__(status_code=status_code, detail=detail)
 
+def invalidate_item_status(access_token: str) -> None:
+    with _healthy_items_lock:
+        _healthy_items.pop(access_token, None)
+
 def check_item_status(access_token: str) -> bool:
+    """Verify the item is usable, reusing a healthy result for ITEM_STATUS_TTL_SECONDS"""
+    with _healthy_items_lock:
+        expires_at = _healthy_items.get(access_token)
+    if expires_at is not None and time.monotonic() < expires_at:
+        return True
 
-    client = get_plaid_client()
     request = ItemGetRequest(access_token=access_token)
 
     try:
-        response = client.item_get(request)
+        response = call_plaid("item_get", request)
         item_error = response["item"].get("error")
         if item_error and item_error.get("error_code") == "ITEM_LOGIN_REQUIRED":
             logger.warning(f"Item requires login: {access_token[:10]}...")
@@ -29,10 +44,14 @@ def check_item_status(access_token: str) -> bool:
                 message="Need to re-authenticate."
             )
         logger.info(f"Item status valid: {access_token[:10]}...")
+        if not item_error and settings.ITEM_STATUS_TTL_SECONDS > 0:
+            with _healthy_items_lock:
+                _healthy_items[access_token] = time.monotonic() + settings.ITEM_STATUS_TTL_SECONDS
         return True
     except PlaidError:
         raise
     except Exception as e:
+        invalidate_item_status(access_token)
         logger.error(f"Failed to check item status: {str(e)}")
         raise PlaidError(
             status_code=500,
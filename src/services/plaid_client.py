@@ -0,0 +1,64 @@
+from plaid.api import plaid_api
+from plaid import Configuration, ApiClient, Environment
+from urllib3.connection import HTTPConnection
+from typing import Optional
+from ..config.settings import settings
+import socket
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[plaid_api.PlaidApi] = None
+_client_lock = threading.Lock()
+
+def _build_plaid_client() -> plaid_api.PlaidApi:
+    config = Configuration(
+        host=(
+        Environment.Sandbox if settings.PLAID_ENV == "sandbox" else
+        Environment.Development if settings.PLAID_ENV == "development" else
+        Environment.Production if settings.PLAID_ENV == "production" else
+        Environment.Sandbox
+    ),
+        api_key={
+            "clientId": settings.PLAID_CLIENT_ID,
+            "secret": settings.PLAID_SECRET,
+        }
+    )
+    # One urllib3 pool shared by every request thread; keep-alive sockets avoid a TLS handshake per call
+    config.connection_pool_maxsize = settings.PLAID_POOL_MAXSIZE
+    if settings.PLAID_TCP_KEEPALIVE:
+        config.socket_options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+    api_client = ApiClient(configuration=config)
+    return plaid_api.PlaidApi(api_client)
+
+def get_plaid_client() -> plaid_api.PlaidApi:
+    """Return the process-wide Plaid client, building it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_plaid_client()
+    return _client
+
+def set_plaid_client(client) -> None:
+    """Swap the process-wide client, e.g. for a recording or replaying stand-in"""
+    global _client
+    with _client_lock:
+        _client = client
+
+def get_plaid_request_timeout() -> tuple[float, float]:
+    """(connect, read) timeout passed to every Plaid call as ``_request_timeout``"""
+    return (settings.PLAID_CONNECT_TIMEOUT, settings.PLAID_READ_TIMEOUT)
+
+def close_plaid_client() -> None:
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    # Stand-ins installed with set_plaid_client have no connection pool to close
+    if client is None or not hasattr(client, "api_client"):
+        return
+    client.api_client.close()
+    client.api_client.rest_client.pool_manager.clear()
+    logger.info("Closed Plaid client connection pool")
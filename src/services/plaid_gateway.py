@@ -0,0 +1,142 @@
+from typing import Optional
+from .plaid_client import get_plaid_client, get_plaid_request_timeout
+from ..config.settings import settings
+from .metrics import observe_latency
+import json
+import random
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Requests per minute and burst size for each Plaid endpoint, matching
+# Plaid's documented per-item limits: every item gets its own bucket.
+ENDPOINT_BUDGETS = {
+    "transactions_sync": (50, 10),
+    "item_get": (15, 5),
+    "accounts_get": (15, 5),
+}
+DEFAULT_BUDGET = (100, 10)
+
+# After throttling, the rate never drops below this fraction of the budget
+MIN_RATE_FRACTION = 0.1
+
+RETRYABLE_ERROR_TYPES = {"RATE_LIMIT_EXCEEDED", "API_ERROR"}
+RETRYABLE_ERROR_CODES = {"TRANSACTIONS_SYNC_LIMIT", "RATE_LIMIT", "INTERNAL_SERVER_ERROR", "PLANNED_MAINTENANCE"}
+
+def get_plaid_error(e: Exception) -> dict:
+    """Decode the JSON error body carried by a Plaid SDK ApiException"""
+    body = getattr(e, "body", None)
+    if not body:
+        return {}
+    try:
+        error = json.loads(body)
+    except (ValueError, TypeError):
+        return {}
+    return error if isinstance(error, dict) else {}
+
+def get_plaid_error_code(e: Exception) -> Optional[str]:
+    """Extract Plaid's error_code from an SDK ApiException (or anything carrying one)"""
+    return getattr(e, "error_code", None) or get_plaid_error(e).get("error_code")
+
+def is_retryable(e: Exception) -> bool:
+    error = get_plaid_error(e)
+    if error.get("error_type") in RETRYABLE_ERROR_TYPES or get_plaid_error_code(e) in RETRYABLE_ERROR_CODES:
+        return True
+
+    status = getattr(e, "status", None)
+    if status is not None:
+        return status == 429 or status >= 500
+
+    # No HTTP status at all means the request never completed (timeouts, resets)
+    return isinstance(e, (OSError, TimeoutError)) or type(e).__module__.startswith("urllib3")
+
+class TokenBucket:
+    """Thread-safe token bucket that halves its rate when Plaid throttles us
+    and climbs back to the configured budget as calls succeed."""
+
+    def __init__(self, per_minute: float, burst: int):
+        self.max_rate = per_minute / 60.0
+        self.rate = self.max_rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def on_throttled(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate / 2)
+            self.tokens = 0.0
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+# (endpoint, access_token) -> bucket; calls made for no item share the None bucket
+_buckets: dict[tuple[str, Optional[str]], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+def _get_bucket(endpoint: str, access_token: Optional[str] = None) -> TokenBucket:
+    key = (endpoint, access_token)
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(*ENDPOINT_BUDGETS.get(endpoint, DEFAULT_BUDGET))
+            _buckets[key] = bucket
+        return bucket
+
+def _backoff_delay(attempt: int) -> float:
+    # Full jitter: uniform in [0, min(cap, base * 2^attempt)]
+    ceiling = min(settings.PLAID_BACKOFF_MAX_SECONDS, settings.PLAID_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+def call_plaid(endpoint: str, request):
+    """Call a PlaidApi method through the shared rate limiter and retry engine.
+
+    ``endpoint`` is the PlaidApi method name, e.g. ``"transactions_sync"``.
+    Rate-limit and transient errors are retried with exponential backoff;
+    anything else (and the last failed attempt) is raised to the caller.
+    Budgets apply per item, identified by the request's access_token.
+    """
+    bucket = _get_bucket(endpoint, getattr(request, "access_token", None))
+    method = getattr(get_plaid_client(), endpoint)
+
+    attempt = 0
+    while True:
+        if settings.PLAID_RATE_LIMIT_ENABLED:
+            bucket.acquire()
+        started = time.perf_counter()
+        try:
+            response = method(request, _request_timeout=get_plaid_request_timeout())
+        except Exception as e:
+            observe_latency(f"plaid.{endpoint}", time.perf_counter() - started)
+            if not is_retryable(e) or attempt >= settings.PLAID_MAX_RETRIES:
+                raise
+            if get_plaid_error(e).get("error_type") == "RATE_LIMIT_EXCEEDED" or getattr(e, "status", None) == 429:
+                bucket.on_throttled()
+            delay = _backoff_delay(attempt)
+            attempt += 1
+            logger.warning(f"Plaid {endpoint} failed ({get_plaid_error_code(e) or type(e).__name__}), retry {attempt}/{settings.PLAID_MAX_RETRIES} in {delay:.2f}s")
+            time.sleep(delay)
+            continue
+
+        observe_latency(f"plaid.{endpoint}", time.perf_counter() - started)
+        bucket.on_success()
+        return response
@@ -0,0 +1,78 @@
+"""Verification of the Plaid-Verification header Plaid signs every webhook with.
+
+The header is an ES256 JWT whose ``kid`` names a public key served by
+/webhook_verification_key/get. Its ``iat`` must be recent and its
+``request_body_sha256`` claim must match the raw request body.
+"""
+from typing import Optional
+from fastapi import HTTPException
+from jose import jwt, JWTError
+from plaid.model.webhook_verification_key_get_request import WebhookVerificationKeyGetRequest
+from .plaid_gateway import call_plaid
+import hashlib
+import hmac
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Plaid's guidance: reject webhooks signed more than five minutes ago
+MAX_WEBHOOK_AGE_SECONDS = 5 * 60
+# Keys are refetched after this long, so one Plaid has since expired stops verifying
+KEY_CACHE_SECONDS = 24 * 60 * 60
+JWK_FIELDS = ("alg", "kty", "crv", "x", "y")
+
+# kid -> (monotonic expiry, JWK dict)
+_keys: dict[str, tuple[float, dict]] = {}
+_keys_lock = threading.Lock()
+
+def _reject(reason: str) -> HTTPException:
+    logger.warning(f"Rejected Plaid webhook: {reason}")
+    return HTTPException(status_code=401, detail="Invalid webhook signature")
+
+def _verification_key(kid: str) -> dict:
+    with _keys_lock:
+        cached = _keys.get(kid)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    key = call_plaid("webhook_verification_key_get", WebhookVerificationKeyGetRequest(key_id=kid))["key"]
+    if key.get("expired_at") is not None:
+        raise _reject(f"key {kid} has expired")
+    key = {name: key[name] for name in JWK_FIELDS}
+    with _keys_lock:
+        _keys[kid] = (time.monotonic() + KEY_CACHE_SECONDS, key)
+    return key
+
+def verify_webhook(body: bytes, signed_jwt: Optional[str]) -> None:
+    """Raise 401 unless ``signed_jwt`` is Plaid's fresh signature over ``body``"""
+    if not signed_jwt:
+        raise _reject("no Plaid-Verification header")
+    try:
+        header = jwt.get_unverified_header(signed_jwt)
+    except JWTError:
+        raise _reject("malformed Plaid-Verification header")
+    if header.get("alg") != "ES256" or not header.get("kid"):
+        raise _reject(f"unexpected alg {header.get('alg')}")
+
+    try:
+        key = _verification_key(header["kid"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        # Plaid answers an unknown kid with an error, as it would for a forged one
+        raise _reject(f"no verification key for kid {header['kid']} ({type(e).__name__})")
+
+    try:
+        claims = jwt.decode(signed_jwt, key, algorithms=["ES256"])
+    except JWTError as e:
+        raise _reject(f"bad signature ({e})")
+
+    issued_at = claims.get("iat")
+    if not isinstance(issued_at, (int, float)) or time.time() - issued_at > MAX_WEBHOOK_AGE_SECONDS:
+        raise _reject("signature is too old")
+
+    body_hash = hashlib.sha256(body).hexdigest()
+    if not hmac.compare_digest(str(claims.get("request_body_sha256", "")), body_hash):
+        raise _reject("body does not match its signature")
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+import threading
+
+_MISSING = object()
+
+class AccountScopedCache:
+    """Size-bounded LRU cache whose entries belong to one account each,
+    so everything derived from an account can be dropped at once.
+
+    Named caches are listed by cache_snapshot() (and so on /metrics).
+    """
+
+    def __init__(self, max_entries: int, name: Optional[str] = None):
+        self.max_entries = max_entries
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Hashable, tuple[str, Any]]" = OrderedDict()
+        self._keys_by_account: dict[str, set] = {}
+        self._lock = threading.Lock()
+        if name is not None:
+            with _caches_lock:
+                _caches[name] = self
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, account_id: str, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (account_id, value)
+            self._entries.move_to_end(key)
+            self._keys_by_account.setdefault(account_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_compute(self, account_id: str, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached value for ``key``, computing and storing it on a miss.
+
+        Concurrent misses may both compute; the last one stored wins.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(account_id, key, value)
+        return value
+
+    def _discard(self, key: Hashable) -> None:
+        account_id, _ = self._entries.pop(key)
+        keys = self._keys_by_account.get(account_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_account[account_id]
+
+    def invalidate_accounts(self, account_ids: Iterable[str]) -> None:
+        with self._lock:
+            for account_id in account_ids:
+                for key in self._keys_by_account.pop(account_id, ()):
+                    if self._entries.pop(key, None) is not None:
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_account.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+_caches: dict[str, AccountScopedCache] = {}
+_caches_lock = threading.Lock()
+
+def cache_snapshot() -> dict:
+    with _caches_lock:
+        caches = dict(_caches)
+    return {name: cache.stats() for name, cache in sorted(caches.items())}
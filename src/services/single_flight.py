@@ -0,0 +1,44 @@
+from concurrent.futures import Future
+from typing import Callable, TypeVar
+import threading
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """Deduplicate concurrent calls per key within this process.
+
+    The first caller for a key runs ``fn``; callers arriving while it is still
+    running block and receive the same result (or exception) instead of
+    starting a second run.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
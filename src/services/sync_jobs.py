@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from fastapi import HTTPException
+from ..config.settings import settings
+from ..database.db import SessionLocal
+from .transaction_ingest import IngestStats
+from .item_registry import get_access_token
+from .transaction_sync import sync_item_once, sync_all_items
+import threading
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_FINISHED_JOBS = 100
+
+@dataclass
+class SyncJob:
+    job_id: str
+    item_id: Optional[str] = None  # None syncs every registered item
+    status: str = "queued"  # "queued", "running", "succeeded", "failed"
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    item_stats: dict[str, IngestStats] = field(default_factory=dict)
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    on_done: Optional[Callable[["SyncJob"], None]] = field(default=None, repr=False)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def pages(self) -> int:
+        return sum(stats.pages for stats in list(self.item_stats.values()))
+
+    @property
+    def rows(self) -> int:
+        return sum(stats.rows for stats in list(self.item_stats.values()))
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "item_id": self.item_id,
+            "pages": self.pages,
+            "rows": self.rows,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "result": self.result,
+            "error": self.error
+        }
+
+_executor: Optional[ThreadPoolExecutor] = None
+_jobs: "OrderedDict[str, SyncJob]" = OrderedDict()
+_lock = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.SYNC_WORKER_COUNT, thread_name_prefix="sync-worker")
+        return _executor
+
+def _prune_finished_jobs() -> None:
+    finished = [job_id for job_id, job in _jobs.items() if job.status in ("succeeded", "failed")]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _jobs[job_id]
+
+def _run_job(job: SyncJob) -> None:
+    job.status = "running"
+    job.started_at = time.monotonic()
+    db = SessionLocal()
+    try:
+        if job.item_id is None:
+            job.result = sync_all_items(job.item_stats)
+        else:
+            access_token = get_access_token(job.item_id)
+            if not access_token:
+                raise HTTPException(status_code=404, detail=f"Item {job.item_id} not found")
+            stats = job.item_stats.setdefault(job.item_id, IngestStats())
+            job.result = sync_item_once(db, job.item_id, access_token, stats=stats)
+        job.status = "failed" if job.result["sync_status"] == "failed" else "succeeded"
+    except HTTPException as e:
+        job.error = str(e.detail)
+        job.status = "failed"
+    except Exception as e:
+        logger.exception(f"Sync job {job.job_id} crashed")
+        job.error = str(e)
+        job.status = "failed"
+    finally:
+        job.finished_at = time.monotonic()
+        db.close()
+        logger.info(f"Sync job {job.job_id} {job.status} in {job.elapsed:.2f}s ({job.rows} rows, {job.pages} pages)")
+        if job.on_done is not None:
+            job.on_done(job)
+
+def submit_sync_job(item_id: Optional[str] = None, on_done: Optional[Callable[[SyncJob], None]] = None) -> SyncJob:
+    """Queue a sync of one item (or all items) on the worker pool and return immediately.
+
+    ``on_done`` is called from the worker thread once the job has finished.
+    """
+    job = SyncJob(job_id=uuid.uuid4().hex, item_id=item_id, on_done=on_done)
+    with _lock:
+        _prune_finished_jobs()
+        _jobs[job.job_id] = job
+    _get_executor().submit(_run_job, job)
+    return job
+
+def get_sync_job(job_id: str) -> Optional[SyncJob]:
+    with _lock:
+        return _jobs.get(job_id)
+
+def shutdown_sync_workers(wait: bool = True) -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,42 @@
+from typing import Hashable, Optional
+from sqlalchemy.orm import Query, Session
+from ..config.settings import settings
+from .data_events import on_accounts_changed
+from .result_cache import AccountScopedCache
+
+COUNT_STRATEGIES = ("exact", "estimated", "none")
+
+# Keys include the account's data_version, so a write from any process moves
+# readers to new entries; the listener only frees the superseded ones
+_exact_counts = AccountScopedCache(settings.COUNT_CACHE_MAX_ENTRIES, name="transaction_counts")
+
+@on_accounts_changed
+def _invalidate_counts(account_ids: set[str]) -> None:
+    _exact_counts.invalidate_accounts(account_ids)
+
+def estimate_row_count(db: Session, query: Query) -> int:
+    """Planner row estimate for ``query`` from EXPLAIN, without scanning the rows"""
+    compiled = query.statement.compile(dialect=db.bind.dialect)
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+def count_transactions(db: Session, query: Query, strategy: str, account_id: str, data_version: int,
+                       filter_key: Hashable) -> tuple[Optional[int], bool]:
+    """Return (total, is_estimate) for a filtered transaction query.
+
+    "exact" counts are cached per account, data_version and filter signature;
+    "estimated" asks the planner; "none" skips counting.
+    """
+    if strategy == "none":
+        return None, False
+    if strategy == "estimated":
+        return estimate_row_count(db, query), True
+
+    key = (account_id, data_version, filter_key)
+    total = _exact_counts.get(key)
+    if total is not None:
+        return total, False
+
+    total = query.count()
+    _exact_counts.set(account_id, key, total)
+    return total, False
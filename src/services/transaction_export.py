@@ -0,0 +1,161 @@
+from datetime import date
+from typing import Iterator, Optional
+import csv
+import io
+import logging
+from ..config.settings import settings
+from ..database.db import SessionLocal
+from ..models.transaction import Transaction
+from ..utils.fast_json import dumps
+from .transaction_queries import filtered_transactions
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = (
+    Transaction.transaction_id,
+    Transaction.account_id,
+    Transaction.amount,
+    Transaction.transaction_date,
+    Transaction.merchant_name,
+    Transaction.name,
+    Transaction.pending,
+    Transaction.pending_transaction_id,
+    Transaction.personal_finance_category_primary,
+    Transaction.personal_finance_category_detailed,
+    Transaction.custom_category_id,
+    Transaction.created_at,
+    Transaction.updated_at,
+    Transaction.is_removed,
+)
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+def parquet_available() -> bool:
+    return pq is not None
+
+def _iter_batches(account_id: str, start_date: Optional[date], end_date: Optional[date],
+                  include_removed: bool, include_pending: bool) -> Iterator[list]:
+    """Yield lists of Core rows fetched through a server-side cursor.
+
+    The generator owns its session: it runs after the endpoint has returned,
+    while the response is being streamed.
+    """
+    db = SessionLocal()
+    try:
+        query = (
+            filtered_transactions(db, account_id, start_date, end_date, include_removed, include_pending)
+            .with_entities(*EXPORT_COLUMNS)
+            .order_by(Transaction.transaction_date.asc(), Transaction.transaction_id.asc())
+            .yield_per(settings.EXPORT_BATCH_SIZE)
+        )
+        batch = []
+        for row in query:
+            batch.append(row)
+            if len(batch) >= settings.EXPORT_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        db.close()
+
+def _ndjson(batches: Iterator[list]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b"".join(dumps(dict(zip(EXPORT_FIELDS, row))) + b"\n" for row in batch)
+
+def _csv(batches: Iterator[list]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back in chunks.
+
+    ParquetWriter records offsets via tell(), so the position keeps counting
+    even though drained bytes are released.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+def _parquet_schema():
+    return pa.schema([
+        ("transaction_id", pa.string()),
+        ("account_id", pa.string()),
+        ("amount", pa.decimal128(15, 2)),
+        ("transaction_date", pa.date32()),
+        ("merchant_name", pa.string()),
+        ("name", pa.string()),
+        ("pending", pa.bool_()),
+        ("pending_transaction_id", pa.string()),
+        ("personal_finance_category_primary", pa.string()),
+        ("personal_finance_category_detailed", pa.string()),
+        ("custom_category_id", pa.int32()),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")),
+        ("is_removed", pa.bool_()),
+    ])
+
+def _parquet(batches: Iterator[list]) -> Iterator[bytes]:
+    schema = _parquet_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+    try:
+        # One row group per batch keeps only a batch worth of rows in memory
+        for batch in batches:
+            columns = list(zip(*batch))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+_ENCODERS = {"ndjson": _ndjson, "csv": _csv, "parquet": _parquet}
+
+def export_transactions(fmt: str, account_id: str, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                        include_removed: bool = False, include_pending: bool = True) -> Iterator[bytes]:
+    """Stream one account's transactions in ``fmt`` with memory bounded by EXPORT_BATCH_SIZE"""
+    batches = _iter_batches(account_id, start_date, end_date, include_removed, include_pending)
+    return _ENCODERS[fmt](batches)
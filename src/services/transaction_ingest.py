@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+import time
+import logging
+from fastapi import HTTPException
+from sqlalchemy import update, values, column, bindparam, any_, String, Numeric, Boolean
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import func
+from ..models.account import Account
+from ..models.transaction import Transaction
+from .daily_rollups import subtract_transactions, add_transactions
+from .balance_checkpoints import net_by_month, repair_checkpoints, extend_checkpoints
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class IngestStats:
+    added: int = 0
+    modified: int = 0
+    removed: int = 0
+    pages: int = 0
+    elapsed: float = 0.0
+    plaid_elapsed: float = 0.0
+    latest_date: Optional[date] = None
+
+    def copy_from(self, other: "IngestStats") -> None:
+        """Take over another run's figures, e.g. of the sync this caller joined"""
+        for name in self.__dataclass_fields__:
+            setattr(self, name, getattr(other, name))
+
+    def reset_counts(self) -> None:
+        """Forget the rows counted so far, when pagination restarts and delivers them again"""
+        self.added = self.modified = self.removed = self.pages = 0
+        self.latest_date = None
+
+    @property
+    def rows(self) -> int:
+        return self.added + self.modified + self.removed
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+def load_known_account_ids(db: Session) -> set[str]:
+    """Load every account id once so added rows can be validated without a query per row"""
+    return {account_id for (account_id,) in db.query(Account.account_id).all()}
+
+def _category(tx, key: str) -> Optional[str]:
+    category = tx.get("personal_finance_category")
+    return category[key] if category else None
+
+def _upsert_added(db: Session, added: list, known_account_ids: set[str]) -> Optional[date]:
+    # ON CONFLICT cannot touch the same row twice in one statement, so keep the last version per id
+    rows = {}
+    latest_date = None
+    for tx in added:
+        if tx["account_id"] not in known_account_ids:
+            raise HTTPException(status_code=400, detail=f"Account {tx['account_id']} not found")
+
+        rows[tx["transaction_id"]] = {
+            "transaction_id": tx["transaction_id"],
+            "account_id": tx["account_id"],
+            "amount": tx["amount"],
+            "transaction_date": tx["date"],
+            "merchant_name": tx.get("merchant_name"),
+            "name": tx.get("name"),
+            "pending": tx["pending"],
+            "personal_finance_category_primary": _category(tx, "primary"),
+            "personal_finance_category_detailed": _category(tx, "detailed"),
+            "is_removed": False,
+        }
+        if latest_date is None or tx["date"] > latest_date:
+            latest_date = tx["date"]
+
+    if not rows:
+        return None
+
+    # Passing rows as parameters (not .values(rows)) keeps the statement cacheable;
+    # SQLAlchemy still batches them into multi-row VALUES
+    stmt = insert(Transaction)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Transaction.transaction_id],
+        set_={
+            "account_id": excluded.account_id,
+            "amount": excluded.amount,
+            "transaction_date": excluded.transaction_date,
+            "merchant_name": excluded.merchant_name,
+            "name": excluded.name,
+            "pending": excluded.pending,
+            "personal_finance_category_primary": excluded.personal_finance_category_primary,
+            "personal_finance_category_detailed": excluded.personal_finance_category_detailed,
+            "is_removed": False,
+            "updated_at": func.current_timestamp(),
+        }
+    )
+    db.execute(stmt, list(rows.values()))
+    return latest_date
+
+def _update_modified(db: Session, modified: list) -> set[str]:
+    """Apply modified rows; returns the account ids they belonged to before the update"""
+    rows = {tx["transaction_id"]: (tx["transaction_id"], tx["account_id"], tx["amount"], tx["pending"]) for tx in modified}
+    if not rows:
+        return set()
+
+    changes = values(
+        column("transaction_id", String),
+        column("account_id", String),
+        column("amount", Numeric(15, 2)),
+        column("pending", Boolean),
+        name="changes"
+    ).data(list(rows.values()))
+
+    # RETURNING sees the new row; joining the table again under another name
+    # reads the pre-update snapshot, i.e. the account a transaction moves away from
+    previous = aliased(Transaction, name="previous")
+    stmt = (
+        update(Transaction)
+        .where(Transaction.transaction_id == changes.c.transaction_id)
+        .where(previous.transaction_id == changes.c.transaction_id)
+        .values(
+            account_id=changes.c.account_id,
+            amount=changes.c.amount,
+            pending=changes.c.pending,
+            updated_at=func.current_timestamp()
+        )
+        .returning(previous.account_id)
+        .execution_options(synchronize_session=False)
+    )
+    return {account_id for account_id in db.execute(stmt).scalars() if account_id is not None}
+
+def _mark_removed(db: Session, removed: list) -> set[str]:
+    ids = list({tx["transaction_id"] for tx in removed})
+    if not ids:
+        return set()
+
+    stmt = (
+        update(Transaction)
+        .where(Transaction.transaction_id == any_(bindparam("removed_ids", ids, type_=ARRAY(String))))
+        .values(is_removed=True, updated_at=func.current_timestamp())
+        .returning(Transaction.account_id)
+        .execution_options(synchronize_session=False)
+    )
+    return set(db.execute(stmt).scalars())
+
+def apply_sync_page(db: Session, response, known_account_ids: set[str], stats: IngestStats) -> set[str]:
+    """Write one /transactions/sync page with a handful of set-based statements.
+
+    Returns the account ids the page touched; nothing is committed here.
+    """
+    started = time.perf_counter()
+
+    # Every transaction the page mentions leaves its daily rollup bucket before the
+    # write and rejoins (possibly another bucket) after it
+    page_ids = [tx["transaction_id"] for key in ("added", "modified", "removed") for tx in response[key]]
+    previous_net = net_by_month(db, page_ids)
+    shrunk_buckets = subtract_transactions(db, page_ids)
+
+    latest_date = _upsert_added(db, response["added"], known_account_ids)
+    previous_account_ids = _update_modified(db, response["modified"])
+    touched_account_ids = _mark_removed(db, response["removed"])
+    touched_account_ids.update(previous_account_ids)
+    touched_account_ids.update(tx["account_id"] for tx in response["added"])
+    touched_account_ids.update(tx["account_id"] for tx in response["modified"])
+    touched_account_ids.update(bucket[0] for bucket in shrunk_buckets)
+
+    add_transactions(db, page_ids, shrunk_buckets)
+    # Month-end balances: shift those the page changed retroactively, then add any newly completed month
+    repair_checkpoints(db, page_ids, previous_net)
+    extend_checkpoints(db, touched_account_ids)
+
+    stats.pages += 1
+    stats.added += len(response["added"])
+    stats.modified += len(response["modified"])
+    stats.removed += len(response["removed"])
+    stats.elapsed += time.perf_counter() - started
+    if latest_date is not None and (stats.latest_date is None or latest_date > stats.latest_date):
+        stats.latest_date = latest_date
+
+    logger.info(
+        f"Ingested page {stats.pages}: +{len(response['added'])} ~{len(response['modified'])} "
+        f"-{len(response['removed'])} ({stats.rows_per_second:.0f} rows/sec overall)"
+    )
+    return touched_account_ids
@@ -0,0 +1,33 @@
+from datetime import date
+from typing import Optional
+from sqlalchemy.orm import Query, Session
+from ..models.transaction import Transaction
+
+def filtered_transactions(
+    db: Session,
+    account_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_removed: bool = False,
+    include_pending: bool = True,
+) -> Query:
+    """Transactions of one account under the filters shared by the list, summary and export endpoints.
+
+    The shape (account_id, NOT is_removed, transaction_date range) matches the
+    partial index idx_transactions_account_date_live.
+    """
+    query = db.query(Transaction).filter(Transaction.account_id == account_id)
+
+    if not include_removed:
+        query = query.filter(Transaction.is_removed == False)
+
+    if not include_pending:
+        query = query.filter(Transaction.pending == False)
+
+    if start_date:
+        query = query.filter(Transaction.transaction_date >= start_date)
+
+    if end_date:
+        query = query.filter(Transaction.transaction_date <= end_date)
+
+    return query
@@ -0,0 +1,227 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import Integer, cast, func, literal_column, tuple_
+from sqlalchemy.orm import Session
+from ..models.transaction import Transaction
+from ..models.daily_rollup import DailyAccountCategoryRollup as Rollup
+from .daily_rollups import filtered_rollups
+from .transaction_queries import filtered_transactions
+
+# Periods are grouped on integer date parts (cheaper than formatting every row
+# with to_char) and the keys are formatted afterwards, exactly as the Python
+# implementation did. The week key pairs the calendar year with the ISO week
+# number, so 2024-12-30 falls in "2024-W01".
+PERIOD_PARTS = {
+    "week": ("year", "week"),
+    "month": ("year", "month"),
+    "year": ("year",),
+}
+PERIOD_KEYS = {
+    "week": lambda year, week: f"{year}-W{week:02d}",
+    "month": lambda year, month: f"{year}-{month:02d}",
+    "year": lambda year: str(year),
+}
+GROUP_BY_VALUES = tuple(PERIOD_PARTS) + ("all",)
+
+def period_summary(period: str, income: Decimal, expense: Decimal, count: int) -> dict:
+    return {
+        "period": period,
+        "income": float(income),
+        "expense": float(expense),
+        "net": float(income - expense),
+        "transaction_count": count,
+    }
+
+def _ledger_source(db, account_id, start_date, end_date, include_removed, include_pending, category_type):
+    amount = Transaction.amount
+    return (
+        filtered_transactions(db, account_id, start_date, end_date, include_removed, include_pending),
+        Transaction.transaction_date,
+        Transaction.personal_finance_category_primary if category_type == "primary"
+        else Transaction.personal_finance_category_detailed,
+        func.sum(amount).filter(amount > 0),
+        -func.sum(amount).filter(amount < 0),
+        func.count(),
+    )
+
+def _rollup_source(db, account_id, start_date, end_date, include_pending, category_type):
+    return (
+        filtered_rollups(db, account_id, start_date, end_date, include_pending),
+        Rollup.rollup_date,
+        Rollup.category_primary if category_type == "primary" else Rollup.category_detailed,
+        func.sum(Rollup.expense),
+        func.sum(Rollup.income),
+        func.sum(Rollup.transaction_count),
+    )
+
+def _source(db, account_id, start_date, end_date, include_removed, include_pending, category_type):
+    if include_removed:
+        # Removed rows are not in the rollups; this rare case scans the ledger
+        return _ledger_source(db, account_id, start_date, end_date, include_removed, include_pending, category_type)
+    return _rollup_source(db, account_id, start_date, end_date, include_pending, category_type)
+
+def _category_label(category_column):
+    # Missing and empty categories both report as "Uncategorized"
+    return func.coalesce(func.nullif(category_column, ""), "Uncategorized")
+
+def validate_group_by(group_by: str) -> None:
+    if group_by not in GROUP_BY_VALUES:
+        raise HTTPException(status_code=400, detail=f"Invalid group_by value: {group_by}")
+
+def _period_parts(group_by: str, day) -> list:
+    validate_group_by(group_by)
+    return [cast(func.date_part(part, day), Integer) for part in PERIOD_PARTS.get(group_by, ())]
+
+def summarize_transactions(
+    db: Session,
+    account_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: str = "month",
+    category_type: str = "primary",
+    include_removed: bool = False,
+    include_pending: bool = True,
+) -> dict:
+    """Income/expense by period and amount by category in one GROUPING SETS query.
+
+    Reads daily_account_category_rollups, so the cost follows the number of
+    days and categories rather than transactions.
+
+    Plaid stores expenses as positive and income as negative amounts.
+    """
+    query, day, category_column, expense, income, transaction_count = _source(
+        db, account_id, start_date, end_date, include_removed, include_pending, category_type
+    )
+    category = _category_label(category_column)
+    period_parts = _period_parts(group_by, day)
+    if period_parts:
+        period_grouped = func.grouping(*period_parts)
+        grouping_sets = [tuple_(*period_parts), tuple_(category), tuple_()]
+    else:
+        period_grouped = literal_column("1")
+        grouping_sets = [tuple_(category), tuple_()]
+
+    rows = (
+        query.with_entities(
+            period_grouped.label("period_grouped"),
+            func.grouping(category).label("category_grouped"),
+            *(part.label(f"period_{index}") for index, part in enumerate(period_parts)),
+            category.label("category"),
+            func.coalesce(expense, 0).label("expense"),
+            func.coalesce(income, 0).label("income"),
+            func.coalesce(transaction_count, 0).label("transaction_count"),
+        )
+        .group_by(func.grouping_sets(*grouping_sets))
+        .all()
+    )
+
+    periods, categories = [], []
+    total_income = total_expense = Decimal(0)
+    total_transactions = 0
+    for row in rows:
+        if not row.category_grouped:
+            categories.append({
+                "category": row.category,
+                "amount": float(row.expense - row.income),
+                "transaction_count": row.transaction_count,
+                "category_type": category_type,
+            })
+        elif not row.period_grouped:
+            period = PERIOD_KEYS[group_by](*row[2:2 + len(period_parts)])
+            periods.append(period_summary(period, row.income, row.expense, row.transaction_count))
+        else:
+            total_income, total_expense, total_transactions = row.income, row.expense, row.transaction_count
+
+    if group_by == "all":
+        # The empty grouping set always yields a row, so "all" is reported even with no transactions
+        periods = [period_summary("all", total_income, total_expense, total_transactions)]
+
+    # Sort in Python: keys must order exactly as before, independent of the database collation
+    periods.sort(key=lambda summary: summary["period"])
+    categories.sort(key=lambda summary: summary["category"])
+
+    return {
+        "period_summaries": periods,
+        "category_summaries": categories,
+        "total_income": float(total_income),
+        "total_expense": float(total_expense),
+        "net_total": float(total_income - total_expense),
+        "total_transactions": total_transactions,
+    }
+
+def pivot_transactions(
+    db: Session,
+    account_id: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: str = "month",
+    category_type: str = "primary",
+    include_removed: bool = False,
+    include_pending: bool = True,
+) -> dict:
+    """Period x category matrix of summed amounts, with row, column and grand totals.
+
+    One GROUPING SETS query yields the cells and every total. Amounts keep
+    Plaid's sign (expenses positive), as in category_summaries.
+    """
+    query, day, category_column, expense, income, transaction_count = _source(
+        db, account_id, start_date, end_date, include_removed, include_pending, category_type
+    )
+    category = _category_label(category_column)
+    period_parts = _period_parts(group_by, day)
+    if period_parts:
+        period_grouped = func.grouping(*period_parts)
+        grouping_sets = [tuple_(*period_parts, category), tuple_(*period_parts), tuple_(category), tuple_()]
+    else:
+        period_grouped = literal_column("1")
+        grouping_sets = [tuple_(category), tuple_()]
+
+    rows = (
+        query.with_entities(
+            period_grouped.label("period_grouped"),
+            func.grouping(category).label("category_grouped"),
+            *(part.label(f"period_{index}") for index, part in enumerate(period_parts)),
+            category.label("category"),
+            (func.coalesce(expense, 0) - func.coalesce(income, 0)).label("amount"),
+            func.coalesce(transaction_count, 0).label("transaction_count"),
+        )
+        .group_by(func.grouping_sets(*grouping_sets))
+        .all()
+    )
+
+    cells, period_totals, category_totals = {}, {}, {}
+    grand_total, total_transactions = Decimal(0), 0
+    for row in rows:
+        if row.category_grouped:
+            if row.period_grouped:
+                grand_total, total_transactions = row.amount, row.transaction_count
+            else:
+                period_totals[PERIOD_KEYS[group_by](*row[2:2 + len(period_parts)])] = row.amount
+        elif row.period_grouped:
+            category_totals[row.category] = row.amount
+            if not period_parts:
+                # group_by="all": the single period's cells are the category totals
+                cells["all", row.category] = (row.amount, row.transaction_count)
+        else:
+            period = PERIOD_KEYS[group_by](*row[2:2 + len(period_parts)])
+            cells[period, row.category] = (row.amount, row.transaction_count)
+
+    if not period_parts and category_totals:
+        period_totals["all"] = grand_total
+
+    periods = sorted(period_totals)
+    categories = sorted(category_totals)
+    return {
+        "group_by": group_by,
+        "category_type": category_type,
+        "periods": periods,
+        "categories": categories,
+        "amounts": [[float(cells.get((p, c), (0, 0))[0]) for c in categories] for p in periods],
+        "counts": [[cells.get((p, c), (0, 0))[1] for c in categories] for p in periods],
+        "period_totals": [float(period_totals[p]) for p in periods],
+        "category_totals": [float(category_totals[c]) for c in categories],
+        "grand_total": float(grand_total),
+        "total_transactions": total_transactions,
+    }
@@ -0,0 +1,221 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from plaid.model.transactions_sync_request import TransactionsSyncRequest
+from ..config.settings import settings
+from ..database.db import SessionLocal, advisory_lock
+from ..models.sync_cursor import SyncCursor
+from .item_registry import list_items
+from .plaid import PlaidError, check_item_status, invalidate_item_status
+from .plaid_gateway import call_plaid, get_plaid_error, get_plaid_error_code
+from .transaction_ingest import IngestStats, load_known_account_ids, apply_sync_page
+from .metrics import observe_latency
+from .data_events import bump_data_versions, notify_accounts_changed
+from .single_flight import SingleFlight
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGINATION_RESTARTS = 3
+
+_sync_flights = SingleFlight()
+
+def handle_sync_error(e, access_token: str):
+    if isinstance(e, HTTPException):
+        raise e
+    error_code = get_plaid_error_code(e)
+    if get_plaid_error(e).get("error_type") == "ITEM_ERROR" or error_code == "ITEM_LOGIN_REQUIRED":
+        # The cached healthy status is stale; the next sync must re-check the item
+        invalidate_item_status(access_token)
+        if error_code == "ITEM_LOGIN_REQUIRED":
+            raise PlaidError(status_code=400, error_code="ITEM_LOGIN_REQUIRED", message="Need to re-authenticate.")
+    if error_code == 'TRANSACTIONS_SYNC_LIMIT':
+        logger.warning(f"Rate limit exceedded for /transactions/sync: {access_token[:10]}...")
+        raise HTTPException(status_code=429, detail="Rate limit exceeded. Please try again later.")
+    elif error_code == 'TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION':
+        logger.warning(f"Pagination mutation persisted after {MAX_PAGINATION_RESTARTS} restarts: {access_token[:10]}...")
+        raise HTTPException(status_code=503, detail="Item kept changing during sync. Please try again later.")
+    raise HTTPException(status_code=500, detail=str(e))
+
+def _save_cursor(db: Session, cursor_record: Optional[SyncCursor], item_id: str, cursor: str, pagination_start_cursor: Optional[str]) -> SyncCursor:
+    if cursor_record:
+        cursor_record.cursor = cursor
+        cursor_record.pagination_start_cursor = pagination_start_cursor
+        cursor_record.updated_at = func.current_timestamp()
+        return cursor_record
+
+    cursor_record = SyncCursor(item_id=item_id, cursor=cursor, pagination_start_cursor=pagination_start_cursor)
+    db.add(cursor_record)
+    return cursor_record
+
+def run_transaction_sync(db: Session, item_id: str, access_token: str, stats: Optional[IngestStats] = None) -> dict:
+    """Pull every pending /transactions/sync page for an item and commit it.
+
+    Pages are followed until ``has_more`` is false, and every page is committed
+    together with its cursor, so an initial backfill of the full history can be
+    interrupted and resumed. Pacing and throttling retries are left to the
+    Plaid gateway. This is blocking (Plaid SDK + SQLAlchemy) and is
+    meant to run on a worker thread. Pass in ``stats`` to observe progress.
+    """
+    stats = stats if stats is not None else IngestStats()
+    sync_started = time.perf_counter()
+
+    # Check item status before syncing
+    check_item_status(access_token)
+
+    cursor_record = db.query(SyncCursor).filter(SyncCursor.item_id == item_id).first()
+    cursor = cursor_record.cursor if cursor_record else ""
+
+    request = TransactionsSyncRequest(
+        access_token=access_token,
+        cursor=cursor,
+        count=500 # maximum txs to get once
+    )
+
+    known_account_ids = load_known_account_ids(db)
+    # Plaid asks us to restart from the cursor the pagination loop began with
+    # when the item changes mid-pagination. A run interrupted mid-pagination
+    # resumes from its last committed page, but that page's cursor is not a
+    # valid restart point, so the loop's starting cursor is persisted with it.
+    if cursor_record and cursor_record.pagination_start_cursor is not None:
+        pagination_start_cursor = cursor_record.pagination_start_cursor
+    else:
+        pagination_start_cursor = cursor
+    restarts = 0
+
+    try:
+        while True:
+            try:
+                plaid_started = time.perf_counter()
+                response = call_plaid("transactions_sync", request)
+                stats.plaid_elapsed += time.perf_counter() - plaid_started
+            except Exception as e:
+                if get_plaid_error_code(e) != "TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION" or restarts >= MAX_PAGINATION_RESTARTS:
+                    raise
+                restarts += 1
+                logger.warning(f"Pagination mutation during sync: restarting from pre-pagination cursor ({restarts}/{MAX_PAGINATION_RESTARTS})")
+                request.cursor = pagination_start_cursor
+                # Pages committed since then are delivered again; count them once
+                stats.reset_counts()
+                continue
+
+            touched_account_ids = apply_sync_page(db, response, known_account_ids, stats)
+
+            # Commit rows and cursor together so a crash resumes from the last committed page
+            cursor = response["next_cursor"]
+            cursor_record = _save_cursor(db, cursor_record, item_id, cursor, pagination_start_cursor if response["has_more"] else None)
+            bump_data_versions(db, touched_account_ids)
+            db.commit()
+            notify_accounts_changed(touched_account_ids)
+
+            if not response["has_more"]:
+                logger.info("Transactions are completely fetched into database.")
+                break
+
+            request.cursor = cursor
+
+        observe_latency("sync.total", time.perf_counter() - sync_started)
+        logger.info(f"Sync completed for item {item_id}: {stats.rows} transactions processed at {stats.rows_per_second:.0f} rows/sec ({stats.plaid_elapsed:.2f}s in Plaid, {stats.elapsed:.2f}s ingesting)")
+        return {
+            "synced_count": stats.added,
+            "latest_transaction_date": stats.latest_date.isoformat() if stats.latest_date else None,
+            "sync_status": "success",
+            "modified_count": stats.modified,
+            "removed_count": stats.removed,
+            "rows_per_second": round(stats.rows_per_second, 1),
+            "plaid_seconds": round(stats.plaid_elapsed, 3),
+            "ingest_seconds": round(stats.elapsed, 3)
+        }
+
+    except Exception as e:
+        db.rollback()
+        handle_sync_error(e, access_token)
+
+def sync_item_once(db: Session, item_id: str, access_token: str, stats: Optional[IngestStats] = None) -> dict:
+    """Run the sync for an item, or join the run already in flight for it.
+
+    Callers in this process share one run through a single-flight future; the
+    advisory lock serialises runs across processes so two workers never page
+    through Plaid with the same cursor at once. A caller that joined another's
+    run gets that run's figures copied into its ``stats`` when it finishes.
+    """
+    stats = stats if stats is not None else IngestStats()
+
+    def run():
+        with advisory_lock(f"transactions_sync:{item_id}"):
+            return run_transaction_sync(db, item_id, access_token, stats=stats), stats
+
+    result, run_stats = _sync_flights.do(item_id, run)
+    if run_stats is not stats:
+        stats.copy_from(run_stats)
+    return result
+
+def _sync_item_in_new_session(item_id: str, access_token: str, stats: IngestStats) -> dict:
+    db = SessionLocal()
+    try:
+        return {"item_id": item_id, **sync_item_once(db, item_id, access_token, stats=stats)}
+    except HTTPException as e:
+        return {"item_id": item_id, "sync_status": "failed", "error": str(e.detail)}
+    except Exception as e:
+        # Database and lock errors outside the sync's own handling must not abort the other items
+        logger.exception(f"Sync of item {item_id} crashed")
+        return {"item_id": item_id, "sync_status": "failed", "error": str(e)}
+    finally:
+        db.close()
+
+def _combine_item_results(results: list[dict], elapsed: float) -> dict:
+    succeeded = [r for r in results if r["sync_status"] == "success"]
+    latest_dates = [r["latest_transaction_date"] for r in succeeded if r.get("latest_transaction_date")]
+    rows = sum(r["synced_count"] + r["modified_count"] + r["removed_count"] for r in succeeded)
+
+    if len(succeeded) == len(results):
+        sync_status = "success"
+    elif succeeded:
+        sync_status = "partial"
+    else:
+        sync_status = "failed"
+
+    return {
+        "synced_count": sum(r["synced_count"] for r in succeeded),
+        "latest_transaction_date": max(latest_dates) if latest_dates else None,
+        "sync_status": sync_status,
+        "modified_count": sum(r["modified_count"] for r in succeeded),
+        "removed_count": sum(r["removed_count"] for r in succeeded),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+        "plaid_seconds": round(sum(r["plaid_seconds"] for r in succeeded), 3),
+        "ingest_seconds": round(sum(r["ingest_seconds"] for r in succeeded), 3),
+        "items": results
+    }
+
+def sync_all_items(stats_by_item: Optional[dict[str, IngestStats]] = None) -> dict:
+    """Sync every registered item concurrently on a bounded pool.
+
+    Each item gets its own session and cursor, so wall time is bounded by the
+    slowest item rather than the sum. A failing item is reported in ``items``
+    without aborting the others.
+    """
+    db = SessionLocal()
+    try:
+        items = [(item.item_id, item.access_token) for item in list_items(db)]
+    finally:
+        db.close()
+
+    if not items:
+        raise HTTPException(status_code=400, detail="No bank connection registered. Please connect bank account first.")
+
+    stats_by_item = stats_by_item if stats_by_item is not None else {}
+    for item_id, _ in items:
+        stats_by_item.setdefault(item_id, IngestStats())
+
+    started = time.perf_counter()
+    max_workers = min(settings.SYNC_ALL_MAX_WORKERS, len(items))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sync-item") as pool:
+        results = list(pool.map(
+            lambda item: _sync_item_in_new_session(item[0], item[1], stats_by_item[item[0]]),
+            items
+        ))
+
+    return _combine_item_results(results, time.perf_counter() - started)
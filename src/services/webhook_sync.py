@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+from ..config.settings import settings
+from .sync_jobs import submit_sync_job
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class _ItemSyncState:
+    timer: Optional[threading.Timer] = None
+    running: bool = False
+    dirty: bool = False
+    events: int = 0
+
+class SyncCoalescer:
+    """Collapse bursts of webhooks for the same item into a single sync run.
+
+    The first event for an idle item schedules a run ``debounce_seconds`` later
+    and every event inside that window joins it. Events that arrive while the
+    run is in flight schedule exactly one follow-up run once it finishes.
+    ``start_sync(item_id, on_done)`` must start the sync and call ``on_done()``
+    when it completes.
+    """
+
+    def __init__(self, debounce_seconds: float, start_sync: Callable[[str, Callable[[], None]], None]):
+        self.debounce_seconds = debounce_seconds
+        self.start_sync = start_sync
+        self._states: dict[str, _ItemSyncState] = {}
+        self._lock = threading.Lock()
+
+    def notify(self, item_id: str) -> bool:
+        """Record an update for ``item_id``; returns False if it was folded into an existing run"""
+        with self._lock:
+            state = self._states.setdefault(item_id, _ItemSyncState())
+            state.events += 1
+            if state.timer is not None or state.dirty:
+                return False
+            if state.running:
+                state.dirty = True
+                return False
+            self._schedule(item_id, state)
+            return True
+
+    def _schedule(self, item_id: str, state: _ItemSyncState) -> None:
+        state.timer = threading.Timer(self.debounce_seconds, self._fire, args=(item_id,))
+        state.timer.daemon = True
+        state.timer.start()
+
+    def _fire(self, item_id: str) -> None:
+        with self._lock:
+            state = self._states[item_id]
+            state.timer = None
+            state.running = True
+            logger.info(f"Starting webhook sync for item {item_id} ({state.events} event(s) coalesced)")
+            state.events = 0
+        try:
+            self.start_sync(item_id, lambda: self._done(item_id))
+        except Exception:
+            logger.exception(f"Failed to start webhook sync for item {item_id}")
+            self._done(item_id)
+
+    def _done(self, item_id: str) -> None:
+        with self._lock:
+            state = self._states[item_id]
+            state.running = False
+            if state.dirty:
+                state.dirty = False
+                self._schedule(item_id, state)
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            for state in self._states.values():
+                if state.timer is not None:
+                    state.timer.cancel()
+                    state.timer = None
+
+def _start_item_sync(item_id: str, on_done: Callable[[], None]) -> None:
+    submit_sync_job(item_id=item_id, on_done=lambda job: on_done())
+
+webhook_coalescer = SyncCoalescer(settings.WEBHOOK_DEBOUNCE_SECONDS, _start_item_sync)
@@ -0,0 +1,68 @@
+"""Balance history computed by Postgres with window functions.
+
+One statement buckets the daily rollups by period, left-joins them to a
+generate_series of every period start, runs SUM() OVER the buckets from the
+nearest month-end checkpoint and takes each period's opening balance with
+LAG(). The API process receives one row per period, never the rows behind it.
+
+Used for /assets/history when ANALYTICS_ENGINE is "sql" and
+ASSET_HISTORY_ENGINE is "window".
+"""
+from datetime import date
+from sqlalchemy import Date, DateTime, Numeric, bindparam, cast, func, literal, literal_column, select
+from sqlalchemy.orm import Session
+from ..config.settings import settings
+from ..models.daily_rollup import DailyAccountCategoryRollup as Rollup
+from .balance_checkpoints import latest_checkpoint
+
+# Postgres date_trunc() fields and generate_series() steps of _balance_periods
+# granularities; date_trunc('week') starts on Monday, as the periods do.
+# Truncating timestamps, not dates, keeps the session time zone out of it
+STEPS = {"day": "interval '1 day'", "week": "interval '1 week'", "month": "interval '1 month'"}
+
+def use_window_functions() -> bool:
+    return settings.ASSET_HISTORY_ENGINE == "window"
+
+def window_balances(db: Session, account_id: str, periods, end_date: date, granularity: str) -> list[float]:
+    """Balances at the _period_boundaries of non-empty ``periods``, counting rollups up to ``end_date``"""
+    step = literal_column(STEPS[granularity])
+    checkpoint = latest_checkpoint(db, account_id, periods[0][3])
+
+    # Net per day first: the rollups are read in primary key (date) order, so
+    # this groups without a sort and only one row per day reaches date_trunc()
+    daily = select(Rollup.rollup_date.label("day"), func.sum(Rollup.income - Rollup.expense).label("net")).where(
+        Rollup.account_id == account_id, Rollup.rollup_date <= end_date
+    )
+    if checkpoint:
+        daily = daily.where(Rollup.rollup_date > checkpoint.checkpoint_date)
+    daily = daily.group_by(Rollup.rollup_date).subquery("daily")
+
+    # The series opens one bucket early, at the period holding prev_period_end of
+    # the first period; every day between the checkpoint and it lands there
+    opening_start = cast(func.date_trunc(granularity, bindparam("opening_end", periods[0][3], type_=DateTime)), Date)
+    bucket = func.greatest(cast(func.date_trunc(granularity, cast(daily.c.day, DateTime)), Date), opening_start)
+    sums = select(bucket.label("bucket"), func.sum(daily.c.net).label("net")).group_by(bucket).subquery("sums")
+
+    series = func.generate_series(opening_start, bindparam("last_start", periods[-1][1], type_=Date), step).table_valued("bucket_start").render_derived(name="series")
+    bucket_start = cast(series.c.bucket_start, Date)
+    opening_balance = literal(checkpoint.balance if checkpoint else 0, Numeric(18, 2))
+    balances = (
+        select(
+            bucket_start.label("bucket_start"),
+            (opening_balance + func.sum(func.coalesce(sums.c.net, 0)).over(order_by=bucket_start)).label("balance"),
+        )
+        .select_from(series.outerjoin(sums, sums.c.bucket == bucket_start))
+        .subquery("balances")
+    )
+    history = select(
+        balances.c.bucket_start,
+        func.lag(balances.c.balance).over(order_by=balances.c.bucket_start).label("prev_balance"),
+        balances.c.balance,
+    ).subquery("history")
+
+    rows = db.execute(
+        select(history.c.prev_balance, history.c.balance)
+        .where(history.c.bucket_start >= periods[0][1])
+        .order_by(history.c.bucket_start)
+    ).all()
+    return [float(value) for row in rows for value in row]
@@ -0,0 +1,35 @@
+from datetime import date
+from typing import Optional, Union
+from fastapi import HTTPException, Request, Response
+import hashlib
+
+def compute_etag(request: Request, data_version: Union[int, str]) -> str:
+    """Strong ETag over the path, the query parameters and the account's data version
+    (or a string combining the versions of several accounts).
+
+    Today's date is mixed in because omitted date ranges default to today.
+    """
+    params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    raw = f"{request.url.path}?{params}|v{data_version}|{date.today().isoformat()}"
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+def check_not_modified(request: Request, response: Response, data_version: Union[int, str]) -> None:
+    """Tag ``response`` for a read of data at ``data_version``, or raise 304 if the client's copy is current.
+
+    The 304 goes out as an HTTPException, which FastAPI answers without a
+    body but with the ETag header. Handlers that return their own Response
+    pass ``headers=response.headers`` on.
+    """
+    etag = compute_etag(request, data_version)
+    if _matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
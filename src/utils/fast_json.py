@@ -0,0 +1,22 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder produces the same JSON
+    orjson = None
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(obj: Any) -> bytes:
+    """Encode plain dicts/lists/rows to JSON bytes; Decimal becomes float, dates ISO strings"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,38 @@
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Optional
+from fastapi import HTTPException
+import base64
+import binascii
+import json
+
+# Sort columns that can drive a keyset cursor; each must be NOT NULL so the
+# (value, transaction_id) row comparison is total. Maps column -> parser.
+KEYSET_COLUMNS = {
+    "transaction_date": date.fromisoformat,
+    "amount": Decimal,
+}
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, transaction_id: str) -> str:
+    raw = json.dumps({"s": sort_by, "o": sort_order, "v": str(value), "id": transaction_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> tuple[Any, str]:
+    """Return (sort value, transaction_id) from an opaque cursor, or raise 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if data["s"] != sort_by or data["o"] != sort_order:
+            raise HTTPException(status_code=400, detail="Cursor does not match sort_by/sort_order")
+        return KEYSET_COLUMNS[sort_by](data["v"]), data["id"]
+    except HTTPException:
+        raise
+    except (ValueError, KeyError, TypeError, InvalidOperation, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def next_cursor_for(rows: list, limit: int, sort_by: str, sort_order: str) -> Optional[str]:
+    """Cursor for the page after ``rows`` (fetched with limit + 1), if there is one"""
+    if len(rows) <= limit or sort_by not in KEYSET_COLUMNS:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(sort_by, sort_order, getattr(last, sort_by), last.transaction_id)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Compare the analytics engines on one account, in-process against the local database:
+
+    loop   the original per-transaction Python loop over ORM rows
+    sql    GROUPING SETS over daily_account_category_rollups (ANALYTICS_ENGINE=sql)
+    window asset history as SUM() OVER / LAG() in Postgres (ASSET_HISTORY_ENGINE=window)
+    numpy  bincount/cumsum over a warm columnar snapshot (ANALYTICS_ENGINE=numpy)
+
+    python tests/bench_analytics.py --rows 100000 --repeat 20
+
+Also reports what the snapshot costs to build and to refresh after a sync page
+touched a handful of rows. Synthetic rows are written under the account
+"bench-analytics" and are deleted before and after the run.
+"""
+import sys
+import os
+import argparse
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy.dialects.postgresql import insert
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.plaid_item import PlaidItem  # noqa: F401 (accounts.item_id references it)
+from src.models.transaction import Transaction
+from src.models.daily_rollup import DailyAccountCategoryRollup
+from src.models.balance_checkpoint import BalanceCheckpoint
+from src.api.assets.router import _compute_asset_history, _compute_asset_history_columnar, _compute_asset_history_window
+from src.services.daily_rollups import rebuild_rollups
+from src.services.balance_checkpoints import rebuild_checkpoints
+from src.services.data_events import bump_data_versions
+from src.services.transaction_ingest import IngestStats, apply_sync_page, load_known_account_ids
+from src.services.transaction_summary import summarize_transactions
+from src.services.columnar_analytics import get_snapshot, snapshot_cache, summarize_snapshot
+from tests.plaid_replay import generate_transactions
+
+BENCH_ACCOUNT_ID = "bench-analytics"
+
+
+def reset_bench_data(db) -> None:
+    db.query(BalanceCheckpoint).filter(BalanceCheckpoint.account_id == BENCH_ACCOUNT_ID).delete(synchronize_session=False)
+    db.query(DailyAccountCategoryRollup).filter(DailyAccountCategoryRollup.account_id == BENCH_ACCOUNT_ID).delete(synchronize_session=False)
+    db.query(Transaction).filter(Transaction.account_id == BENCH_ACCOUNT_ID).delete(synchronize_session=False)
+    db.query(Account).filter(Account.account_id == BENCH_ACCOUNT_ID).delete(synchronize_session=False)
+    db.commit()
+
+
+def seed_bench_data(db, rows: int) -> None:
+    db.add(Account(account_id=BENCH_ACCOUNT_ID, account_name="Bench analytics"))
+    db.flush()
+    # Stamped a day back, like rows written by earlier syncs
+    written_at = datetime.now() - timedelta(days=1)
+    batch = []
+    # Three years of history up to today
+    for tx in generate_transactions(rows, [BENCH_ACCOUNT_ID], start_date=date.today() - timedelta(days=3 * 365), days=3 * 365):
+        category = tx["personal_finance_category"]
+        batch.append({
+            "transaction_id": f"bench-analytics-{tx['transaction_id']}",
+            "account_id": BENCH_ACCOUNT_ID,
+            "amount": tx["amount"],
+            "transaction_date": tx["date"],
+            "merchant_name": tx["merchant_name"],
+            "name": tx["name"],
+            "pending": tx["pending"],
+            "personal_finance_category_primary": category["primary"],
+            "personal_finance_category_detailed": category["detailed"],
+            "is_removed": False,
+            "created_at": written_at,
+            "updated_at": written_at,
+        })
+        if len(batch) == 5000:
+            db.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Transaction), batch)
+    rebuild_rollups(db, [BENCH_ACCOUNT_ID])
+    rebuild_checkpoints(db, [BENCH_ACCOUNT_ID])
+    db.commit()
+
+
+def loop_summary(db, group_by: str = "month") -> dict:
+    """The per-transaction implementation the summary endpoint started from"""
+    transactions = db.query(Transaction).filter(
+        Transaction.account_id == BENCH_ACCOUNT_ID, Transaction.is_removed == False
+    ).all()
+    period_groups, category_groups = {}, {}
+    for t in transactions:
+        if group_by == "week":
+            period_key = f"{t.transaction_date.year}-W{t.transaction_date.isocalendar()[1]:02d}"
+        elif group_by == "month":
+            period_key = t.transaction_date.strftime("%Y-%m")
+        else:
+            period_key = str(t.transaction_date.year)
+        period_groups.setdefault(period_key, []).append(t)
+        category_groups.setdefault(t.personal_finance_category_primary or "Uncategorized", []).append(t)
+    periods = [
+        (period, sum(t.amount for t in txs if t.amount > 0), sum(abs(t.amount) for t in txs if t.amount < 0), len(txs))
+        for period, txs in sorted(period_groups.items())
+    ]
+    categories = [(category, sum(t.amount for t in txs), len(txs)) for category, txs in sorted(category_groups.items())]
+    return {"periods": periods, "categories": categories}
+
+
+def timed(run, repeat: int) -> dict:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {"p50_ms": statistics.median(latencies), "max_ms": max(latencies)}
+
+
+def touch_rows(db, count: int) -> None:
+    """Apply one sync page that modifies ``count`` rows and adds ``count`` more"""
+    ids = [transaction_id for (transaction_id,) in db.query(Transaction.transaction_id).filter(
+        Transaction.account_id == BENCH_ACCOUNT_ID, Transaction.is_removed == False
+    ).limit(count)]
+    page = {
+        "added": [{
+            "transaction_id": f"bench-analytics-new-{time.time_ns()}-{index}",
+            "account_id": BENCH_ACCOUNT_ID,
+            "amount": 10 + index,
+            "date": date.today(),
+            "merchant_name": "Bench",
+            "name": "Bench",
+            "pending": False,
+            "personal_finance_category": {"primary": "GENERAL_MERCHANDISE", "detailed": "GENERAL_MERCHANDISE_OTHER"},
+        } for index in range(count)],
+        "modified": [{"transaction_id": transaction_id, "account_id": BENCH_ACCOUNT_ID, "amount": 42, "pending": False} for transaction_id in ids],
+        "removed": [],
+    }
+    touched = apply_sync_page(db, page, load_known_account_ids(db), IngestStats())
+    bump_data_versions(db, touched)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--touched", type=int, default=50, help="rows a sync page modifies (and adds) before the refresh")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        reset_bench_data(db)
+        seed_bench_data(db, args.rows)
+        account = db.query(Account).filter(Account.account_id == BENCH_ACCOUNT_ID).one()
+
+        snapshot_cache.clear()
+        build = timed(lambda: get_snapshot(db, account), 1)
+        snapshot = get_snapshot(db, account)
+        touch_rows(db, args.touched)
+        db.refresh(account)
+        refresh = timed(lambda: get_snapshot(db, account), 1)
+        snapshot = get_snapshot(db, account)
+        print(f"snapshot: {len(snapshot.transaction_ids)} rows, build {build['p50_ms']:.1f} ms, "
+              f"refresh after {args.touched} modified + {args.touched} added {refresh['p50_ms']:.1f} ms")
+
+        end_date = date.today()
+        print(f"{'operation':>22} {'engine':>6} {'p50 ms':>9} {'max ms':>9}")
+        for group_by in ("month", "week"):
+            runs = (
+                ("loop", lambda: loop_summary(db, group_by), max(1, args.repeat // 5)),
+                ("sql", lambda: summarize_transactions(db, BENCH_ACCOUNT_ID, group_by=group_by), args.repeat),
+                ("numpy", lambda: summarize_snapshot(snapshot, group_by=group_by), args.repeat),
+            )
+            for engine, run, repeat in runs:
+                r = timed(run, repeat)
+                print(f"{'summary ' + group_by:>22} {engine:>6} {r['p50_ms']:>9.2f} {r['max_ms']:>9.2f}")
+        for granularity, start_date in (("month", end_date - timedelta(days=365)), ("week", end_date - timedelta(days=91))):
+            runs = (
+                ("sql", lambda: _compute_asset_history(db, BENCH_ACCOUNT_ID, start_date, end_date, granularity)),
+                ("window", lambda: _compute_asset_history_window(db, BENCH_ACCOUNT_ID, start_date, end_date, granularity)),
+                ("numpy", lambda: _compute_asset_history_columnar(db, account, start_date, end_date, granularity)),
+            )
+            for engine, run in runs:
+                r = timed(run, max(1, args.repeat // 4))
+                print(f"{'asset history ' + granularity:>22} {engine:>6} {r['p50_ms']:>9.2f} {r['max_ms']:>9.2f}")
+    finally:
+        snapshot_cache.clear()
+        reset_bench_data(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
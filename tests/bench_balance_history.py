@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the balance-history sweep against the original per-period
+helpers, in memory (no database)
+
+    python tests/bench_balance_history.py --transactions 10000 --days 365
+
+Transactions are spread over twice the history window, so half of them fall
+before start_date, as they do for a long-lived account.
+"""
+import sys
+import os
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api.assets.router import _balance_periods, _calculate_balance_history
+from tests.test_balance_history import REFERENCES
+
+
+def make_transactions(count: int, span_days: int, end_date: date) -> list:
+    rng = random.Random(7)
+    first_day = end_date - timedelta(days=span_days - 1)
+    rows = [
+        SimpleNamespace(
+            transaction_date=first_day + timedelta(days=rng.randrange(span_days)),
+            amount=Decimal(rng.randrange(-300_000, 30_000)).scaleb(-2),
+        )
+        for _ in range(count)
+    ]
+    rows.sort(key=lambda row: row.transaction_date)
+    return rows
+
+
+def timed(run) -> tuple[float, list]:
+    started = time.perf_counter()
+    result = run()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=365, help="length of the requested history")
+    args = parser.parse_args()
+
+    end_date = date(2024, 12, 31)
+    start_date = end_date - timedelta(days=args.days - 1)
+    transactions = make_transactions(args.transactions, 2 * args.days, end_date)
+
+    print(f"{args.transactions} transactions, {start_date} .. {end_date}")
+    print(f"{'granularity':>11} {'periods':>8} {'original ms':>12} {'sweep ms':>9} {'speedup':>8}")
+    for granularity in ("month", "week", "day"):
+        original_ms, expected = timed(lambda: REFERENCES[granularity](transactions, start_date, end_date))
+        sweep_ms, actual = timed(lambda: _calculate_balance_history(transactions, _balance_periods(start_date, end_date, granularity)))
+        assert actual == expected, f"{granularity} history differs"
+        print(f"{granularity:>11} {len(actual):>8} {original_ms:>12.1f} {sweep_ms:>9.2f} {original_ms / sweep_ms:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
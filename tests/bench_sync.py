@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark sync_transactions and store_accounts end to end against the local
+database, with Plaid replaced by SyntheticPlaidClient (no network)
+
+    python tests/bench_sync.py --sizes 10000 100000 1000000
+
+Synthetic rows are written under the item/accounts "bench-*" and are deleted
+before and after each run.
+"""
+import sys
+import os
+import argparse
+import time
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config.settings import settings
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.plaid_item import PlaidItem
+from src.models.transaction import Transaction
+from src.services.plaid_client import set_plaid_client
+from src.services.item_registry import register_item
+from src.services.transaction_ingest import IngestStats
+from src.services.transaction_sync import sync_item_once
+from src.api.plaid.router import store_accounts
+from tests.plaid_replay import SyntheticPlaidClient
+
+BENCH_ITEM_ID = "bench-item"
+BENCH_ACCESS_TOKEN = "bench-access-token"
+BENCH_ACCOUNT_IDS = ("bench-checking", "bench-savings", "bench-credit")
+
+
+def reset_bench_data(db) -> None:
+    db.query(Transaction).filter(Transaction.account_id.in_(BENCH_ACCOUNT_IDS)).delete(synchronize_session=False)
+    db.query(Account).filter(Account.account_id.in_(BENCH_ACCOUNT_IDS)).delete(synchronize_session=False)
+    # sync_cursors rows go with the item (ON DELETE CASCADE)
+    db.query(PlaidItem).filter(PlaidItem.item_id == BENCH_ITEM_ID).delete(synchronize_session=False)
+    db.commit()
+
+
+def bench_size(total: int, modified_ratio: float, removed_ratio: float) -> dict:
+    fake = SyntheticPlaidClient(
+        total,
+        item_id=BENCH_ITEM_ID,
+        account_ids=BENCH_ACCOUNT_IDS,
+        modified_ratio=modified_ratio,
+        removed_ratio=removed_ratio,
+    )
+    set_plaid_client(fake)
+
+    db = SessionLocal()
+    try:
+        reset_bench_data(db)
+        register_item(db, BENCH_ITEM_ID, BENCH_ACCESS_TOKEN)
+        db.commit()
+
+        started = time.perf_counter()
+        store_accounts(BENCH_ACCESS_TOKEN, db, BENCH_ITEM_ID)
+        accounts_seconds = time.perf_counter() - started
+
+        stats = IngestStats()
+        started = time.perf_counter()
+        sync_item_once(db, BENCH_ITEM_ID, BENCH_ACCESS_TOKEN, stats=stats)
+        sync_seconds = time.perf_counter() - started
+
+        stored = db.query(Transaction).filter(Transaction.account_id.in_(BENCH_ACCOUNT_IDS)).count()
+        assert stored == total, f"expected {total} rows, found {stored}"
+        return {
+            "rows": total,
+            "pages": stats.pages,
+            "store_accounts_s": accounts_seconds,
+            "sync_s": sync_seconds,
+            "ingest_s": stats.elapsed,
+            "rows_per_s": stats.rows / sync_seconds if sync_seconds else 0.0,
+        }
+    finally:
+        reset_bench_data(db)
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--modified-ratio", type=float, default=0.02)
+    parser.add_argument("--removed-ratio", type=float, default=0.01)
+    args = parser.parse_args()
+
+    # Synthetic Plaid answers instantly; the per-item budget would only measure the limiter
+    settings.PLAID_RATE_LIMIT_ENABLED = False
+
+    print(f"{'rows':>10} {'pages':>6} {'accounts s':>11} {'sync s':>9} {'ingest s':>9} {'rows/s':>10}")
+    for size in args.sizes:
+        r = bench_size(size, args.modified_ratio, args.removed_ratio)
+        print(f"{r['rows']:>10} {r['pages']:>6} {r['store_accounts_s']:>11.3f} {r['sync_s']:>9.2f} {r['ingest_s']:>9.2f} {r['rows_per_s']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
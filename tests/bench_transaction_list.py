@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compare GET /transactions with full ORM/Pydantic rows against the sparse
+fields= path, in-process through TestClient against the local database
+
+    python tests/bench_transaction_list.py --rows 50000 --limit 500 --requests 200
+
+Synthetic rows are written under the account "bench-list" and are deleted
+before and after the run.
+"""
+import sys
+import os
+import argparse
+import statistics
+import time
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects.postgresql import insert
+from src.main import app
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.transaction import Transaction
+from src.utils.auth import create_access_token
+from tests.plaid_replay import generate_transactions
+
+BENCH_ACCOUNT_ID = "bench-list"
+MOBILE_FIELDS = "transaction_date,name,amount,personal_finance_category_primary"
+
+
+def reset_bench_data(db) -> None:
+    db.query(Transaction).filter(Transaction.account_id == BENCH_ACCOUNT_ID).delete(synchronize_session=False)
+    db.query(Account).filter(Account.account_id == BENCH_ACCOUNT_ID).delete(synchronize_session=False)
+    db.commit()
+
+
+def seed_bench_data(db, rows: int) -> None:
+    db.add(Account(account_id=BENCH_ACCOUNT_ID, account_name="Bench list"))
+    db.flush()
+    batch = []
+    for tx in generate_transactions(rows, [BENCH_ACCOUNT_ID]):
+        category = tx["personal_finance_category"]
+        batch.append({
+            "transaction_id": f"bench-list-{tx['transaction_id']}",
+            "account_id": BENCH_ACCOUNT_ID,
+            "amount": tx["amount"],
+            "transaction_date": tx["date"],
+            "merchant_name": tx["merchant_name"],
+            "name": tx["name"],
+            "pending": tx["pending"],
+            "personal_finance_category_primary": category["primary"],
+            "personal_finance_category_detailed": category["detailed"],
+            "is_removed": False,
+        })
+        if len(batch) == 5000:
+            db.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Transaction), batch)
+    db.commit()
+
+
+def measure(client, headers, params: dict, requests: int) -> dict:
+    latencies, size = [], 0
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get("/transactions", params=params, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.text
+        size = len(response.content)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "bytes": size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--fields", default=MOBILE_FIELDS)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        reset_bench_data(db)
+        seed_bench_data(db, args.rows)
+
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench'})[0]}"}
+        base = {"account_id": BENCH_ACCOUNT_ID, "limit": args.limit, "count_strategy": "none"}
+
+        print(f"{'path':>8} {'p50 ms':>8} {'p99 ms':>8} {'bytes':>10}")
+        for label, params in (("full", base), ("fields", {**base, "fields": args.fields})):
+            measure(client, headers, params, 5)  # warm up
+            r = measure(client, headers, params, args.requests)
+            print(f"{label:>8} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['bytes']:>10}")
+    finally:
+        reset_bench_data(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Builders for the Plaid-shaped transactions and /transactions/sync pages that
+tests feed to apply_sync_page
+"""
+from datetime import date
+from typing import Optional
+
+
+def tx(
+    account_id: str,
+    name: str,
+    day: date,
+    amount,
+    primary: Optional[str] = None,
+    detailed: Optional[str] = None,
+    pending: bool = False,
+    transaction_id: Optional[str] = None,
+) -> dict:
+    """A transaction as Plaid returns it, with id "<account_id>-<name>" unless given.
+
+    Pass the original transaction_id to modify a transaction into another
+    account. No category is sent unless primary is given ("" included).
+    """
+    return {
+        "transaction_id": transaction_id or f"{account_id}-{name}",
+        "account_id": account_id,
+        "amount": amount,
+        "date": day,
+        "merchant_name": None,
+        "name": name,
+        "pending": pending,
+        "personal_finance_category": {"primary": primary, "detailed": detailed} if primary is not None else None,
+    }
+
+
+def page(added=(), modified=(), removed=()) -> dict:
+    return {"added": list(added), "modified": list(modified), "removed": list(removed)}
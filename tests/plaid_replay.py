@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Offline stand-ins for the Plaid API used by tests and benchmarks
+
+- RecordingPlaidClient wraps a real client and writes transactions_sync,
+  item_get and accounts_get responses to fixture files.
+- ReplayPlaidClient serves those fixtures back without network access.
+- SyntheticPlaidClient generates arbitrarily large, deterministic histories.
+
+Install any of them process-wide with
+src.services.plaid_client.set_plaid_client(...).
+
+Record fixtures from a live item:
+    python tests/plaid_replay.py record tests/fixtures/plaid
+"""
+import sys
+import os
+import json
+import hashlib
+import random
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+RECORDED_ENDPOINTS = ("transactions_sync", "item_get", "accounts_get")
+DATE_FIELDS = ("date", "authorized_date")
+PRIMARY_CATEGORIES = {
+    "FOOD_AND_DRINK": ["FOOD_AND_DRINK_GROCERIES", "FOOD_AND_DRINK_RESTAURANT", "FOOD_AND_DRINK_COFFEE"],
+    "TRANSPORTATION": ["TRANSPORTATION_PUBLIC_TRANSIT", "TRANSPORTATION_GAS"],
+    "GENERAL_MERCHANDISE": ["GENERAL_MERCHANDISE_ONLINE_MARKETPLACES", "GENERAL_MERCHANDISE_CLOTHING_AND_ACCESSORIES"],
+    "RENT_AND_UTILITIES": ["RENT_AND_UTILITIES_RENT", "RENT_AND_UTILITIES_TELEPHONE"],
+    "INCOME": ["INCOME_WAGES"],
+    "TRANSFER_IN": ["TRANSFER_IN_ACCOUNT_TRANSFER"],
+}
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()[:16]
+
+
+def _fixture_path(fixture_dir: str, endpoint: str, access_token: str, cursor: str = None) -> str:
+    # Access tokens are never written to disk, only a digest of them
+    name = _digest(access_token)
+    if cursor is not None:
+        name = f"{name}_{_digest(cursor)}"
+    return os.path.join(fixture_dir, endpoint, f"{name}.json")
+
+
+def _to_json(response) -> dict:
+    return response.to_dict() if hasattr(response, "to_dict") else response
+
+
+def _revive_dates(response: dict) -> dict:
+    for key in ("added", "modified"):
+        for tx in response.get(key, []):
+            for field in DATE_FIELDS:
+                if isinstance(tx.get(field), str):
+                    tx[field] = date.fromisoformat(tx[field])
+    return response
+
+
+class RecordingPlaidClient:
+    """Pass calls through to a real PlaidApi and save what comes back"""
+
+    def __init__(self, client, fixture_dir: str):
+        self.client = client
+        self.fixture_dir = fixture_dir
+
+    def _record(self, endpoint: str, request, response, cursor: str = None):
+        path = _fixture_path(self.fixture_dir, endpoint, request.access_token, cursor)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(_to_json(response), f, default=str, indent=1)
+        return response
+
+    def transactions_sync(self, request, **kwargs):
+        response = self.client.transactions_sync(request, **kwargs)
+        return self._record("transactions_sync", request, response, cursor=request.cursor)
+
+    def item_get(self, request, **kwargs):
+        return self._record("item_get", request, self.client.item_get(request, **kwargs))
+
+    def accounts_get(self, request, **kwargs):
+        return self._record("accounts_get", request, self.client.accounts_get(request, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+class ReplayPlaidClient:
+    """Serve responses captured by RecordingPlaidClient"""
+
+    def __init__(self, fixture_dir: str):
+        self.fixture_dir = fixture_dir
+        self.calls = {endpoint: 0 for endpoint in RECORDED_ENDPOINTS}
+
+    def _load(self, endpoint: str, request, cursor: str = None) -> dict:
+        self.calls[endpoint] += 1
+        path = _fixture_path(self.fixture_dir, endpoint, request.access_token, cursor)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No recorded {endpoint} response at {path}")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def transactions_sync(self, request, **kwargs):
+        return _revive_dates(self._load("transactions_sync", request, cursor=request.cursor))
+
+    def item_get(self, request, **kwargs):
+        return self._load("item_get", request)
+
+    def accounts_get(self, request, **kwargs):
+        return self._load("accounts_get", request)
+
+
+def generate_transaction(index: int, account_ids, start_date: date, days: int, seed: int = 0) -> dict:
+    """Deterministic Plaid-shaped transaction; the same index always yields the same row"""
+    rng = random.Random(f"{seed}:{index}")
+    primary = rng.choice(list(PRIMARY_CATEGORIES))
+    is_income = primary in ("INCOME", "TRANSFER_IN")
+    amount = -round(rng.uniform(500, 4000), 2) if is_income else round(rng.uniform(1, 250), 2)
+    return {
+        "transaction_id": f"synthetic-{seed}-{index}",
+        "account_id": account_ids[index % len(account_ids)],
+        "amount": amount,
+        "date": start_date + timedelta(days=rng.randrange(days)),
+        "merchant_name": f"Merchant {rng.randrange(500)}",
+        "name": f"Purchase {index}",
+        "pending": rng.random() < 0.02,
+        "personal_finance_category": {
+            "primary": primary,
+            "detailed": rng.choice(PRIMARY_CATEGORIES[primary]),
+        },
+    }
+
+
+def generate_transactions(count: int, account_ids, start_date: date = date(2015, 1, 1), days: int = 3650, seed: int = 0):
+    for index in range(count):
+        yield generate_transaction(index, account_ids, start_date, days, seed)
+
+
+class SyntheticPlaidClient:
+    """Page through a generated history of ``total`` transactions.
+
+    The cursor is the offset into the history, so pages are produced lazily
+    and a 1M-row backfill never sits in memory at once. ``modified_ratio`` and
+    ``removed_ratio`` replay a fraction of already-delivered rows as
+    modifications/removals in each page.
+    """
+
+    def __init__(self, total: int, item_id: str = "synthetic-item", account_ids=("synthetic-checking", "synthetic-credit"),
+                 page_size: int = 500, modified_ratio: float = 0.0, removed_ratio: float = 0.0,
+                 start_date: date = date(2015, 1, 1), days: int = 3650, seed: int = 0):
+        self.total = total
+        self.item_id = item_id
+        self.account_ids = list(account_ids)
+        self.page_size = page_size
+        self.modified_ratio = modified_ratio
+        self.removed_ratio = removed_ratio
+        self.start_date = start_date
+        self.days = days
+        self.seed = seed
+        self.calls = {endpoint: 0 for endpoint in RECORDED_ENDPOINTS}
+
+    def _transaction(self, index: int) -> dict:
+        return generate_transaction(index, self.account_ids, self.start_date, self.days, self.seed)
+
+    def transactions_sync(self, request, **kwargs):
+        self.calls["transactions_sync"] += 1
+        offset = int(request.cursor or 0)
+        end = min(self.total, offset + self.page_size)
+        rng = random.Random(f"{self.seed}:page:{offset}")
+
+        modified, removed = [], []
+        if offset > 0:
+            for _ in range(int((end - offset) * self.modified_ratio)):
+                tx = self._transaction(rng.randrange(offset))
+                tx["amount"] = round(tx["amount"] * rng.uniform(0.9, 1.1), 2)
+                tx["pending"] = False
+                modified.append(tx)
+            for _ in range(int((end - offset) * self.removed_ratio)):
+                removed.append({"transaction_id": self._transaction(rng.randrange(offset))["transaction_id"]})
+
+        return {
+            "added": [self._transaction(index) for index in range(offset, end)],
+            "modified": modified,
+            "removed": removed,
+            "next_cursor": str(end),
+            "has_more": end < self.total,
+            "accounts": [{"account_id": account_id} for account_id in self.account_ids],
+        }
+
+    def item_get(self, request, **kwargs):
+        self.calls["item_get"] += 1
+        return {"item": {"item_id": self.item_id, "error": None}}
+
+    def accounts_get(self, request, **kwargs):
+        self.calls["accounts_get"] += 1
+        return {
+            "item": {"item_id": self.item_id},
+            "accounts": [
+                {"account_id": account_id, "name": account_id.title(), "official_name": None, "type": "depository"}
+                for account_id in self.account_ids
+            ],
+        }
+
+
+def record_fixtures(fixture_dir: str) -> None:
+    """Run one full sync and accounts fetch per registered item through the recorder"""
+    from src.database.db import get_db
+    from src.services.plaid_client import get_plaid_client, set_plaid_client
+    from src.services.item_registry import list_items
+    from src.services.transaction_sync import run_transaction_sync
+    from src.api.plaid.router import store_accounts
+
+    set_plaid_client(RecordingPlaidClient(get_plaid_client(), fixture_dir))
+    db = next(get_db())
+    try:
+        for item in list_items(db):
+            store_accounts(item.access_token, db, item.item_id)
+            print(f"{item.item_id}: {run_transaction_sync(db, item.item_id, item.access_token)}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "record":
+        record_fixtures(sys.argv[2])
+    else:
+        print(__doc__)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Check that sync keeps balance_checkpoints equal to a rebuild when pages add,
+modify and remove transactions dated in past months, and that a rebuild
+moves the account's data_version on, so cached asset history does too
+
+Needs a database migrated to head. Everything runs in one transaction that
+is rolled back at the end.
+"""
+import sys
+import os
+from datetime import date
+from decimal import Decimal
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.plaid_item import PlaidItem  # noqa: F401 (accounts.item_id references it)
+from src.models.balance_checkpoint import BalanceCheckpoint
+from src.services.balance_checkpoints import rebuild_checkpoints, latest_checkpoint
+from src.services.transaction_ingest import IngestStats, apply_sync_page
+from tests.factories import page, tx
+
+ACCOUNT_ID = "checkpoint-test-account"
+
+
+def checkpoints(db) -> list[tuple]:
+    return [
+        (row.checkpoint_date, row.balance)
+        for row in db.query(BalanceCheckpoint)
+        .filter(BalanceCheckpoint.account_id == ACCOUNT_ID)
+        .order_by(BalanceCheckpoint.checkpoint_date)
+    ]
+
+
+def test_sync_keeps_checkpoints_equal_to_rebuild():
+    db = SessionLocal()
+    try:
+        db.add(Account(account_id=ACCOUNT_ID, account_name="Checkpoint test"))
+        db.flush()
+        known = {ACCOUNT_ID}
+        stats = IngestStats()
+
+        # Recent history first, as an initial sync may deliver it
+        apply_sync_page(db, page(added=[tx(ACCOUNT_ID, "pay", date(2024, 3, 15), -2000), tx(ACCOUNT_ID, "rent", date(2024, 4, 1), 1500)]), known, stats)
+        assert checkpoints(db)[0] == (date(2024, 3, 31), Decimal("2000.00"))
+
+        # Older transactions arrive later and must be covered from their month on
+        apply_sync_page(db, page(added=[tx(ACCOUNT_ID, "old", date(2023, 11, 20), -100)]), known, stats)
+        assert checkpoints(db)[0] == (date(2023, 11, 30), Decimal("100.00"))
+
+        # Backdated modification and removal shift every later checkpoint
+        apply_sync_page(db, page(
+            modified=[{"transaction_id": f"{ACCOUNT_ID}-pay", "account_id": ACCOUNT_ID, "amount": -2500, "pending": False}],
+            removed=[{"transaction_id": f"{ACCOUNT_ID}-old"}],
+        ), known, stats)
+
+        maintained = dict(checkpoints(db))
+        rebuild_checkpoints(db, [ACCOUNT_ID])
+        rebuilt = dict(checkpoints(db))
+        assert rebuilt.keys() <= maintained.keys()
+        assert {day: balance for day, balance in maintained.items() if day in rebuilt} == rebuilt
+        # A rebuild starts at the first remaining transaction; sync keeps the zero months before it
+        assert all(balance == 0 for day, balance in maintained.items() if day not in rebuilt)
+        assert latest_checkpoint(db, ACCOUNT_ID, date(2024, 4, 30)).balance == Decimal("1000.00")
+    finally:
+        db.rollback()
+        db.close()
+
+
+def test_rebuild_bumps_data_version():
+    db = SessionLocal()
+    try:
+        db.add(Account(account_id=ACCOUNT_ID, account_name="Checkpoint test"))
+        db.flush()
+        apply_sync_page(db, page(added=[tx(ACCOUNT_ID, "rent", date(2024, 3, 1), 1500)]), {ACCOUNT_ID}, IngestStats())
+        before = db.get(Account, ACCOUNT_ID).data_version
+
+        assert rebuild_checkpoints(db, [ACCOUNT_ID]) == [ACCOUNT_ID]
+        db.expire_all()
+        assert db.get(Account, ACCOUNT_ID).data_version == before + 1
+        assert ACCOUNT_ID in rebuild_checkpoints(db)
+        db.expire_all()
+        assert db.get(Account, ACCOUNT_ID).data_version == before + 2
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    test_sync_keeps_checkpoints_equal_to_rebuild()
+    test_rebuild_bumps_data_version()
+    print("balance checkpoint tests passed")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Property tests: the linear-time balance history must match the original
+per-period implementation, copied below as the reference, on seeded random
+ledgers for every granularity
+"""
+import sys
+import os
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api.assets.router import BalanceHistoryItem, _balance_periods, _calculate_balance_history
+
+SEEDS = range(40)
+
+
+# The original quadratic helpers from src/api/assets/router.py, verbatim
+def reference_monthly_balance(transactions, start_date: date, end_date: date) -> list[BalanceHistoryItem]:
+    """Calculate balance history grouped by month"""
+    from calendar import monthrange
+
+    history = []
+    current_date = start_date.replace(day=1)
+
+    while current_date <= end_date:
+        # Period boundaries
+        period_start = current_date
+        last_day = monthrange(current_date.year, current_date.month)[1]
+        period_end = current_date.replace(day=last_day)
+
+        # Calculate balance at end of period
+        # Negate amounts because Plaid uses positive for expenses, negative for income
+        balance_at_period_end = sum(
+            -float(t.amount) for t in transactions
+            if t.transaction_date <= period_end
+        )
+
+        # Calculate balance at end of previous period
+        prev_month = current_date.month - 1 if current_date.month > 1 else 12
+        prev_year = current_date.year if current_date.month > 1 else current_date.year - 1
+        prev_last_day = monthrange(prev_year, prev_month)[1]
+        prev_period_end = date(prev_year, prev_month, prev_last_day)
+
+        balance_at_prev_period_end = sum(
+            -float(t.amount) for t in transactions
+            if t.transaction_date <= prev_period_end
+        )
+
+        # Calculate change
+        change = balance_at_period_end - balance_at_prev_period_end
+        change_pct = (change / balance_at_prev_period_end * 100) if balance_at_prev_period_end != 0 else 0
+
+        history.append(BalanceHistoryItem(
+            period=current_date.strftime("%Y-%m"),
+            period_start=period_start.isoformat(),
+            period_end=period_end.isoformat(),
+            balance=round(balance_at_period_end, 2),
+            change=round(change, 2),
+            change_pct=round(change_pct, 2)
+        ))
+
+        # Move to next month
+        if current_date.month == 12:
+            current_date = current_date.replace(year=current_date.year + 1, month=1)
+        else:
+            current_date = current_date.replace(month=current_date.month + 1)
+
+    return history
+
+def reference_weekly_balance(transactions, start_date: date, end_date: date) -> list[BalanceHistoryItem]:
+    """Calculate balance history grouped by week"""
+    from datetime import timedelta
+
+    history = []
+    current_date = start_date - timedelta(days=start_date.weekday())  # Start from Monday
+
+    while current_date <= end_date:
+        period_start = current_date
+        period_end = current_date + timedelta(days=6)  # Sunday
+
+        # Calculate balance at end of period
+        # Negate amounts because Plaid uses positive for expenses, negative for income
+        balance_at_period_end = sum(
+            -float(t.amount) for t in transactions
+            if t.transaction_date <= period_end
+        )
+
+        # Calculate balance at end of previous period
+        prev_period_end = period_start - timedelta(days=1)
+        balance_at_prev_period_end = sum(
+            -float(t.amount) for t in transactions
+            if t.transaction_date <= prev_period_end
+        )
+
+        # Calculate change
+        change = balance_at_period_end - balance_at_prev_period_end
+        change_pct = (change / balance_at_prev_period_end * 100) if balance_at_prev_period_end != 0 else 0
+
+        history.append(BalanceHistoryItem(
+            period=f"{period_start.strftime('%Y-W%W')}",
+            period_start=period_start.isoformat(),
+            period_end=period_end.isoformat(),
+            balance=round(balance_at_period_end, 2),
+            change=round(change, 2),
+            change_pct=round(change_pct, 2)
+        ))
+
+        # Move to next week
+        current_date += timedelta(days=7)
+
+    return history
+
+def reference_daily_balance(transactions, start_date: date, end_date: date) -> list[BalanceHistoryItem]:
+    """Calculate balance history grouped by day"""
+    from datetime import timedelta
+
+    history = []
+    current_date = start_date
+
+    while current_date <= end_date:
+        # Calculate balance at end of day
+        # Negate amounts because Plaid uses positive for expenses, negative for income
+        balance_at_day_end = sum(
+            -float(t.amount) for t in transactions
+            if t.transaction_date <= current_date
+        )
+
+        # Calculate balance at end of previous day
+        prev_date = current_date - timedelta(days=1)
+        balance_at_prev_day_end = sum(
+            -float(t.amount) for t in transactions
+            if t.transaction_date <= prev_date
+        )
+
+        # Calculate change
+        change = balance_at_day_end - balance_at_prev_day_end
+        change_pct = (change / balance_at_prev_day_end * 100) if balance_at_prev_day_end != 0 else 0
+
+        history.append(BalanceHistoryItem(
+            period=current_date.isoformat(),
+            period_start=current_date.isoformat(),
+            period_end=current_date.isoformat(),
+            balance=round(balance_at_day_end, 2),
+            change=round(change, 2),
+            change_pct=round(change_pct, 2)
+        ))
+
+        # Move to next day
+        current_date += timedelta(days=1)
+
+    return history
+
+
+REFERENCES = {
+    "month": reference_monthly_balance,
+    "week": reference_weekly_balance,
+    "day": reference_daily_balance,
+}
+
+
+def random_ledger(rng: random.Random) -> list:
+    """Oldest-first rows shaped like daily_amounts(): one net Plaid amount per day"""
+    first_day = date(2020, 1, 1) + timedelta(days=rng.randrange(1500))
+    days = sorted(rng.sample(range(900), rng.randrange(0, 300)))
+    rows = []
+    for offset in days:
+        # Mostly small spending, some paychecks, and sometimes a day that nets to zero
+        cents = rng.choice([rng.randrange(1, 20_000), -rng.randrange(100_000, 600_000), 0, rng.randrange(-10**8, 10**8)])
+        rows.append(SimpleNamespace(transaction_date=first_day + timedelta(days=offset), amount=Decimal(cents).scaleb(-2)))
+    return rows
+
+
+def random_range(rng: random.Random, transactions: list) -> tuple[date, date]:
+    anchor = transactions[rng.randrange(len(transactions))].transaction_date if transactions else date(2022, 6, 15)
+    start_date = anchor + timedelta(days=rng.randrange(-400, 200))
+    return start_date, start_date + timedelta(days=rng.randrange(0, 400))
+
+
+def check_granularity(granularity: str) -> None:
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        transactions = random_ledger(rng)
+        start_date, end_date = random_range(rng, transactions)
+        # The endpoint only ever passes transactions up to end_date
+        transactions = [t for t in transactions if t.transaction_date <= end_date]
+
+        expected = REFERENCES[granularity](transactions, start_date, end_date)
+        actual = _calculate_balance_history(transactions, _balance_periods(start_date, end_date, granularity))
+
+        assert actual == expected, f"{granularity} history differs for seed {seed}"
+
+
+def test_monthly_history_matches_reference():
+    check_granularity("month")
+
+
+def test_weekly_history_matches_reference():
+    check_granularity("week")
+
+
+def test_daily_history_matches_reference():
+    check_granularity("day")
+
+
+def test_empty_ledger_reports_zero_change():
+    history = _calculate_balance_history([], _balance_periods(date(2024, 1, 1), date(2024, 3, 31), "month"))
+    assert history == reference_monthly_balance([], date(2024, 1, 1), date(2024, 3, 31))
+    assert [(item.balance, item.change_pct) for item in history] == [(0, 0)] * 3
+
+
+if __name__ == "__main__":
+    test_monthly_history_matches_reference()
+    test_weekly_history_matches_reference()
+    test_daily_history_matches_reference()
+    test_empty_ledger_reports_zero_change()
+    print("balance history tests passed")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the numpy analytics engine on hand-built snapshots (no database needed)
+"""
+import sys
+import os
+from datetime import date, datetime
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from src.services.columnar_analytics import (
+    AccountSnapshot, _apply_changes, balances_at, pivot_snapshot, summarize_snapshot
+)
+
+LOADED_AT = datetime(2024, 2, 1)
+
+
+def make_snapshot(rows) -> AccountSnapshot:
+    """rows: (transaction_id, date, amount in cents, pending, primary category)"""
+    labels = sorted({row[4] for row in rows})
+    return AccountSnapshot(
+        account_id="acc-1",
+        data_version=1,
+        watermark=LOADED_AT,
+        transaction_ids=[row[0] for row in rows],
+        positions={row[0]: index for index, row in enumerate(rows)},
+        day=np.array([row[1].toordinal() for row in rows], dtype=np.int32),
+        cents=np.array([row[2] for row in rows], dtype=np.int64),
+        pending=np.array([row[3] for row in rows], dtype=bool),
+        live=np.ones(len(rows), dtype=bool),
+        primary=np.array([labels.index(row[4]) for row in rows], dtype=np.int32),
+        detailed=np.array([labels.index(row[4]) for row in rows], dtype=np.int32),
+        labels=labels,
+    )
+
+
+ROWS = [
+    ("t1", date(2024, 1, 5), -250000, False, "INCOME"),
+    ("t2", date(2024, 1, 6), 4599, False, "FOOD_AND_DRINK"),
+    ("t3", date(2024, 1, 31), 12010, True, "FOOD_AND_DRINK"),
+    ("t4", date(2024, 2, 2), 3333, False, "Uncategorized"),
+]
+
+
+def test_summary_groups_by_period_and_category():
+    summary = summarize_snapshot(make_snapshot(ROWS), group_by="month")
+
+    assert [p["period"] for p in summary["period_summaries"]] == ["2024-01", "2024-02"]
+    january = summary["period_summaries"][0]
+    assert (january["income"], january["expense"], january["transaction_count"]) == (2500.0, 166.09, 3)
+    assert january["net"] == 2333.91
+    assert [(c["category"], c["amount"]) for c in summary["category_summaries"]] == [
+        ("FOOD_AND_DRINK", 166.09), ("INCOME", -2500.0), ("Uncategorized", 33.33)
+    ]
+    assert summary["total_transactions"] == 4
+
+    without_pending = summarize_snapshot(make_snapshot(ROWS), group_by="all", include_pending=False)
+    assert without_pending["period_summaries"][0]["expense"] == 79.32
+
+
+def test_pivot_cells_and_totals():
+    pivot = pivot_snapshot(make_snapshot(ROWS), start_date=date(2024, 1, 6), group_by="month")
+
+    assert pivot["periods"] == ["2024-01", "2024-02"]
+    assert pivot["categories"] == ["FOOD_AND_DRINK", "Uncategorized"]
+    assert pivot["amounts"] == [[166.09, 0.0], [0.0, 33.33]]
+    assert pivot["counts"] == [[2, 0], [0, 1]]
+    assert pivot["grand_total"] == 199.42
+
+
+def test_balances_at_negate_plaid_amounts():
+    snapshot = make_snapshot(ROWS)
+    assert balances_at(snapshot, [date(2024, 1, 4), date(2024, 1, 6), date(2024, 12, 31)]) == [0.0, 2454.01, 2300.58]
+
+
+def test_apply_changes_overwrites_appends_and_removes():
+    snapshot = make_snapshot(ROWS)
+    changes = [
+        SimpleNamespace(transaction_id="t2", day=date(2024, 1, 6).toordinal(), cents=1000, pending=False,
+                        primary="FOOD_AND_DRINK", detailed="FOOD_AND_DRINK", is_removed=False),
+        SimpleNamespace(transaction_id="t4", day=date(2024, 2, 2).toordinal(), cents=3333, pending=False,
+                        primary="Uncategorized", detailed="Uncategorized", is_removed=True),
+        SimpleNamespace(transaction_id="t5", day=date(2024, 2, 3).toordinal(), cents=700, pending=False,
+                        primary="TRAVEL", detailed="TRAVEL", is_removed=False),
+        SimpleNamespace(transaction_id="gone", day=date(2024, 2, 3).toordinal(), cents=1, pending=False,
+                        primary="TRAVEL", detailed="TRAVEL", is_removed=True),
+    ]
+
+    refreshed = _apply_changes(snapshot, datetime(2024, 2, 4), changes, data_version=2)
+
+    assert refreshed.transaction_ids == ["t1", "t2", "t3", "t4", "t5"]
+    assert refreshed.live.tolist() == [True, True, True, False, True]
+    assert refreshed.data_version == 2 and refreshed.watermark == datetime(2024, 2, 4)
+    summary = summarize_snapshot(refreshed, group_by="all")
+    assert [(c["category"], c["amount"]) for c in summary["category_summaries"]] == [
+        ("FOOD_AND_DRINK", 130.1), ("INCOME", -2500.0), ("TRAVEL", 7.0)
+    ]
+    # The original snapshot is left untouched for readers still holding it
+    assert snapshot.cents.tolist()[1] == 4599 and snapshot.live.all()
+
+
+if __name__ == "__main__":
+    test_summary_groups_by_period_and_category()
+    test_pivot_cells_and_totals()
+    test_balances_at_negate_plaid_amounts()
+    test_apply_changes_overwrites_appends_and_removes()
+    print("columnar analytics tests passed")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test maintenance of daily_account_category_rollups: sync pages that add,
+modify, move between accounts, remove and re-add transactions leave exactly
+the table a rebuild from the ledger produces, and a rebuild moves the
+rebuilt accounts' data_version on, so cached analytics and ETags do too
+
+Needs a database migrated to head. Everything runs in one transaction that
+is rolled back at the end.
+"""
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.daily_rollup import DailyAccountCategoryRollup as Rollup
+from src.models.plaid_item import PlaidItem  # noqa: F401 (accounts.item_id references it)
+from src.services.daily_rollups import rebuild_rollups
+from src.services.transaction_ingest import IngestStats, apply_sync_page
+from tests.factories import page, tx
+
+CHEQUING = "rollup-test-chequing"
+SAVINGS = "rollup-test-savings"
+ACCOUNT_IDS = [CHEQUING, SAVINGS]
+SEEDS = range(5)
+CATEGORIES = [(None, None), ("FOOD_AND_DRINK", "FOOD_AND_DRINK_GROCERIES"), ("FOOD_AND_DRINK", "FOOD_AND_DRINK_RESTAURANT"), ("INCOME", "INCOME_WAGES")]
+
+
+def random_transaction(rng: random.Random, index: int) -> dict:
+    primary, detailed = rng.choice(CATEGORIES)
+    return tx(
+        rng.choice(ACCOUNT_IDS), str(index), date(2024, 1, 1) + timedelta(days=rng.randrange(60)), rng.randrange(-50_000, 20_000) / 100,
+        primary, detailed, pending=rng.random() < 0.3, transaction_id=f"rollup-test-{index}",
+    )
+
+
+def random_page(rng: random.Random, known: dict) -> dict:
+    """Adds (some re-adding removed ids with a new date or category), modifies
+    (amount, pending and account) and removes, each id at most once per page"""
+    ids = list(known)
+    rng.shuffle(ids)
+    modified = [
+        dict(known[transaction_id], account_id=rng.choice(ACCOUNT_IDS), amount=rng.randrange(-50_000, 20_000) / 100, pending=rng.random() < 0.3)
+        for transaction_id in ids[:rng.randrange(len(ids) // 3 + 1)]
+    ]
+    removed = [{"transaction_id": transaction_id} for transaction_id in ids[len(modified):len(modified) + rng.randrange(len(ids) // 4 + 1)]]
+    re_added = [
+        dict(random_transaction(rng, 0), transaction_id=transaction_id)
+        for transaction_id in ids[len(modified) + len(removed):][:rng.randrange(5)]
+    ]
+    added = [random_transaction(rng, len(known) + index) for index in range(rng.randrange(5, 40))] + re_added
+    return page(added, modified, removed)
+
+
+def rollup_rows(db) -> list[tuple]:
+    return [
+        (row.account_id, row.rollup_date, row.category_primary, row.category_detailed, row.pending, row.income, row.expense, row.transaction_count)
+        for row in db.query(Rollup).filter(Rollup.account_id.in_(ACCOUNT_IDS)).order_by(
+            Rollup.account_id, Rollup.rollup_date, Rollup.category_primary, Rollup.category_detailed, Rollup.pending
+        )
+    ]
+
+
+def test_incremental_rollups_match_rebuild():
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        db = SessionLocal()
+        try:
+            for account_id in ACCOUNT_IDS:
+                db.add(Account(account_id=account_id, account_name=account_id))
+            db.flush()
+            known = {}
+            for _ in range(6):
+                page = random_page(rng, known)
+                apply_sync_page(db, page, set(ACCOUNT_IDS), IngestStats())
+                for transaction in page["added"] + page["modified"]:
+                    known[transaction["transaction_id"]] = {**known.get(transaction["transaction_id"], {}), **transaction}
+
+            incremental = rollup_rows(db)
+            assert incremental, seed
+            rebuild_rollups(db, ACCOUNT_IDS)
+            assert rollup_rows(db) == incremental, seed
+        finally:
+            db.rollback()
+            db.close()
+
+
+def data_versions(db) -> dict[str, int]:
+    db.expire_all()
+    return {account.account_id: account.data_version for account in db.query(Account).filter(Account.account_id.in_([CHEQUING, SAVINGS]))}
+
+
+def test_rebuild_bumps_data_version():
+    db = SessionLocal()
+    try:
+        for account_id in (CHEQUING, SAVINGS):
+            db.add(Account(account_id=account_id, account_name=account_id))
+        db.flush()
+        apply_sync_page(db, page(added=[tx(CHEQUING, "rent", date(2024, 3, 1), 1500)]), {CHEQUING, SAVINGS}, IngestStats())
+        before = data_versions(db)
+
+        assert rebuild_rollups(db, [CHEQUING]) == [CHEQUING]
+        assert data_versions(db) == {CHEQUING: before[CHEQUING] + 1, SAVINGS: before[SAVINGS]}
+
+        # Rebuilding everything bumps every account
+        assert {CHEQUING, SAVINGS} <= set(rebuild_rollups(db))
+        assert data_versions(db) == {CHEQUING: before[CHEQUING] + 2, SAVINGS: before[SAVINGS] + 1}
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    test_incremental_rollups_match_rebuild()
+    test_rebuild_bumps_data_version()
+    print("daily rollup tests passed")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test ETags and If-None-Match on GET /transactions: strong tags, weak and
+list matches, "*", the sparse fields= response, and a new tag once the
+account's data_version moves
+
+Needs a database migrated to head. Requests read committed data, so the
+account "etag-test" is committed and deleted before and after.
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from src.main import app
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.services.data_events import bump_data_versions
+from src.utils.auth import create_access_token
+
+ACCOUNT_ID = "etag-test"
+
+
+def reset_test_data(db) -> None:
+    db.query(Account).filter(Account.account_id == ACCOUNT_ID).delete(synchronize_session=False)
+    db.commit()
+
+
+def test_if_none_match():
+    db = SessionLocal()
+    try:
+        reset_test_data(db)
+        db.add(Account(account_id=ACCOUNT_ID, account_name="ETag test"))
+        db.commit()
+
+        client = TestClient(app)
+        auth = {"Authorization": f"Bearer {create_access_token({'sub': 'etag-test'})[0]}"}
+        params = {"account_id": ACCOUNT_ID, "count_strategy": "none"}
+
+        def get(if_none_match=None, **extra):
+            headers = dict(auth, **({"If-None-Match": if_none_match} if if_none_match else {}))
+            return client.get("/transactions", params={**params, **extra}, headers=headers)
+
+        first = get()
+        etag = first.headers["ETag"]
+        assert first.status_code == 200
+        assert etag.startswith('"') and etag.endswith('"')  # strong
+        assert get().headers["ETag"] == etag
+        # The query string is part of the tag
+        assert get(limit=10).headers["ETag"] != etag
+
+        for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+            response = get(if_none_match)
+            assert response.status_code == 304, if_none_match
+            assert response.headers["ETag"] == etag
+            assert response.content == b""
+        assert get('"stale"').status_code == 200
+
+        # The sparse fields= path returns its own Response and keeps the one ETag
+        sparse = get(fields="transaction_id,amount")
+        assert sparse.status_code == 200 and sparse.headers.get_list("ETag") == [sparse.headers["ETag"]]
+        assert get(sparse.headers["ETag"], fields="transaction_id,amount").status_code == 304
+
+        # A sync commit bumps data_version: the old tag no longer matches
+        bump_data_versions(db, [ACCOUNT_ID])
+        db.commit()
+        changed = get(etag)
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert get(changed.headers["ETag"]).status_code == 304
+    finally:
+        db.rollback()
+        reset_test_data(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    test_if_none_match()
+    print("etag tests passed")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Check that the net-worth series match per-account asset history and add up
+to the total, with one account opening at a month-end checkpoint
+
+Needs a database migrated to head. Everything runs in one transaction that
+is rolled back at the end.
+"""
+import sys
+import os
+from datetime import date
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.plaid_item import PlaidItem  # noqa: F401 (accounts.item_id references it)
+from src.api.assets.router import _compute_asset_history, _compute_net_worth
+from src.services.analytics_cache import analytics_cache
+from src.services.balance_checkpoints import rebuild_checkpoints
+from src.services.transaction_ingest import IngestStats, apply_sync_page
+from tests.factories import page, tx
+
+CHEQUING = "net-worth-test-chequing"
+CREDIT_CARD = "net-worth-test-credit"
+EMPTY = "net-worth-test-empty"
+
+
+def test_net_worth_adds_up_account_histories():
+    db = SessionLocal()
+    try:
+        for account_id in (CHEQUING, CREDIT_CARD, EMPTY):
+            db.add(Account(account_id=account_id, account_name=account_id))
+        db.flush()
+        apply_sync_page(db, page(added=[
+            tx(CHEQUING, "pay", date(2024, 1, 15), -3000),
+            tx(CHEQUING, "rent", date(2024, 3, 1), 1500),
+            tx(CREDIT_CARD, "groceries", date(2024, 2, 10), 250.25),
+            tx(CREDIT_CARD, "payment", date(2024, 3, 20), -250.25),
+            tx(CREDIT_CARD, "later", date(2024, 5, 2), 80),
+        ]), {CHEQUING, CREDIT_CARD}, IngestStats())
+        rebuild_checkpoints(db, [CHEQUING])
+        accounts = db.query(Account).filter(Account.account_id.in_([CHEQUING, CREDIT_CARD, EMPTY])).order_by(Account.account_id).all()
+
+        analytics_cache.clear()
+        net_worth = _compute_net_worth(db, accounts, date(2024, 2, 1), date(2024, 4, 30), "month")
+
+        assert [series.account_id for series in net_worth.accounts] == [CHEQUING, CREDIT_CARD, EMPTY]
+        assert [(item.period, item.balance, item.change) for item in net_worth.balance_history] == [
+            ("2024-02", 2749.75, -250.25), ("2024-03", 1500.0, -1249.75), ("2024-04", 1500.0, 0.0)
+        ]
+        assert net_worth.current_balance == 1500.0
+        for series in net_worth.accounts:
+            expected = _compute_asset_history(db, series.account_id, date(2024, 2, 1), date(2024, 4, 30), "month")
+            assert series.balance_history == expected.balance_history
+            assert series.current_balance == expected.current_balance
+
+        # Served from the per-account cache the second time
+        assert _compute_net_worth(db, accounts, date(2024, 2, 1), date(2024, 4, 30), "month") == net_worth
+    finally:
+        analytics_cache.clear()
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    test_net_worth_adds_up_account_histories()
+    print("net worth tests passed")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test the keyset cursor helpers behind GET /transactions/ (no database needed)
+"""
+import sys
+import os
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import HTTPException
+from src.utils.pagination import encode_cursor, decode_cursor, next_cursor_for
+
+
+def row(transaction_id: str, transaction_date: date, amount: str):
+    return SimpleNamespace(transaction_id=transaction_id, transaction_date=transaction_date, amount=Decimal(amount))
+
+
+def assert_rejected(cursor: str, sort_by: str, sort_order: str, detail: str):
+    try:
+        decode_cursor(cursor, sort_by, sort_order)
+        assert False, "cursor should have been rejected"
+    except HTTPException as e:
+        assert e.status_code == 400
+        assert e.detail == detail
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("transaction_date", "desc", date(2024, 2, 29), "txn-1")
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "transaction_date", "desc") == (date(2024, 2, 29), "txn-1")
+
+    # Amounts come back as exact Decimals, not floats
+    cursor = encode_cursor("amount", "asc", Decimal("-12.30"), "txn-2")
+    value, transaction_id = decode_cursor(cursor, "amount", "asc")
+    assert (value, transaction_id) == (Decimal("-12.30"), "txn-2")
+    assert isinstance(value, Decimal)
+
+
+def test_cursor_rejects_other_sort():
+    cursor = encode_cursor("transaction_date", "desc", date(2024, 1, 1), "txn-1")
+    assert_rejected(cursor, "transaction_date", "asc", "Cursor does not match sort_by/sort_order")
+    assert_rejected(cursor, "amount", "desc", "Cursor does not match sort_by/sort_order")
+    assert_rejected("not a cursor", "transaction_date", "desc", "Invalid cursor")
+
+
+def test_next_cursor_needs_the_extra_row():
+    rows = [row(f"txn-{i}", date(2024, 1, 10 - i), f"{i}.00") for i in range(4)]
+
+    # limit + 1 rows fetched: there is a next page, and it starts after rows[limit - 1]
+    cursor = next_cursor_for(rows, 3, "transaction_date", "desc")
+    assert decode_cursor(cursor, "transaction_date", "desc") == (date(2024, 1, 8), "txn-2")
+
+    # Exactly limit rows, or fewer: last page
+    assert next_cursor_for(rows[:3], 3, "transaction_date", "desc") is None
+    assert next_cursor_for(rows[:2], 3, "transaction_date", "desc") is None
+
+    # Sort columns without a keyset stay on offset pagination
+    assert next_cursor_for(rows, 3, "merchant_name", "desc") is None
+
+
+if __name__ == "__main__":
+    test_cursor_round_trip()
+    test_cursor_rejects_other_sort()
+    test_next_cursor_needs_the_extra_row()
+    print("pagination tests passed")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test that the Plaid gateway's rate limits apply per item: one item using up
+its /transactions/sync budget does not slow down another
+"""
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from plaid.model.transactions_sync_request import TransactionsSyncRequest
+from src.config.settings import settings
+from src.services import plaid_gateway
+from src.services.plaid_client import get_plaid_client, set_plaid_client
+
+
+class CountingPlaidClient:
+    def __init__(self):
+        self.calls = []
+
+    def transactions_sync(self, request, **kwargs):
+        self.calls.append(request.access_token)
+        return {"added": [], "modified": [], "removed": [], "next_cursor": "", "has_more": False}
+
+
+def test_items_do_not_share_a_budget():
+    original_client, original_buckets = get_plaid_client(), dict(plaid_gateway._buckets)
+    rate_limit_enabled = settings.PLAID_RATE_LIMIT_ENABLED
+    settings.PLAID_RATE_LIMIT_ENABLED = True
+    plaid_gateway._buckets.clear()
+    client = CountingPlaidClient()
+    set_plaid_client(client)
+    try:
+        burst = plaid_gateway.ENDPOINT_BUDGETS["transactions_sync"][1]
+        started = time.monotonic()
+        for access_token in ("access-item-1", "access-item-2"):
+            for _ in range(burst):
+                plaid_gateway.call_plaid("transactions_sync", TransactionsSyncRequest(access_token=access_token))
+        # A shared bucket would have made the second item wait over a second per call
+        assert time.monotonic() - started < 1.0
+        assert len(client.calls) == 2 * burst
+
+        first = plaid_gateway._get_bucket("transactions_sync", "access-item-1")
+        second = plaid_gateway._get_bucket("transactions_sync", "access-item-2")
+        assert first is not second
+        assert first.tokens < 1 and second.tokens < 1
+        # A third item starts with a full burst
+        assert plaid_gateway._get_bucket("transactions_sync", "access-item-3").tokens == burst
+    finally:
+        set_plaid_client(original_client)
+        settings.PLAID_RATE_LIMIT_ENABLED = rate_limit_enabled
+        plaid_gateway._buckets.clear()
+        plaid_gateway._buckets.update(original_buckets)
+
+
+if __name__ == "__main__":
+    test_items_do_not_share_a_budget()
+    print("plaid gateway tests passed")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Check that the list query is served by the partial composite index
+idx_transactions_account_date_live (migration 5d2e8a4c1b07), and that the
+statements the summary and asset-history endpoints run read the daily
+rollups and balance checkpoints through their primary keys
+
+Needs a database migrated to head. Three years of daily transactions for
+40 accounts are written and ANALYZEd in one transaction, so the planner
+works from realistic statistics with every scan type allowed; everything is
+rolled back at the end.
+"""
+import sys
+import os
+from datetime import date
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import event, text
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.balance_checkpoint import BalanceCheckpoint
+from src.models.daily_rollup import DailyAccountCategoryRollup as Rollup
+from src.models.plaid_item import PlaidItem  # noqa: F401 (accounts.item_id references it)
+from src.models.transaction import Transaction
+from src.api.assets.router import _compute_asset_history
+from src.services.balance_checkpoints import rebuild_checkpoints
+from src.services.daily_rollups import rebuild_rollups
+from src.services.transaction_queries import filtered_transactions
+from src.services.transaction_summary import summarize_transactions
+
+ACCOUNT_IDS = [f"plan-check-{index:02d}" for index in range(40)]
+ACCOUNT_ID = ACCOUNT_IDS[7]
+DAYS = 3 * 365  # from 2022-01-01
+SCAN_INDEXES = {
+    Transaction.__tablename__: "idx_transactions_account_date_live",
+    Rollup.__tablename__: "daily_account_category_rollups_pkey",
+    BalanceCheckpoint.__tablename__: "balance_checkpoints_pkey",
+}
+INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Heap Scan")
+
+
+def seed(db) -> None:
+    """One transaction a day per account across eight categories, then rollups, checkpoints and statistics"""
+    db.add_all([Account(account_id=account_id, account_name=account_id) for account_id in ACCOUNT_IDS])
+    db.flush()
+    db.execute(text(
+        f"INSERT INTO {Transaction.__table__.fullname} (transaction_id, account_id, amount, transaction_date, "
+        "personal_finance_category_primary, personal_finance_category_detailed, pending, is_removed) "
+        "SELECT account_id || '-' || day, account_id, ((day * 37) % 500 - 120)::numeric / 4, date '2022-01-01' + day, "
+        "'CATEGORY_' || (day % 8), 'CATEGORY_' || (day % 8) || '_' || (day % 3), day % 10 = 0, false "
+        "FROM unnest(CAST(:account_ids AS text[])) AS account_id, generate_series(0, :last_day) AS day"
+    ), {"account_ids": ACCOUNT_IDS, "last_day": DAYS - 1})
+    rebuild_rollups(db, ACCOUNT_IDS)
+    rebuild_checkpoints(db, ACCOUNT_IDS)
+    for model in (Transaction, Rollup, BalanceCheckpoint):
+        db.execute(text(f"ANALYZE {model.__table__.fullname}"))
+
+
+def executed_statements(db, action) -> list[tuple[str, dict]]:
+    """(SQL, parameters) of every statement ``action`` sends on the session's connection"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        action()
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
+    return statements
+
+
+def explain(db, statement: str, parameters) -> dict:
+    """Return the root plan node of EXPLAIN (FORMAT JSON) for a SQL statement"""
+    return db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]["Plan"]
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def table_scans(plan: dict) -> dict[str, set]:
+    """Table name -> (scan node type, index name) pairs the plan reads it with"""
+    scans = {}
+    for node in plan_nodes(plan):
+        if "Relation Name" not in node:
+            continue
+        if node["Node Type"] == "Bitmap Heap Scan":
+            indexes = {child["Index Name"] for child in plan_nodes(node) if child["Node Type"] == "Bitmap Index Scan"}
+        else:
+            indexes = {node.get("Index Name")}
+        scans.setdefault(node["Relation Name"], set()).update((node["Node Type"], index) for index in indexes)
+    return scans
+
+
+def indexed_scans(table: str) -> set:
+    return {(scan, SCAN_INDEXES[table]) for scan in INDEX_SCANS}
+
+
+def assert_indexed(db, statements: list, tables: set) -> None:
+    """Every statement reads the seeded tables only through their expected index, and reads all of ``tables``"""
+    read = set()
+    for statement, parameters in statements:
+        for table, scans in table_scans(explain(db, statement, parameters)).items():
+            if table in SCAN_INDEXES:
+                assert scans <= indexed_scans(table), (table, scans)
+                read.add(table)
+    assert read == tables
+
+
+def test_list_query_uses_live_index_without_sort():
+    db = SessionLocal()
+    try:
+        seed(db)
+        query = (
+            filtered_transactions(db, ACCOUNT_ID, date(2023, 1, 1), date(2023, 12, 31))
+            .order_by(Transaction.transaction_date.desc(), Transaction.transaction_id.desc())
+            .limit(101)
+        )
+        compiled = query.statement.compile(dialect=db.bind.dialect)
+        plan = explain(db, str(compiled), compiled.params)
+        assert table_scans(plan)[Transaction.__tablename__] <= indexed_scans(Transaction.__tablename__)
+        # The index already yields rows in page order
+        assert all(node["Node Type"] != "Sort" for node in plan_nodes(plan))
+    finally:
+        db.rollback()
+        db.close()
+
+
+def test_summary_statements_use_rollup_key():
+    db = SessionLocal()
+    try:
+        seed(db)
+        statements = executed_statements(db, lambda: summarize_transactions(
+            db, ACCOUNT_ID, date(2023, 1, 1), date(2023, 12, 31), "month", include_pending=False
+        ))
+        assert_indexed(db, statements, {Rollup.__tablename__})
+    finally:
+        db.rollback()
+        db.close()
+
+
+def test_asset_history_statements_use_rollup_and_checkpoint_keys():
+    db = SessionLocal()
+    try:
+        seed(db)
+        statements = executed_statements(db, lambda: _compute_asset_history(
+            db, ACCOUNT_ID, date(2023, 6, 1), date(2024, 6, 30), "month"
+        ))
+        assert_indexed(db, statements, {Rollup.__tablename__, BalanceCheckpoint.__tablename__})
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    test_list_query_uses_live_index_without_sort()
+    test_summary_statements_use_rollup_key()
+    test_asset_history_statements_use_rollup_and_checkpoint_keys()
+    print("query plan tests passed")
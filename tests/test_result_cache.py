@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the account-scoped LRU result cache
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.result_cache import AccountScopedCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AccountScopedCache(max_entries=2)
+    cache.set("acc-1", "a", 1)
+    cache.set("acc-1", "b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("acc-2", "c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidation_drops_only_that_account():
+    cache = AccountScopedCache(max_entries=10)
+    cache.set("acc-1", "a", 1)
+    cache.set("acc-1", "b", 2)
+    cache.set("acc-2", "c", 3)
+
+    cache.invalidate_accounts({"acc-1"})
+
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = AccountScopedCache(max_entries=10)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"total": 42}
+
+    for _ in range(3):
+        assert cache.get_or_compute("acc-1", ("summary", "acc-1"), compute) == {"total": 42}
+
+    stats = cache.stats()
+    assert len(calls) == 1
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+
+
+if __name__ == "__main__":
+    test_least_recently_used_entry_is_evicted()
+    test_invalidation_drops_only_that_account()
+    test_get_or_compute_counts_hits_and_misses()
+    print("result cache tests passed")
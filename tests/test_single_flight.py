@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-flight guard used by /transactions/sync
+"""
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.single_flight import SingleFlight
+from src.services.transaction_ingest import IngestStats
+from src.services import transaction_sync
+
+
+def test_concurrent_callers_share_one_run():
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def slow_sync():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return {"synced_count": 42}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(flights.do, "item-1", slow_sync)
+        started.wait()
+        followers = [pool.submit(flights.do, "item-1", slow_sync) for _ in range(4)]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1
+    assert all(r == {"synced_count": 42} for r in results)
+    assert not flights.in_flight("item-1")
+
+
+def test_errors_propagate_to_waiting_callers():
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def failing_sync():
+        started.set()
+        time.sleep(0.1)
+        raise RuntimeError("plaid down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flights.do, "item-1", failing_sync)
+        started.wait()
+        follower = pool.submit(flights.do, "item-1", failing_sync)
+        for future in (leader, follower):
+            try:
+                future.result()
+                assert False, "expected RuntimeError"
+            except RuntimeError as e:
+                assert str(e) == "plaid down"
+
+
+def test_sequential_calls_run_again():
+    flights = SingleFlight()
+    calls = []
+
+    for _ in range(3):
+        flights.do("item-1", lambda: calls.append(1))
+
+    assert len(calls) == 3
+
+
+def test_joined_sync_reports_the_leaders_stats():
+    started = threading.Event()
+
+    def fake_run(db, item_id, access_token, stats):
+        started.set()
+        time.sleep(0.2)
+        stats.pages, stats.added, stats.modified = 3, 1200, 40
+        return {"sync_status": "success", "synced_count": 1200}
+
+    original_run, original_lock = transaction_sync.run_transaction_sync, transaction_sync.advisory_lock
+    transaction_sync.run_transaction_sync = fake_run
+    transaction_sync.advisory_lock = lambda key: nullcontext()
+    try:
+        leader_stats, follower_stats = IngestStats(), IngestStats()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(transaction_sync.sync_item_once, None, "item-1", "token", leader_stats)
+            started.wait()
+            follower = pool.submit(transaction_sync.sync_item_once, None, "item-1", "token", follower_stats)
+            results = [leader.result(), follower.result()]
+    finally:
+        transaction_sync.run_transaction_sync, transaction_sync.advisory_lock = original_run, original_lock
+
+    assert results[0] == results[1] == {"sync_status": "success", "synced_count": 1200}
+    # The follower's job shows the pages and rows of the run it joined
+    assert (follower_stats.pages, follower_stats.rows) == (leader_stats.pages, leader_stats.rows) == (3, 1240)
+
+
+def test_item_failure_outside_the_sync_is_reported():
+    def failing_lock(key):
+        raise RuntimeError("could not obtain lock")
+
+    original_lock = transaction_sync.advisory_lock
+    transaction_sync.advisory_lock = failing_lock
+    try:
+        result = transaction_sync._sync_item_in_new_session("item-1", "token", IngestStats())
+    finally:
+        transaction_sync.advisory_lock = original_lock
+
+    # Reported as a failed item, so pool.map in sync_all_items carries on
+    assert result == {"item_id": "item-1", "sync_status": "failed", "error": "could not obtain lock"}
+
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_one_run()
+    test_errors_propagate_to_waiting_callers()
+    test_sequential_calls_run_again()
+    test_joined_sync_reports_the_leaders_stats()
+    test_item_failure_outside_the_sync_is_reported()
+    print("single-flight tests passed")
@@ -12,6 +12,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.config.settings import settings
 from src.database.db import get_db
 from src.api.plaid.router import store_accounts
+from src.services.plaid_client import get_plaid_client, set_plaid_client
+from src.services.item_registry import register_item
+from tests.plaid_replay import SyntheticPlaidClient
 
 
 def test_store_accounts():
@@ -62,5 +65,33 @@ def test_store_accounts():
         db.close()
 
 
+def test_store_accounts_offline():
+    """Test store_accounts against SyntheticPlaidClient, no access token needed"""
+    from src.models.account import Account
+    from src.models.plaid_item import PlaidItem
+
+    fake = SyntheticPlaidClient(0, item_id="offline-item", account_ids=("offline-checking", "offline-credit"))
+    previous_client = get_plaid_client()
+    set_plaid_client(fake)
+
+    db_gen = get_db()
+    db: Session = next(db_gen)
+    try:
+        register_item(db, "offline-item", "offline-access-token")
+        db.commit()
+        store_accounts("offline-access-token", db)
+
+        accounts = db.query(Account).filter(Account.item_id == "offline-item").all()
+        assert sorted(a.account_id for a in accounts) == ["offline-checking", "offline-credit"]
+        assert fake.calls["accounts_get"] == 1
+    finally:
+        db.query(Account).filter(Account.item_id == "offline-item").delete(synchronize_session=False)
+        db.query(PlaidItem).filter(PlaidItem.item_id == "offline-item").delete(synchronize_session=False)
+        db.commit()
+        db.close()
+        set_plaid_client(previous_client)
+
+
 if __name__ == "__main__":
     test_store_accounts()
+    test_store_accounts_offline()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test the count strategies of GET /transactions/ and that cached exact
+counts follow the data_version of the accounts sync touches, including the
+account a modified transaction moves away from
+
+Needs a database migrated to head. Everything runs in one transaction that
+is rolled back at the end.
+"""
+import sys
+import os
+from datetime import date
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.plaid_item import PlaidItem  # noqa: F401 (accounts.item_id references it)
+from src.services.data_events import bump_data_versions, notify_accounts_changed
+from src.services.transaction_counts import count_transactions
+from src.services.transaction_ingest import IngestStats, apply_sync_page
+from src.services.transaction_queries import filtered_transactions
+from tests.factories import page, tx
+
+CHEQUING = "count-test-chequing"
+SAVINGS = "count-test-savings"
+# include_removed=True, so a removed transaction still counts where it is
+FILTER_KEY = (None, None, True, True)
+DAY = date(2024, 3, 1)
+
+
+def data_version(db, account_id: str) -> int:
+    db.expire_all()
+    return db.get(Account, account_id).data_version
+
+
+def exact_count(db, account_id: str) -> int:
+    query = filtered_transactions(db, account_id, include_removed=True)
+    total, estimated = count_transactions(db, query, "exact", account_id, data_version(db, account_id), FILTER_KEY)
+    assert not estimated
+    return total
+
+
+def test_count_strategies():
+    db = SessionLocal()
+    try:
+        db.add(Account(account_id=CHEQUING, account_name=CHEQUING))
+        db.flush()
+        apply_sync_page(db, page(added=[tx(CHEQUING, "a", DAY, 10), tx(CHEQUING, "b", DAY, 20)]), {CHEQUING}, IngestStats())
+        query = filtered_transactions(db, CHEQUING)
+
+        version = data_version(db, CHEQUING)
+        assert count_transactions(db, query, "none", CHEQUING, version, FILTER_KEY) == (None, False)
+        total, estimated = count_transactions(db, query, "estimated", CHEQUING, version, FILTER_KEY)
+        assert estimated and isinstance(total, int) and total >= 0
+        assert exact_count(db, CHEQUING) == 2
+    finally:
+        notify_accounts_changed([CHEQUING])
+        db.rollback()
+        db.close()
+
+
+def test_exact_counts_follow_synced_changes():
+    db = SessionLocal()
+    try:
+        for account_id in (CHEQUING, SAVINGS):
+            db.add(Account(account_id=account_id, account_name=account_id))
+        db.flush()
+        known = {CHEQUING, SAVINGS}
+        apply_sync_page(db, page(added=[tx(CHEQUING, "a", DAY, 10), tx(CHEQUING, "b", DAY, 20)]), known, IngestStats())
+        assert exact_count(db, CHEQUING) == 2
+
+        # Cached until the data_version of the accounts a page touched moves on;
+        # no in-process notification needed, as for a write from another process
+        touched = apply_sync_page(db, page(added=[tx(CHEQUING, "c", DAY, 30)]), known, IngestStats())
+        assert exact_count(db, CHEQUING) == 2
+        bump_data_versions(db, touched)
+        assert exact_count(db, CHEQUING) == 3
+
+        # A removed transaction has no rollup bucket, so only the update itself
+        # can report the account it leaves
+        bump_data_versions(db, apply_sync_page(db, page(removed=[{"transaction_id": f"{CHEQUING}-c"}]), known, IngestStats()))
+        assert exact_count(db, SAVINGS) == 0
+        touched = apply_sync_page(db, page(modified=[tx(SAVINGS, "c", DAY, 30, transaction_id=f"{CHEQUING}-c")]), known, IngestStats())
+        assert touched == {CHEQUING, SAVINGS}
+        bump_data_versions(db, touched)
+        assert (exact_count(db, CHEQUING), exact_count(db, SAVINGS)) == (2, 1)
+    finally:
+        notify_accounts_changed([CHEQUING, SAVINGS])
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    test_count_strategies()
+    test_exact_counts_follow_synced_changes()
+    print("transaction count tests passed")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test GET /transactions/export: every format decodes back to the stored rows,
+across several batches, and each filter selects the same transactions as the
+list endpoint
+
+Needs a database migrated to head. The export streams from its own session,
+so rows are committed under the account "export-test" and deleted before and
+after.
+"""
+import sys
+import os
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects.postgresql import insert
+from src.main import app
+from src.config.settings import settings
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.transaction import Transaction
+from src.services.transaction_export import EXPORT_COLUMNS, EXPORT_FIELDS, parquet_available
+from src.services.transaction_queries import filtered_transactions
+from src.utils.auth import create_access_token
+
+ACCOUNT_ID = "export-test"
+FILTERS = (
+    {},
+    {"include_removed": True},
+    {"include_pending": False},
+    {"start_date": "2024-01-10", "end_date": "2024-02-01"},
+    {"start_date": "2024-01-10", "include_removed": True, "include_pending": False},
+)
+
+
+def reset_test_data(db) -> None:
+    db.query(Transaction).filter(Transaction.account_id == ACCOUNT_ID).delete(synchronize_session=False)
+    db.query(Account).filter(Account.account_id == ACCOUNT_ID).delete(synchronize_session=False)
+    db.commit()
+
+
+def seed_test_data(db) -> None:
+    db.add(Account(account_id=ACCOUNT_ID, account_name="Export test"))
+    db.flush()
+    rows = [
+        # Same date twice: transaction_id orders them
+        ("b", Decimal("12.50"), date(2024, 1, 5), "Corner Store", False, False, "FOOD_AND_DRINK"),
+        ("a", Decimal("-2000.00"), date(2024, 1, 5), None, False, False, "INCOME"),
+        ("c", Decimal("45.99"), date(2024, 1, 10), 'Café, "Bistro"', True, False, None),
+        ("d", Decimal("0.01"), date(2024, 1, 20), "Line\nbreak", False, True, "GENERAL_MERCHANDISE"),
+        ("e", Decimal("300.00"), date(2024, 2, 1), "Landlord", False, False, "RENT_AND_UTILITIES"),
+        ("f", Decimal("-75.25"), date(2024, 2, 15), "Refund", True, True, None),
+    ]
+    db.execute(insert(Transaction), [{
+        "transaction_id": f"export-test-{suffix}",
+        "account_id": ACCOUNT_ID,
+        "amount": amount,
+        "transaction_date": day,
+        "merchant_name": merchant,
+        "name": suffix,
+        "pending": pending,
+        "personal_finance_category_primary": category,
+        "is_removed": removed,
+    } for suffix, amount, day, merchant, pending, removed, category in rows])
+    db.commit()
+
+
+def stored_rows(db, **filters) -> list:
+    return (
+        filtered_transactions(db, ACCOUNT_ID, **filters)
+        .with_entities(*EXPORT_COLUMNS)
+        .order_by(Transaction.transaction_date.asc(), Transaction.transaction_id.asc())
+        .all()
+    )
+
+
+def json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def export(client, headers, fmt: str, **filters) -> bytes:
+    response = client.get("/transactions/export", params={"account_id": ACCOUNT_ID, "format": fmt, **filters}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.content
+
+
+def test_export_formats_round_trip():
+    batch_size = settings.EXPORT_BATCH_SIZE
+    settings.EXPORT_BATCH_SIZE = 2  # six rows, three batches
+    db = SessionLocal()
+    try:
+        reset_test_data(db)
+        seed_test_data(db)
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'export-test'})[0]}"}
+        expected = stored_rows(db, include_removed=True)
+        assert len(expected) == 6
+
+        lines = export(client, headers, "ndjson", include_removed=True).splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {field: json_value(value) for field, value in zip(EXPORT_FIELDS, row)} for row in expected
+        ]
+
+        reader = csv.reader(io.StringIO(export(client, headers, "csv", include_removed=True).decode("utf-8")))
+        assert next(reader) == list(EXPORT_FIELDS)
+        assert list(reader) == [["" if value is None else str(value) for value in row] for row in expected]
+
+        if parquet_available():
+            import pyarrow.parquet as pq
+            table = pq.read_table(io.BytesIO(export(client, headers, "parquet", include_removed=True)))
+            assert table.column_names == list(EXPORT_FIELDS)
+            assert table.to_pylist() == [dict(zip(EXPORT_FIELDS, row)) for row in expected]
+    finally:
+        settings.EXPORT_BATCH_SIZE = batch_size
+        db.rollback()
+        reset_test_data(db)
+        db.close()
+
+
+def test_export_filters_match_the_list_endpoint():
+    db = SessionLocal()
+    try:
+        reset_test_data(db)
+        seed_test_data(db)
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'export-test'})[0]}"}
+
+        for filters in FILTERS:
+            listed = client.get("/transactions", params={
+                "account_id": ACCOUNT_ID, "sort_by": "transaction_date", "sort_order": "asc",
+                "limit": 100, "count_strategy": "none", **filters
+            }, headers=headers)
+            assert listed.status_code == 200, listed.text
+            listed_ids = [tx["transaction_id"] for tx in listed.json()["transactions"]]
+
+            exported_ids = [json.loads(line)["transaction_id"] for line in export(client, headers, "ndjson", **filters).splitlines()]
+            assert exported_ids == listed_ids, filters
+            assert exported_ids, filters
+    finally:
+        db.rollback()
+        reset_test_data(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    test_export_formats_round_trip()
+    test_export_filters_match_the_list_endpoint()
+    print("transaction export tests passed")
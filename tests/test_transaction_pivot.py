@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Check the GROUPING SETS pivot against hand-computed cells and against the
+columnar pivot_snapshot, including group_by="all", missing and empty
+categories, removed and pending rows, and a range with no transactions
+
+Needs a database migrated to head. Everything runs in one transaction that
+is rolled back at the end.
+"""
+import sys
+import os
+from datetime import date
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.plaid_item import PlaidItem  # noqa: F401 (accounts.item_id references it)
+from src.services.columnar_analytics import _build_snapshot, pivot_snapshot
+from src.services.transaction_ingest import IngestStats, apply_sync_page
+from src.services.transaction_summary import GROUP_BY_VALUES, pivot_transactions
+from tests.factories import page, tx
+
+ACCOUNT_ID = "pivot-test-account"
+
+
+def seed(db) -> None:
+    db.add(Account(account_id=ACCOUNT_ID, account_name="Pivot test"))
+    db.flush()
+    stats = IngestStats()
+    apply_sync_page(db, page(added=[
+        tx(ACCOUNT_ID, "groceries", date(2024, 1, 5), 50.25, "FOOD_AND_DRINK", "FOOD_AND_DRINK_GROCERIES"),
+        tx(ACCOUNT_ID, "gone", date(2024, 1, 6), 999, "FOOD_AND_DRINK", "FOOD_AND_DRINK_GROCERIES"),
+        tx(ACCOUNT_ID, "dinner", date(2024, 1, 20), 20, "FOOD_AND_DRINK", "FOOD_AND_DRINK_RESTAURANT", pending=True),
+        tx(ACCOUNT_ID, "pay", date(2024, 1, 31), -1000),
+        tx(ACCOUNT_ID, "fee", date(2024, 2, 1), 10.10, "", ""),
+        tx(ACCOUNT_ID, "rent", date(2024, 2, 14), 1500, "RENT_AND_UTILITIES", "RENT_AND_UTILITIES_RENT"),
+        tx(ACCOUNT_ID, "more-groceries", date(2024, 3, 3), 30, "FOOD_AND_DRINK", "FOOD_AND_DRINK_GROCERIES"),
+    ]), {ACCOUNT_ID}, stats)
+    apply_sync_page(db, page(removed=[{"transaction_id": f"{ACCOUNT_ID}-gone"}]), {ACCOUNT_ID}, stats)
+
+
+def test_pivot_cells_and_totals():
+    db = SessionLocal()
+    try:
+        seed(db)
+        categories = ["FOOD_AND_DRINK", "RENT_AND_UTILITIES", "Uncategorized"]
+
+        month = pivot_transactions(db, ACCOUNT_ID, date(2024, 1, 1), date(2024, 3, 31), "month")
+        assert month["periods"] == ["2024-01", "2024-02", "2024-03"]
+        assert month["categories"] == categories
+        assert month["amounts"] == [[70.25, 0.0, -1000.0], [0.0, 1500.0, 10.1], [30.0, 0.0, 0.0]]
+        assert month["counts"] == [[2, 0, 1], [0, 1, 1], [1, 0, 0]]
+        assert month["period_totals"] == [-929.75, 1510.1, 30.0]
+        assert month["category_totals"] == [100.25, 1500.0, -989.9]
+        assert (month["grand_total"], month["total_transactions"]) == (610.35, 6)
+
+        # One period holding the category totals
+        everything = pivot_transactions(db, ACCOUNT_ID, date(2024, 1, 1), date(2024, 3, 31), "all")
+        assert everything["periods"] == ["all"] and everything["categories"] == categories
+        assert everything["amounts"] == [[100.25, 1500.0, -989.9]]
+        assert everything["counts"] == [[3, 1, 2]]
+        assert everything["period_totals"] == [610.35]
+
+        # Without pending rows the restaurant cell disappears
+        settled = pivot_transactions(db, ACCOUNT_ID, date(2024, 1, 1), date(2024, 1, 31), "month", include_pending=False)
+        assert settled["amounts"] == [[50.25, -1000.0]] and settled["counts"] == [[1, 1]]
+
+        # No transactions in range: no periods or categories, even for "all"
+        for group_by in ("month", "all"):
+            empty = pivot_transactions(db, ACCOUNT_ID, date(2023, 1, 1), date(2023, 12, 31), group_by)
+            assert (empty["periods"], empty["categories"], empty["amounts"]) == ([], [], [])
+            assert (empty["grand_total"], empty["total_transactions"]) == (0.0, 0)
+    finally:
+        db.rollback()
+        db.close()
+
+
+def test_pivot_matches_snapshot():
+    db = SessionLocal()
+    try:
+        seed(db)
+        snapshot = _build_snapshot(db, ACCOUNT_ID, 0)
+        ranges = ((date(2024, 1, 1), date(2024, 3, 31)), (date(2024, 1, 10), date(2024, 2, 10)), (date(2023, 1, 1), date(2023, 12, 31)))
+
+        for group_by in GROUP_BY_VALUES:
+            for category_type in ("primary", "detailed"):
+                for include_pending in (True, False):
+                    for start_date, end_date in ranges:
+                        expected = pivot_snapshot(snapshot, start_date, end_date, group_by, category_type, include_pending)
+                        actual = pivot_transactions(db, ACCOUNT_ID, start_date, end_date, group_by, category_type, include_pending=include_pending)
+                        assert actual == expected, (group_by, category_type, include_pending, start_date)
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    test_pivot_cells_and_totals()
+    test_pivot_matches_snapshot()
+    print("transaction pivot tests passed")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Property test: /transactions/summary computed by summarize_transactions must
+serialise exactly like the original per-row loop, copied below as the
+reference, on seeded random ledgers for every group_by, category_type,
+include_removed and include_pending, over the whole ledger, a random range
+and an empty one
+
+Needs a database migrated to head. Each ledger is written in a transaction
+that is rolled back at the end.
+"""
+import sys
+import os
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import HTTPException
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.plaid_item import PlaidItem  # noqa: F401 (accounts.item_id references it)
+from src.schemas.transaction import CategorySummary, PeriodSummary, TransactionSummaryResponse
+from src.services.transaction_ingest import IngestStats, apply_sync_page
+from src.services.transaction_queries import filtered_transactions
+from src.services.transaction_summary import GROUP_BY_VALUES, summarize_transactions
+from tests.factories import page, tx
+
+ACCOUNT_ID = "summary-test-account"
+SEEDS = range(4)
+CATEGORIES = [None, "", "FOOD_AND_DRINK", "TRANSPORTATION", "INCOME"]
+
+
+# The original handler body from src/api/transactions/router.py, from the query on
+def reference_summary(db, account_id, start_date, end_date, group_by, category_type, include_removed, include_pending) -> dict:
+    # Build filtered query
+    query = filtered_transactions(db, account_id, start_date, end_date, include_removed, include_pending)
+
+    # Get all transactions for processing
+    transactions = query.all()
+
+    # Calculate period summaries
+    # Note: Plaid stores expenses as positive, income as negative
+    period_summaries = []
+    if group_by == "all":
+        total_expense = sum(t.amount for t in transactions if t.amount > 0)
+        total_income = sum(abs(t.amount) for t in transactions if t.amount < 0)
+        period_summaries.append(PeriodSummary(
+            period="all",
+            income=float(total_income),
+            expense=float(total_expense),
+            net=float(total_income - total_expense),
+            transaction_count=len(transactions)
+        ))
+    else:
+        # Group transactions by period
+        period_groups = {}
+        for t in transactions:
+            if group_by == "week":
+                # ISO week format: YYYY-Www
+                period_key = f"{t.transaction_date.year}-W{t.transaction_date.isocalendar()[1]:02d}"
+            elif group_by == "month":
+                period_key = t.transaction_date.strftime("%Y-%m")
+            elif group_by == "year":
+                period_key = str(t.transaction_date.year)
+            else:
+                raise HTTPException(status_code=400, detail=f"Invalid group_by value: {group_by}")
+
+            if period_key not in period_groups:
+                period_groups[period_key] = []
+            period_groups[period_key].append(t)
+
+        # Calculate summaries for each period
+        for period, txs in sorted(period_groups.items()):
+            expense = sum(t.amount for t in txs if t.amount > 0)
+            income = sum(abs(t.amount) for t in txs if t.amount < 0)
+            period_summaries.append(PeriodSummary(
+                period=period,
+                income=float(income),
+                expense=float(expense),
+                net=float(income - expense),
+                transaction_count=len(txs)
+            ))
+
+    # Calculate category summaries
+    category_groups = {}
+    category_field = "personal_finance_category_primary" if category_type == "primary" else "personal_finance_category_detailed"
+
+    for t in transactions:
+        category = getattr(t, category_field) or "Uncategorized"
+        if category not in category_groups:
+            category_groups[category] = []
+        category_groups[category].append(t)
+
+    category_summaries = []
+    for category, txs in sorted(category_groups.items()):
+        total_amount = sum(t.amount for t in txs)
+        category_summaries.append(CategorySummary(
+            category=category,
+            amount=float(total_amount),
+            transaction_count=len(txs),
+            category_type=category_type
+        ))
+
+    # Calculate overall totals
+    total_expense = sum(t.amount for t in transactions if t.amount > 0)
+    total_income = sum(abs(t.amount) for t in transactions if t.amount < 0)
+
+    return {
+        "period_summaries": period_summaries,
+        "category_summaries": category_summaries,
+        "total_income": float(total_income),
+        "total_expense": float(total_expense),
+        "net_total": float(total_income - total_expense),
+        "total_transactions": len(transactions)
+    }
+
+
+def random_transaction(rng: random.Random, index: int) -> dict:
+    primary = rng.choice(CATEGORIES)
+    cents = rng.choice([rng.randrange(1, 20_000), -rng.randrange(100_000, 600_000), 0])
+    # Across two New Years, so ISO weeks straddle calendar years (2024-12-30 is in "2024-W01")
+    day = date(2023, 11, 1) + timedelta(days=rng.randrange(500))
+    detailed = primary and f"{primary}_{rng.randrange(3)}"
+    return tx(ACCOUNT_ID, str(index), day, Decimal(cents).scaleb(-2), primary, detailed, pending=rng.random() < 0.2)
+
+
+def seed_ledger(db, rng: random.Random) -> None:
+    """Random rows, then a page that modifies some and removes others, as sync would"""
+    db.add(Account(account_id=ACCOUNT_ID, account_name="Summary test"))
+    db.flush()
+    added = [random_transaction(rng, index) for index in range(rng.randrange(150, 400))]
+    apply_sync_page(db, page(added=added), {ACCOUNT_ID}, IngestStats())
+    changed = rng.sample(added, len(added) // 5)
+    half = len(changed) // 2
+    modified = [dict(transaction, amount=-transaction["amount"], pending=not transaction["pending"]) for transaction in changed[:half]]
+    removed = [{"transaction_id": transaction["transaction_id"]} for transaction in changed[half:]]
+    apply_sync_page(db, page(modified=modified, removed=removed), {ACCOUNT_ID}, IngestStats())
+
+
+def test_summary_matches_reference():
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        db = SessionLocal()
+        try:
+            seed_ledger(db, rng)
+            start_date = date(2023, 11, 1) + timedelta(days=rng.randrange(300))
+            ranges = ((None, None), (start_date, start_date + timedelta(days=rng.randrange(30, 200))), (date(2020, 1, 1), date(2020, 12, 31)))
+
+            for group_by in GROUP_BY_VALUES:
+                for category_type in ("primary", "detailed"):
+                    for include_removed in (False, True):
+                        for include_pending in (True, False):
+                            for start_date, end_date in ranges:
+                                args = (db, ACCOUNT_ID, start_date, end_date, group_by, category_type, include_removed, include_pending)
+                                expected = TransactionSummaryResponse(**reference_summary(*args)).model_dump()
+                                actual = TransactionSummaryResponse(**summarize_transactions(*args)).model_dump()
+                                assert actual == expected, (seed, args[2:])
+        finally:
+            db.rollback()
+            db.close()
+
+
+if __name__ == "__main__":
+    test_summary_matches_reference()
+    print("transaction summary tests passed")
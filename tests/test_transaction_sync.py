@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test the /transactions/sync pagination loop against SyntheticPlaidClient:
+paging past the old 4-page cap, resuming after a crash mid-pagination and
+restarting from the pre-pagination cursor when Plaid reports a mutation
+
+Needs a database migrated to head. Sync commits every page, so rows are
+written under the item/accounts "sync-test-*" and deleted before and after.
+"""
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import HTTPException
+from src.config.settings import settings
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.plaid_item import PlaidItem
+from src.models.sync_cursor import SyncCursor
+from src.models.transaction import Transaction
+from src.services.plaid_client import get_plaid_client, set_plaid_client
+from src.services.item_registry import register_item
+from src.services.transaction_ingest import IngestStats
+from src.services.transaction_sync import run_transaction_sync
+from src.api.plaid.router import store_accounts
+from tests.plaid_replay import SyntheticPlaidClient
+
+ITEM_ID = "sync-test-item"
+ACCESS_TOKEN = "sync-test-access-token"
+ACCOUNT_IDS = ("sync-test-checking", "sync-test-credit")
+TOTAL = 1750  # 4 pages of 500
+
+
+class PlaidCallError(Exception):
+    """Carries an error_code the way get_plaid_error_code() reads it"""
+
+    def __init__(self, error_code: str):
+        super().__init__(error_code)
+        self.error_code = error_code
+
+
+class ScriptedPlaidClient(SyntheticPlaidClient):
+    """SyntheticPlaidClient that fails once at chosen cursors and records every cursor requested"""
+
+    def __init__(self, failures: dict):
+        super().__init__(TOTAL, item_id=ITEM_ID, account_ids=ACCOUNT_IDS)
+        self.failures = dict(failures)
+        self.cursors = []
+
+    def transactions_sync(self, request, **kwargs):
+        self.cursors.append(request.cursor)
+        failure = self.failures.pop(request.cursor, None)
+        if failure is not None:
+            raise failure
+        return super().transactions_sync(request, **kwargs)
+
+
+def reset_test_data(db) -> None:
+    db.query(Transaction).filter(Transaction.account_id.in_(ACCOUNT_IDS)).delete(synchronize_session=False)
+    db.query(Account).filter(Account.account_id.in_(ACCOUNT_IDS)).delete(synchronize_session=False)
+    # sync_cursors rows go with the item (ON DELETE CASCADE)
+    db.query(PlaidItem).filter(PlaidItem.item_id == ITEM_ID).delete(synchronize_session=False)
+    db.commit()
+
+
+def saved_cursor(db) -> tuple:
+    db.expire_all()
+    record = db.query(SyncCursor).filter(SyncCursor.item_id == ITEM_ID).one()
+    return record.cursor, record.pagination_start_cursor
+
+
+def stored_rows(db) -> int:
+    return db.query(Transaction).filter(Transaction.account_id.in_(ACCOUNT_IDS)).count()
+
+
+def test_sync_pages_resumes_and_restarts():
+    original_client = get_plaid_client()
+    rate_limit_enabled = settings.PLAID_RATE_LIMIT_ENABLED
+    settings.PLAID_RATE_LIMIT_ENABLED = False
+    db = SessionLocal()
+    try:
+        reset_test_data(db)
+        register_item(db, ITEM_ID, ACCESS_TOKEN)
+        db.commit()
+        set_plaid_client(ScriptedPlaidClient({}))
+        store_accounts(ACCESS_TOKEN, db, ITEM_ID)
+
+        # Crash while fetching the third page: two pages stay committed, and the
+        # cursor the loop started from is kept for a later restart
+        client = ScriptedPlaidClient({"1000": RuntimeError("connection lost")})
+        set_plaid_client(client)
+        try:
+            run_transaction_sync(db, ITEM_ID, ACCESS_TOKEN)
+            assert False, "sync should have failed"
+        except HTTPException as e:
+            assert e.status_code == 500
+        assert saved_cursor(db) == ("1000", "")
+        assert stored_rows(db) == 1000
+
+        # Resume at the committed page; a mutation on the next page goes back to
+        # the pre-pagination cursor, not to the one this run started from
+        client = ScriptedPlaidClient({"1500": PlaidCallError("TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION")})
+        set_plaid_client(client)
+        stats = IngestStats()
+        result = run_transaction_sync(db, ITEM_ID, ACCESS_TOKEN, stats=stats)
+
+        assert client.cursors == ["1000", "1500", "", "500", "1000", "1500"]
+        assert saved_cursor(db) == (str(TOTAL), None)
+        assert stored_rows(db) == TOTAL
+        # Pages delivered again after the restart are counted once
+        assert (stats.pages, stats.added) == (4, TOTAL)
+        assert result["synced_count"] == TOTAL and result["sync_status"] == "success"
+    finally:
+        set_plaid_client(original_client)
+        settings.PLAID_RATE_LIMIT_ENABLED = rate_limit_enabled
+        db.rollback()
+        reset_test_data(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    test_sync_pages_resumes_and_restarts()
+    print("transaction sync tests passed")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for webhook-driven sync coalescing
+
+Run directly to fire a burst of fake Plaid webhooks at a local server:
+    python tests/test_webhook_coalescing.py http://localhost:8000 <item_id>
+
+They carry no Plaid-Verification signature, so /plaid/webhook answers 401;
+use it to check that a burst of forged webhooks is turned away.
+"""
+import sys
+import os
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.webhook_sync import SyncCoalescer
+
+
+def send_fake_webhook(base_url: str, item_id: str, webhook_code: str = "SYNC_UPDATES_AVAILABLE") -> dict:
+    """POST a Plaid-shaped TRANSACTIONS webhook to /plaid/webhook"""
+    body = json.dumps({
+        "webhook_type": "TRANSACTIONS",
+        "webhook_code": webhook_code,
+        "item_id": item_id,
+        "initial_update_complete": True,
+        "historical_update_complete": True,
+        "environment": "sandbox",
+    }).encode("utf-8")
+    request = urllib.request.Request(
+        f"{base_url}/plaid/webhook",
+        data=body,
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return {"status_code": e.code, **json.loads(e.read())}
+
+
+class FakeSync:
+    """Stands in for the sync job runner; each run takes `duration` seconds"""
+
+    def __init__(self, duration: float = 0.0):
+        self.duration = duration
+        self.runs = []
+        self.lock = threading.Lock()
+
+    def __call__(self, item_id, on_done):
+        with self.lock:
+            self.runs.append(item_id)
+
+        def finish():
+            time.sleep(self.duration)
+            on_done()
+
+        threading.Thread(target=finish, daemon=True).start()
+
+
+def test_burst_is_coalesced_into_one_sync():
+    fake_sync = FakeSync()
+    coalescer = SyncCoalescer(debounce_seconds=0.2, start_sync=fake_sync)
+
+    results = [coalescer.notify("item-1") for _ in range(20)]
+    time.sleep(0.5)
+
+    assert results.count(True) == 1
+    assert fake_sync.runs == ["item-1"]
+
+
+def test_items_are_coalesced_independently():
+    fake_sync = FakeSync()
+    coalescer = SyncCoalescer(debounce_seconds=0.1, start_sync=fake_sync)
+
+    for _ in range(5):
+        coalescer.notify("item-1")
+        coalescer.notify("item-2")
+    time.sleep(0.4)
+
+    assert sorted(fake_sync.runs) == ["item-1", "item-2"]
+
+
+def test_events_during_run_trigger_one_follow_up():
+    fake_sync = FakeSync(duration=0.3)
+    coalescer = SyncCoalescer(debounce_seconds=0.05, start_sync=fake_sync)
+
+    coalescer.notify("item-1")
+    time.sleep(0.15)  # first run is now in flight
+    for _ in range(10):
+        coalescer.notify("item-1")
+    time.sleep(0.8)
+
+    assert fake_sync.runs == ["item-1", "item-1"]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        base_url, item_id = sys.argv[1], sys.argv[2]
+        for i in range(10):
+            print(f"webhook {i + 1}: {send_fake_webhook(base_url, item_id)}")
+    else:
+        test_burst_is_coalesced_into_one_sync()
+        test_items_are_coalesced_independently()
+        test_events_during_run_trigger_one_follow_up()
+        print("webhook coalescing tests passed")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test that POST /plaid/webhook only acts on webhooks carrying Plaid's
+Plaid-Verification signature over the exact body
+
+Signs with a throwaway P-256 key served by a stand-in Plaid client; no
+database rows are needed.
+"""
+import sys
+import os
+import hashlib
+import importlib
+import json
+import time
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from ecdsa import SigningKey, NIST256p
+from fastapi.testclient import TestClient
+from jose import jwk, jwt
+from src.main import app
+from src.services import plaid_webhooks
+from src.services.plaid_client import get_plaid_client, set_plaid_client
+
+# src.api.plaid re-exports the APIRouter under the module's name
+plaid_router = importlib.import_module("src.api.plaid.router")
+
+KID = "webhook-test-key"
+PLAID_KEY = SigningKey.generate(curve=NIST256p)
+FORGER_KEY = SigningKey.generate(curve=NIST256p)
+
+
+class KeyServingPlaidClient:
+    """Answers /webhook_verification_key/get for KID with PLAID_KEY's public half"""
+
+    def __init__(self):
+        self.requests = []
+
+    def webhook_verification_key_get(self, request, **kwargs):
+        self.requests.append(request.key_id)
+        if request.key_id != KID:
+            raise RuntimeError("INVALID_WEBHOOK_VERIFICATION_KEY_ID")
+        public = jwk.construct(PLAID_KEY.get_verifying_key().to_pem().decode(), "ES256").to_dict()
+        return {"key": {**public, "kid": KID, "use": "sig", "created_at": 1700000000, "expired_at": None}}
+
+
+def signature(body: bytes, key=PLAID_KEY, kid: str = KID, issued_at: float = None, algorithm: str = "ES256") -> str:
+    claims = {
+        "iat": int(time.time() if issued_at is None else issued_at),
+        "request_body_sha256": hashlib.sha256(body).hexdigest(),
+    }
+    signing_key = key.to_pem().decode() if algorithm == "ES256" else "shared-secret"
+    return jwt.encode(claims, signing_key, algorithm=algorithm, headers={"kid": kid})
+
+
+def test_only_signed_webhooks_are_acted_on():
+    original_client = get_plaid_client()
+    original_get_item, original_notify = plaid_router.get_item, plaid_router.webhook_coalescer.notify
+    original_invalidate = plaid_router.invalidate_item_status
+    plaid_client = KeyServingPlaidClient()
+    scheduled, invalidated = [], []
+    set_plaid_client(plaid_client)
+    plaid_webhooks._keys.clear()
+    plaid_router.get_item = lambda db, item_id: SimpleNamespace(item_id=item_id, access_token="webhook-test-token")
+    plaid_router.webhook_coalescer.notify = lambda item_id: scheduled.append(item_id) or True
+    plaid_router.invalidate_item_status = invalidated.append
+    try:
+        client = TestClient(app)
+        sync = json.dumps({"webhook_type": "TRANSACTIONS", "webhook_code": "SYNC_UPDATES_AVAILABLE", "item_id": "item-1"}).encode("utf-8")
+        item_error = json.dumps({"webhook_type": "ITEM", "webhook_code": "ERROR", "item_id": "item-1"}).encode("utf-8")
+
+        def post(body: bytes, verification=None):
+            headers = {"Content-Type": "application/json"}
+            if verification:
+                headers["Plaid-Verification"] = verification
+            return client.post("/plaid/webhook", content=body, headers=headers)
+
+        forgeries = {
+            "unsigned": (sync, None),
+            "garbage header": (sync, "not-a-jwt"),
+            "signed by another key": (sync, signature(sync, key=FORGER_KEY)),
+            "unknown kid": (sync, signature(sync, kid="made-up")),
+            "HS256": (sync, signature(sync, algorithm="HS256")),
+            "stale": (sync, signature(sync, issued_at=time.time() - 6 * 60)),
+            "body swapped": (item_error, signature(sync)),
+        }
+        for name, (body, verification) in forgeries.items():
+            response = post(body, verification)
+            assert response.status_code == 401, name
+        assert scheduled == [] and invalidated == []
+
+        assert post(sync, signature(sync)).json() == {"status": "scheduled"}
+        assert post(item_error, signature(item_error)).json() == {"status": "item_error_recorded"}
+        assert scheduled == ["item-1"] and invalidated == ["webhook-test-token"]
+        # The key was fetched once for KID and then served from the cache
+        assert plaid_client.requests.count(KID) == 1
+    finally:
+        set_plaid_client(original_client)
+        plaid_webhooks._keys.clear()
+        plaid_router.get_item, plaid_router.webhook_coalescer.notify = original_get_item, original_notify
+        plaid_router.invalidate_item_status = original_invalidate
+
+
+if __name__ == "__main__":
+    test_only_signed_webhooks_are_acted_on()
+    print("webhook verification tests passed")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Check that the window-function asset history matches the Python sweep, from
+a month-end checkpoint and with transactions after end_date
+
+Needs a database migrated to head. Everything runs in one transaction that
+is rolled back at the end.
+"""
+import sys
+import os
+from datetime import date
+
+# Add project root to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.db import SessionLocal
+from src.models.account import Account
+from src.models.plaid_item import PlaidItem  # noqa: F401 (accounts.item_id references it)
+from src.api.assets.router import _compute_asset_history, _compute_asset_history_window
+from src.services.balance_checkpoints import rebuild_checkpoints
+from src.services.transaction_ingest import IngestStats, apply_sync_page
+from tests.factories import page, tx
+
+ACCOUNT_ID = "window-balances-test-account"
+
+
+def test_window_history_matches_sweep():
+    db = SessionLocal()
+    try:
+        db.add(Account(account_id=ACCOUNT_ID, account_name="Window balances test"))
+        db.flush()
+        apply_sync_page(db, page(added=[
+            tx(ACCOUNT_ID, "pay", date(2024, 1, 15), -2000),
+            tx(ACCOUNT_ID, "rent", date(2024, 2, 1), 1500),
+            tx(ACCOUNT_ID, "groceries", date(2024, 2, 29), 120.55),
+            tx(ACCOUNT_ID, "refund", date(2024, 3, 4), -20.55),
+            tx(ACCOUNT_ID, "later", date(2024, 4, 2), 999),
+        ]), {ACCOUNT_ID}, IngestStats())
+        rebuild_checkpoints(db, [ACCOUNT_ID])
+
+        window = _compute_asset_history_window(db, ACCOUNT_ID, date(2024, 2, 10), date(2024, 3, 31), "month")
+        assert [(item.period, item.balance, item.change) for item in window.balance_history] == [
+            ("2024-02", 379.45, -1620.55), ("2024-03", 400.0, 20.55)
+        ]
+        assert window.current_balance == 400.0
+
+        for start_date, end_date, granularity in (
+            (date(2024, 2, 10), date(2024, 3, 31), "month"),
+            (date(2023, 12, 1), date(2024, 4, 30), "month"),
+            (date(2024, 2, 20), date(2024, 3, 5), "week"),
+            (date(2024, 2, 27), date(2024, 3, 5), "day"),
+        ):
+            expected = _compute_asset_history(db, ACCOUNT_ID, start_date, end_date, granularity)
+            actual = _compute_asset_history_window(db, ACCOUNT_ID, start_date, end_date, granularity)
+            assert actual.balance_history == expected.balance_history, (start_date, end_date, granularity)
+            assert round(actual.current_balance, 2) == round(expected.current_balance, 2)
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    test_window_history_matches_sweep()
+    print("window balance tests passed")